@@ -0,0 +1,67 @@
+"""多进程批量解析与关键词统计的扩展性测试
+
+    python -m benchmarks.bench_batch [--pages 64] [--titles 500] [--workers 1 2 4] [--transport file shm]
+
+生成若干个不同的今日头条样式页面，分别以文件引用和共享内存传给
+:func:`new_crawler.batch.analyze_pages`，按不同进程数计时，输出吞吐量、相对单进程的加速比，
+并检查结果与单进程完全一致。
+"""
+import argparse
+import contextlib
+import io
+import os
+import tempfile
+
+from new_crawler.batch import SharedPages, analyze_pages, file_page
+from new_crawler.keywords import KeywordEngine
+
+from .fixtures import make_toutiao_html
+
+
+def main(argv=None):
+    cpus = os.cpu_count() or 1
+    default_workers = sorted({1, 2, 4, cpus} & set(range(1, cpus + 1))) or [1]
+    parser = argparse.ArgumentParser(description='多进程批量分析扩展性测试')
+    parser.add_argument('--pages', type=int, default=64, help='页面数')
+    parser.add_argument('--titles', type=int, default=500, help='每个页面的标题数')
+    parser.add_argument('--workers', type=int, nargs='+', default=default_workers)
+    parser.add_argument('--transport', nargs='+', choices=('file', 'shm'), default=['file', 'shm'])
+    parser.add_argument('--parser', default='html.parser')
+    args = parser.parse_args(argv)
+
+    # 分词词典只加载一次，不计入耗时；子进程通过快照加载
+    KeywordEngine().analyze(['预热分词词典'])
+
+    htmls = [make_toutiao_html(args.titles, seed=i) for i in range(args.pages)]
+    size_mb = sum(len(html.encode('utf-8')) for html in htmls) / 1024 / 1024
+    print(f"{args.pages} 个页面，共 {size_mb:.1f} MB，CPU 核数 {cpus}")
+    print(f"{'传递方式':<10}{'进程数':>6}{'耗时(s)':>10}{'页/秒':>10}{'加速比':>8}  结果一致")
+
+    with tempfile.TemporaryDirectory() as workdir, SharedPages() as shared:
+        refs = {'file': [], 'shm': []}
+        for i, html in enumerate(htmls):
+            path = os.path.join(workdir, f'page{i}.html')
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(html)
+            refs['file'].append(file_page(path))
+            if 'shm' in args.transport:
+                refs['shm'].append(shared.add(html))
+
+        ok = True
+        for transport in args.transport:
+            baseline = None
+            for workers in args.workers:
+                with contextlib.redirect_stdout(io.StringIO()):
+                    results = analyze_pages(refs[transport], workers=workers, backend=args.parser)
+                if baseline is None:
+                    baseline = results
+                same = (results['keywords'] == baseline['keywords'] and results['titles'] == baseline['titles'])
+                ok = ok and same
+                elapsed = results['elapsed']
+                print(f"{transport:<10}{workers:>6}{elapsed:>10.2f}{args.pages / elapsed:>10.1f}"
+                      f"{baseline['elapsed'] / elapsed:>8.2f}  {'是' if same else '否'}")
+    return 0 if ok else 1
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
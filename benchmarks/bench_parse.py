@@ -0,0 +1,149 @@
+"""parse_titles 解析后端对比
+
+    python -m benchmarks.bench_parse [--repeat 3] [--sizes small medium]
+
+对每个样本页面依次运行所有可用后端，检查结果与 html.parser 完全一致，并输出耗时与加速比；
+另外检查各解析库容易产生差异的几种写法（:data:`EDGE_CASES`），结果须与原有 parse_titles 的实现
+（:func:`reference_titles`）相同。
+"""
+import argparse
+import time
+
+from new_crawler.parsers import PROFILES, available_backends, parse_html
+
+from .fixtures import GENERATORS, SIZES, load_fixture
+
+# 各解析库默认处理不同的写法：(页面地址, HTML, 期望的标题)，期望结果与 reference_titles 相同
+EDGE_CASES = {
+    'script_in_link': (
+        None,
+        '<html><body><a target="_blank" href="/a">北京今日暴雨预警发布<script>var tracking=1;</script>'
+        '<style>.x{color:red}</style></a></body></html>',
+        ['北京今日暴雨预警发布'],
+    ),
+    'nested_link': (
+        None,
+        '<html><body><a target="_blank" href="/a">外层新闻标题文字<a target="_blank" href="/b">'
+        '内层新闻标题文字</a>尾部文字</a></body></html>',
+        ['外层新闻标题文字内层新闻标题文字尾部文字', '内层新闻标题文字'],
+    ),
+    'unclosed_link': (
+        None,
+        '<p><a target="_blank">未闭合的链接标题内容<p>下一段的内容文字',
+        ['未闭合的链接标题内容下一段的内容文字'],
+    ),
+    'unclosed_link_in_block': (
+        None,
+        '<div><a target="_blank" href="/a">未闭合的链接标题内容</div><div>下一段的内容文字</div>',
+        ['未闭合的链接标题内容'],
+    ),
+    'target_case': (
+        None,
+        '<html><body><a target="_BLANK" href="/a">北京今日暴雨预警发布</a>'
+        '<a target="_blank" href="/b">上海今日暴雨预警发布</a></body></html>',
+        ['上海今日暴雨预警发布'],
+    ),
+    'target_case_only': (
+        None,
+        '<div class="feed-card-article-r"><p class="title">备用选择器的新闻标题</p></div>'
+        '<a target="_BLANK" href="/a">大写的目标不算新窗口链接</a>',
+        ['备用选择器的新闻标题'],
+    ),
+    'unknown_entity': (
+        None,
+        '<a target="_blank" href="/a">北京&unknown;暴雨&copy预警发布</a>',
+        ['北京&unknown暴雨©预警发布'],
+    ),
+    'sina_page': (
+        'https://news.sina.com.cn/roll/',
+        '<html><body><div class="top"><a target="_blank" href="/">新浪首页新闻中心</a></div>'
+        '<div class="d_list_txt" id="d_list"><ul><li><span class="c_tit">'
+        '<a target="_blank" href="/c/doc-1.shtml">北京今日暴雨预警发布</a></span></li></ul></div></body></html>',
+        ['新浪首页新闻中心', '北京今日暴雨预警发布'],
+    ),
+}
+
+
+def reference_titles(html):
+    """原有 parse_titles 的逐字实现（BeautifulSoup + html.parser），作为一致性检查的基准"""
+    import re
+
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(html, 'html.parser')
+    titles = []
+    title_elements = soup.find_all('a', target='_blank')
+    if not title_elements:
+        title_elements = soup.select('.feed-card-article-r .title')
+    if not title_elements:
+        title_elements = soup.select('[aria-label]')
+    for elem in title_elements:
+        title = elem.get_text().strip()
+        title = re.sub(r'\s+', ' ', title)
+        title = re.sub(r'[\n\t]', '', title)
+        if title and len(title) > 5:
+            titles.append(title)
+    return titles
+
+
+def check_edge_cases(backends):
+    """返回 [(用例, 后端, 解析结果)]，只包含与期望或原有实现不一致的组合（后端为 'reference' 时表示期望有误）"""
+    failures = []
+    for name, (url, html, expected) in EDGE_CASES.items():
+        reference = reference_titles(html)
+        if reference != expected:
+            failures.append((name, 'reference', reference))
+        for backend in backends:
+            titles = parse_html(html, backend=backend, url=url)
+            if titles != reference:
+                failures.append((name, backend, titles))
+    return failures
+
+
+def time_backend(html, backend, profile, repeat):
+    """返回 (最短耗时秒数, 解析结果)"""
+    best = None
+    titles = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        titles = parse_html(html, backend=backend, profile=profile)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, titles
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='解析后端基准测试')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--sizes', nargs='+', default=list(SIZES))
+    args = parser.parse_args(argv)
+
+    backends = available_backends()
+    print(f"可用后端: {', '.join(backends)}")
+    print(f"{'样本':<16}{'后端':<14}{'耗时(ms)':>10}{'加速比':>8}{'标题数':>8}  结果一致")
+
+    ok = True
+    for site in GENERATORS:
+        for size in args.sizes:
+            html = load_fixture(site, size)
+            profile = PROFILES[site]
+            base_time, expected = time_backend(html, 'html.parser', profile, args.repeat)
+            for backend in backends:
+                if backend == 'html.parser':
+                    elapsed, titles = base_time, expected
+                else:
+                    elapsed, titles = time_backend(html, backend, profile, args.repeat)
+                same = titles == expected
+                ok = ok and same
+                print(f"{site + '_' + size:<16}{backend:<14}{elapsed * 1000:>10.1f}"
+                      f"{base_time / elapsed:>8.1f}{len(titles):>8}  {'是' if same else '否'}")
+
+    failures = check_edge_cases(backends)
+    for name, backend, titles in failures:
+        print(f"边界用例 {name} 在 {backend} 下结果不一致: {titles}")
+    print(f"边界用例 {len(EDGE_CASES)} 个，{'全部一致' if not failures else f'{len(failures)} 处不一致'}")
+    return 0 if ok and not failures else 1
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
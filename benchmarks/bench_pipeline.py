@@ -0,0 +1,215 @@
+"""端到端与分阶段基准测试
+
+    python -m benchmarks.bench_pipeline [--sizes small medium] [--repeat 3] [--latency 20]
+    python -m benchmarks.bench_pipeline --output new.json --compare old.json
+
+分别计时 抓取（替身服务器，可设延迟）、parse_titles、去重、analyze_keywords、
+generate_wordcloud、导出 以及 run_pipeline 全流程，记录墙钟时间、CPU时间、
+峰值内存（tracemalloc，单独一次运行测量）与吞吐量，结果写入 JSON 文件。
+指定 --compare 时与以前的结果对比，任一阶段变慢超过阈值则返回非零退出码。
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from new_crawler.dedup import DedupStore, ordered_unique
+from new_crawler.engine import generate_wordcloud, run_pipeline
+from new_crawler.export import export_keywords, export_records
+from new_crawler.http_engine import fetch_http_news
+from new_crawler.keywords import KeywordEngine
+from new_crawler.parsers import PROFILES, best_backend, parse_html
+
+from .fixtures import SIZES, load_fixture
+from .server import StandInServer
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'results')
+SINA_URL = 'https://news.sina.com.cn/roll/#pageid=153&lid=2509&num=50&page=1'
+PAGE_SIZE = 50
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+def measure(func, repeat):
+    """运行 repeat 次计时，再单独运行一次测量峰值内存，返回 (指标字典, 最后一次的结果)
+
+    被测函数的进度输出被丢弃，避免终端输出影响计时。
+    """
+    walls, cpus = [], []
+    result = None
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(repeat):
+            wall, cpu = time.perf_counter(), time.process_time()
+            result = func()
+            walls.append(time.perf_counter() - wall)
+            cpus.append(time.process_time() - cpu)
+
+        # tracemalloc 本身会拖慢执行，只在额外的一次运行中开启
+        tracemalloc.start()
+        try:
+            func()
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+    return {
+        'wall_min': min(walls),
+        'wall_median': statistics.median(walls),
+        'cpu_median': statistics.median(cpus),
+        'peak_kb': peak // 1024,
+    }, result
+
+
+def max_rss_kb():
+    if resource is None:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss // 1024 if sys.platform == 'darwin' else rss
+
+
+def git_revision():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__)), check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_size(size, args, server, workdir):
+    """对一个样本规模运行全部阶段，返回结果列表"""
+    results = []
+
+    def record(stage, func, items_of=len):
+        metrics, value = measure(func, args.repeat)
+        items = items_of(value) if value is not None else 0
+        metrics.update(stage=stage, size=size, items=items,
+                       throughput=items / metrics['wall_median'] if metrics['wall_median'] else None)
+        results.append(metrics)
+        print(f"{size:<8}{stage:<22}{metrics['wall_median'] * 1000:>10.1f}{metrics['cpu_median'] * 1000:>10.1f}"
+              f"{metrics['peak_kb']:>10}{items:>8}")
+        return value
+
+    pages = max(1, SIZES[size] // PAGE_SIZE)
+    http_options = {'api_base': server.base_url}
+    record('fetch_http', lambda: fetch_http_news(SINA_URL, pages, **http_options))
+
+    html = load_fixture('toutiao', size)
+    profile = PROFILES['toutiao']
+    titles = record('parse_titles', lambda: parse_html(html, backend='html.parser', profile=profile))
+    fastest = best_backend()
+    if fastest != 'html.parser':
+        record(f'parse_titles[{fastest}]', lambda: parse_html(html, backend=fastest, profile=profile))
+
+    record('dedup_exact', lambda: ordered_unique(titles))
+    record('dedup_near', lambda: DedupStore(':memory:').filter(titles))
+
+    record('analyze_keywords', lambda: KeywordEngine().analyze(titles, top_n=20))
+    warm_engine = KeywordEngine()
+    keywords = warm_engine.analyze(titles, top_n=20)
+    record('analyze_keywords_warm', lambda: warm_engine.analyze(titles, top_n=20))
+
+    if args.wordcloud:
+        path = os.path.join(workdir, f'wordcloud_{size}.png')
+        try:
+            record('generate_wordcloud', lambda: generate_wordcloud(keywords, path) and keywords)
+        except OSError as e:
+            print(f"{size:<8}{'generate_wordcloud':<22}跳过: {e}")
+
+    records = [{'title': title, 'source': 'toutiao', 'url': ''} for title in titles]
+    export_options = {'progress': lambda stage, message: None}
+    for fmt in args.export_formats:
+        path = os.path.join(workdir, f'titles_{size}.{fmt}')
+        try:
+            record(f'export_{fmt}', lambda: export_records(records, path, **export_options) and records)
+        except Exception as e:
+            print(f"{size:<8}{'export_' + fmt:<22}跳过: {e}")
+    record('export_keywords', lambda: export_keywords(keywords, os.path.join(workdir, f'keywords_{size}.csv'),
+                                                      **export_options) and keywords)
+
+    out_dir = os.path.join(workdir, f'pipeline_{size}')
+    record('end_to_end', lambda: run_pipeline(SINA_URL, pages, out_dir=out_dir, wordcloud=False,
+                                              engine='http', http_options=http_options),
+           items_of=lambda value: len(value['titles']))
+    return results
+
+
+def compare(current, baseline, threshold):
+    """与以前的结果对比，返回变慢超过阈值的阶段列表"""
+    previous = {(r['stage'], r['size']): r for r in baseline['results']}
+    regressions = []
+    print(f"\n与 {baseline.get('revision') or '基线'} 对比（中位数耗时）：")
+    for result in current['results']:
+        old = previous.get((result['stage'], result['size']))
+        if old is None or not old['wall_median']:
+            continue
+        ratio = result['wall_median'] / old['wall_median']
+        flag = ''
+        if ratio > 1 + threshold:
+            flag = '  变慢'
+            regressions.append(result)
+        print(f"{result['size']:<8}{result['stage']:<22}{old['wall_median'] * 1000:>10.1f}"
+              f"{result['wall_median'] * 1000:>10.1f}{ratio:>8.2f}x{flag}")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='端到端与分阶段基准测试')
+    parser.add_argument('--sizes', nargs='+', default=['small', 'medium'], choices=list(SIZES))
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--latency', type=float, default=20, help='替身服务器的响应延迟（毫秒）')
+    parser.add_argument('--jitter', type=float, default=0, help='延迟抖动幅度（毫秒）')
+    parser.add_argument('--no-wordcloud', dest='wordcloud', action='store_false', help='跳过词云阶段')
+    parser.add_argument('--export-formats', nargs='+', default=['csv', 'jsonl', 'parquet'])
+    parser.add_argument('--output', default=None, help='结果文件（默认 benchmarks/results/<时间>.json）')
+    parser.add_argument('--compare', default=None, help='对比的基线结果文件')
+    parser.add_argument('--threshold', type=float, default=0.2, help='判定变慢的比例阈值')
+    args = parser.parse_args(argv)
+
+    # 分词词典只加载一次，不计入各阶段耗时
+    KeywordEngine().analyze(['预热分词词典'])
+
+    print(f"{'规模':<8}{'阶段':<22}{'耗时(ms)':>10}{'CPU(ms)':>10}{'峰值KB':>10}{'条数':>8}")
+    results = []
+    with StandInServer(latency=args.latency / 1000, jitter=args.jitter / 1000) as server, \
+            tempfile.TemporaryDirectory() as workdir:
+        for size in args.sizes:
+            results.extend(run_size(size, args, server, workdir))
+
+    report = {
+        'revision': git_revision(),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'config': {'sizes': args.sizes, 'repeat': args.repeat, 'latency_ms': args.latency,
+                   'jitter_ms': args.jitter, 'parser': best_backend()},
+        'max_rss_kb': max_rss_kb(),
+        'results': results,
+    }
+    output = args.output or os.path.join(RESULTS_DIR, time.strftime('bench-%Y%m%d-%H%M%S.json'))
+    if os.path.dirname(output):
+        os.makedirs(os.path.dirname(output), exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"\n进程峰值内存 {report['max_rss_kb']} KB，结果已写入: {output}")
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        if compare(report, baseline, args.threshold):
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,133 @@
+"""基准测试用的页面样本
+
+按固定随机种子生成类似今日头条信息流和新浪滚动新闻页的HTML，以及新浪滚动接口的JSON，
+首次使用时写入 benchmarks/fixtures/ 目录，之后直接读取保存的文件，保证每次测试输入一致。
+"""
+import json
+import os
+import random
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+# 不同规模的样本（标题条数）
+SIZES = {
+    'small': 200,
+    'medium': 2000,
+    'large': 20000,
+}
+
+_WORDS = ['国务院', '发布', '经济', '数据', '城市', '暴雨', '预警', '科技', '公司', '人工智能',
+          '教育', '改革', '新能源', '汽车', '销量', '增长', '比赛', '冠军', '医院', '医保',
+          '政策', '出台', '房价', '市场', '消费', '假期', '旅游', '高铁', '航班', '天气']
+
+
+def _title(rng):
+    return ''.join(rng.choice(_WORDS) for _ in range(rng.randint(3, 8)))
+
+
+def make_toutiao_html(count, seed=0):
+    """生成今日头条信息流样式的页面"""
+    rng = random.Random(seed)
+    cards = []
+    for i in range(count):
+        title = _title(rng)
+        cards.append(
+            '<div class="feed-card-wrapper"><div class="feed-card-article">'
+            '<div class="feed-card-article-l">'
+            f'<a href="https://www.toutiao.com/article/{7500000000000000000 + i}/" target="_blank" '
+            f'rel="noopener" aria-label="{title}" class="title">\n  {title}\n</a>'
+            '</div><div class="feed-card-footer-cmp"><span class="source">'
+            f'来源{rng.randint(1, 99)}</span><span class="time">{rng.randint(1, 59)}分钟前</span>'
+            '</div><div class="feed-card-cover"><img src="https://p3.toutiaoimg.com/img/x.jpg"></div>'
+            '</div></div>'
+        )
+    return ('<!DOCTYPE html><html><head><meta charset="utf-8"><title>今日头条</title>'
+            '<script>window.__INIT__ = {};</script><style>.title{font-size:16px}</style></head><body>'
+            '<div class="main-content"><a href="/" class="logo">头条</a>'
+            + ''.join(cards) +
+            '</div></body></html>')
+
+
+def make_sina_roll_html(count, seed=0):
+    """生成新浪滚动新闻列表样式的页面"""
+    rng = random.Random(seed)
+    items = []
+    for i in range(count):
+        title = _title(rng)
+        items.append(
+            f'<li><span class="c_chl">[{rng.choice(["国内", "国际", "社会"])}]</span>'
+            f'<span class="c_tit"><a href="https://news.sina.com.cn/c/doc-{i}.shtml" target="_blank">'
+            f'{title}</a></span><span class="c_time">06-{rng.randint(10, 28)} 12:{rng.randint(10, 59)}</span></li>'
+        )
+    return ('<!DOCTYPE html><html><head><meta charset="utf-8"><title>滚动新闻_新浪网</title></head><body>'
+            '<div id="d_list"><ul>' + ''.join(items) + '</ul></div></body></html>')
+
+
+def make_article_html(doc_id, paragraphs=8):
+    """生成一篇文章页：导航、正文段落、相关推荐、页脚（同一编号内容固定）"""
+    rng = random.Random(doc_id)
+    nav = ''.join(f'<li><a href="/{i}/">{rng.choice(_WORDS)}</a></li>' for i in range(12))
+    body = ''.join(f'<p>{"，".join(_title(rng) for _ in range(rng.randint(3, 6)))}。</p>'
+                   for _ in range(paragraphs))
+    related = ''.join(f'<li><a href="/c/doc-{rng.randint(0, 9999)}.shtml">{_title(rng)}</a></li>'
+                      for _ in range(10))
+    return ('<!DOCTYPE html><html><head><meta charset="utf-8"><title>文章_新浪网</title>'
+            '<script>var ads = [];</script><style>p{line-height:1.8}</style></head><body>'
+            f'<div class="top-nav"><ul>{nav}</ul></div>'
+            f'<div class="main-content"><h1 class="main-title">{_title(rng)}</h1>'
+            f'<div class="article" id="artibody">{body}<p class="show_author">责任编辑：某某</p></div>'
+            f'<div class="related"><h3>相关新闻</h3><ul>{related}</ul></div></div>'
+            '<div class="footer"><p>新浪网版权所有 Copyright © 1996-2025 SINA Corporation</p></div>'
+            '</body></html>')
+
+
+def sina_roll_payload(page, num, seed=0, article_base='https://news.sina.com.cn'):
+    """生成新浪滚动接口格式的一页数据（同一页内容固定）；article_base 为文章链接的主机"""
+    rng = random.Random(seed * 100003 + page)
+    data = []
+    for i in range(num):
+        doc_id = (page - 1) * num + i
+        data.append({
+            'title': _title(rng),
+            'url': f'{article_base}/c/doc-{doc_id}.shtml',
+            'ctime': str(1750000000 - doc_id * 60),
+        })
+    return {'result': {'status': {'code': 0, 'msg': ''}, 'data': data}}
+
+
+def make_sina_roll_json(count, seed=0):
+    """生成包含 count 条记录的新浪滚动接口响应"""
+    return json.dumps(sina_roll_payload(1, count, seed), ensure_ascii=False)
+
+
+GENERATORS = {
+    'toutiao': make_toutiao_html,
+    'sina': make_sina_roll_html,
+}
+
+JSON_GENERATORS = {
+    'sina_roll': make_sina_roll_json,
+}
+
+
+def fixture_path(site, size, ext='html'):
+    return os.path.join(FIXTURE_DIR, f'{site}_{size}.{ext}')
+
+
+def _load(path, generate):
+    if not os.path.exists(path):
+        os.makedirs(FIXTURE_DIR, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(generate())
+    with open(path, 'r', encoding='utf-8') as f:
+        return f.read()
+
+
+def load_fixture(site, size):
+    """读取保存的样本页面，不存在时生成并保存"""
+    return _load(fixture_path(site, size), lambda: GENERATORS[site](SIZES[size]))
+
+
+def load_json_fixture(site, size):
+    """读取保存的接口响应样本（JSON文本），不存在时生成并保存"""
+    return _load(fixture_path(site, size, 'json'), lambda: JSON_GENERATORS[site](SIZES[size]))
@@ -0,0 +1,150 @@
+"""本地替身HTTP服务器
+
+模拟新浪滚动新闻接口（文章链接指向本服务器的 /c/doc-<编号>.shtml 文章页），
+并提供 benchmarks/fixtures 下保存的样本页面（/fixtures/<站点>_<规模>.html 或 .json），
+用于在不访问真实站点的情况下测试和压测抓取引擎；--latency 为每个响应增加固定延迟（可带随机抖动）::
+
+    python -m benchmarks.server --port 8765 --latency 50
+    python -m new_crawler crawl --url "https://news.sina.com.cn/roll/#pageid=153&lid=2509&num=50&page=1" \
+        --api-base http://127.0.0.1:8765 --pages 5
+"""
+import argparse
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from .fixtures import (GENERATORS, JSON_GENERATORS, SIZES, load_fixture, load_json_fixture,
+                       make_article_html, sina_roll_payload)
+
+_FIXTURE_RE = re.compile(r'^/fixtures/(\w+)_(%s)\.(html|json)$' % '|'.join(SIZES))
+_ARTICLE_RE = re.compile(r'^/c/doc-(\d+)\.shtml$')
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'  # 支持 keep-alive
+
+    def log_message(self, format, *args):
+        pass
+
+    # 样本数据固定不变，所有响应使用同一个最后修改时间
+    last_modified = 'Mon, 16 Jun 2025 00:00:00 GMT'
+
+    def _send(self, status, body, content_type, etag=None):
+        if etag is not None and self.headers.get('If-None-Match') == etag:
+            # 条件请求命中：不返回正文
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        if etag is not None:
+            self.send_header('ETag', etag)
+            self.send_header('Last-Modified', self.last_modified)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _delay(self):
+        latency, jitter = self.server.latency, self.server.jitter
+        if latency or jitter:
+            time.sleep(max(0.0, latency + random.uniform(-jitter, jitter)))
+
+    def _fixture(self, path):
+        match = _FIXTURE_RE.match(path)
+        if not match:
+            return None
+        site, size, ext = match.groups()
+        if ext == 'html' and site in GENERATORS:
+            return load_fixture(site, size).encode('utf-8'), 'text/html; charset=utf-8'
+        if ext == 'json' and site in JSON_GENERATORS:
+            return load_json_fixture(site, size).encode('utf-8'), 'application/json; charset=utf-8'
+        return None
+
+    def do_GET(self):
+        parsed = urlparse(self.path)
+        query = parse_qs(parsed.query)
+        self._delay()
+
+        if parsed.path == '/api/roll/get':
+            page = int(query.get('page', ['1'])[0])
+            num = int(query.get('num', ['50'])[0])
+            article_base = f"http://{self.headers.get('Host') or '%s:%d' % self.server.server_address[:2]}"
+            body = json.dumps(sina_roll_payload(page, num, article_base=article_base),
+                              ensure_ascii=False).encode('utf-8')
+            etag = '"%s"' % hashlib.sha1(body).hexdigest()[:16]
+            self._send(200, body, 'application/json; charset=utf-8', etag=etag)
+            return
+
+        article = _ARTICLE_RE.match(parsed.path)
+        if article is not None:
+            body = make_article_html(int(article.group(1))).encode('utf-8')
+            self._send(200, body, 'text/html; charset=utf-8', etag='"%s"' % hashlib.sha1(body).hexdigest()[:16])
+            return
+
+        fixture = self._fixture(parsed.path)
+        if fixture is not None:
+            body, content_type = fixture
+            self._send(200, body, content_type, etag='"%s"' % hashlib.sha1(body).hexdigest()[:16])
+        else:
+            self._send(404, b'not found', 'text/plain; charset=utf-8')
+
+
+class StandInServer:
+    """在后台线程运行的替身服务器，可用作上下文管理器"""
+
+    def __init__(self, host='127.0.0.1', port=0, latency=0.0, jitter=0.0):
+        self.httpd = ThreadingHTTPServer((host, port), StandInHandler)
+        self.httpd.daemon_threads = True
+        # 每个响应的延迟秒数与抖动幅度
+        self.httpd.latency = latency
+        self.httpd.jitter = jitter
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self.httpd.server_address[:2]
+        return f'http://{host}:{port}'
+
+    def start(self):
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='本地替身HTTP服务器')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--latency', type=float, default=0.0, help='每个响应的延迟（毫秒）')
+    parser.add_argument('--jitter', type=float, default=0.0, help='延迟的随机抖动幅度（毫秒）')
+    args = parser.parse_args(argv)
+
+    server = StandInServer(args.host, args.port, latency=args.latency / 1000, jitter=args.jitter / 1000)
+    print(f"替身服务器已启动: {server.base_url}")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+
+
+if __name__ == '__main__':
+    main()
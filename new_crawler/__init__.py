@@ -0,0 +1,44 @@
+"""新闻爬虫分析系统
+
+核心流程位于 :mod:`new_crawler.engine`，图形界面位于 :mod:`new_crawler.new_crawler`，
+命令行入口为 ``python -m new_crawler``。
+"""
+from .engine import (
+    HEADERS,
+    SITES,
+    CrawlCancelled,
+    scroll_to_load_content,
+    fetch_toutiao_news,
+    fetch_news,
+    parse_titles,
+    analyze_keywords,
+    generate_wordcloud,
+    save_results_csv,
+    save_records_csv,
+    run_pipeline,
+)
+
+__all__ = [
+    'HEADERS',
+    'SITES',
+    'CrawlCancelled',
+    'scroll_to_load_content',
+    'fetch_toutiao_news',
+    'fetch_news',
+    'parse_titles',
+    'analyze_keywords',
+    'generate_wordcloud',
+    'save_results_csv',
+    'save_records_csv',
+    'run_pipeline',
+    'Keyword',
+    'KeywordEngine',
+]
+
+
+def __getattr__(name):
+    # 关键词引擎依赖 NumPy，第一次访问时才导入
+    if name in ('Keyword', 'KeywordEngine'):
+        from . import keywords
+        return getattr(keywords, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
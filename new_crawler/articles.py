@@ -0,0 +1,250 @@
+"""文章正文抓取
+
+标题只有10~30个字，只用标题统计关键词噪声较大。本模块沿着采集到的标题链接，
+用共享连接池（keep-alive）并发抓取文章页：按主机限制并发数，单个响应超过大小上限即放弃；
+用 lxml 做快速的去模板化正文提取（去掉脚本、导航、页眉页脚、侧栏，按段落文本量与链接密度
+选出正文容器），正文分批交给关键词统计后即丢弃。
+
+内存占用与链接数量无关：链接按需从迭代器中取出，同时在途的文章数不超过并发数，
+已提取的正文最多积攒一批。正文按 URL 写入缓存（:class:`~new_crawler.page_cache.PageCache`，
+条目类型 ``article``），以后的爬取不会重复抓取同一篇文章；缓存为回放模式时只读缓存、不联网。
+"""
+import asyncio
+import functools
+import re
+from itertools import islice
+
+from .corpus import Corpus
+from .http_engine import HTTP_HEADERS, HttpFetcher
+from .keywords import KeywordAggregate
+from .metrics import METRICS, stage
+from .page_cache import KIND_ARTICLE
+
+DEFAULT_CACHE_DIR = 'article_cache'
+
+# 文章页请求头：优先接受HTML
+ARTICLE_HEADERS = dict(HTTP_HEADERS, Accept='text/html,application/xhtml+xml;q=0.9,*/*;q=0.8')
+
+# 单个文章页的大小上限（字节）与提取出的正文长度上限（字符）
+MAX_ARTICLE_BYTES = 2 * 1024 * 1024
+MAX_ARTICLE_CHARS = 20000
+# 每批交给关键词统计的正文篇数
+BATCH_SIZE = 32
+
+# 提取正文前整段删除的元素
+BOILERPLATE_TAGS = ('script', 'style', 'noscript', 'iframe', 'nav', 'header', 'footer', 'aside',
+                    'form', 'button', 'select', 'svg')
+# 短于该长度的段落不计分（版权声明、图片说明等）
+MIN_PARAGRAPH_LENGTH = 10
+# 链接文字占比超过该值的段落视为导航或推荐列表
+MAX_LINK_DENSITY = 0.5
+
+_WHITESPACE_RE = re.compile(r'\s+')
+_POSITIVE_RE = re.compile(r'article|content|main|body|text|detail|post|artibody', re.I)
+_NEGATIVE_RE = re.compile(r'comment|footer|sidebar|side|recommend|related|share|nav|menu|ad[-_]|banner', re.I)
+
+
+def _class_weight(element):
+    """按 class/id 中的常见命名调整容器得分"""
+    hint = f"{element.get('class') or ''} {element.get('id') or ''}"
+    weight = 1.0
+    if _POSITIVE_RE.search(hint):
+        weight *= 1.5
+    if _NEGATIVE_RE.search(hint):
+        weight *= 0.3
+    return weight
+
+
+def _text(element):
+    return _WHITESPACE_RE.sub(' ', element.text_content()).strip()
+
+
+def extract_main_text(html, max_chars=MAX_ARTICLE_CHARS):
+    """从文章页HTML中提取正文（段落以换行分隔），找不到正文时返回空字符串"""
+    try:
+        import lxml.etree
+        import lxml.html
+    except ImportError:
+        raise ImportError("正文提取需要安装 lxml：pip install lxml") from None
+
+    if not html or not html.strip():
+        return ''
+    try:
+        root = lxml.html.fromstring(html)
+    except (ValueError, lxml.etree.ParserError):
+        return ''
+    lxml.etree.strip_elements(root, lxml.etree.Comment, *BOILERPLATE_TAGS, with_tail=False)
+
+    # 每个合格段落给父元素计分（祖父元素计一半），得分最高的元素即正文容器
+    paragraphs = []
+    scores = {}
+    for p in root.iter('p'):
+        text = _text(p)
+        if len(text) < MIN_PARAGRAPH_LENGTH:
+            continue
+        link_chars = sum(len(_text(a)) for a in p.iter('a'))
+        if link_chars / len(text) > MAX_LINK_DENSITY:
+            continue
+        parent = p.getparent()
+        if parent is None:
+            continue
+        paragraphs.append((parent, text))
+        scores[parent] = scores.get(parent, 0.0) + len(text)
+        grandparent = parent.getparent()
+        if grandparent is not None:
+            scores[grandparent] = scores.get(grandparent, 0.0) + len(text) / 2
+
+    if scores:
+        best = max(scores, key=lambda element: scores[element] * _class_weight(element))
+        # 正文容器内的全部合格段落（可能分布在多层子元素中），按文档顺序
+        parts = [text for parent, text in paragraphs if parent is best or best in parent.iterancestors()]
+        text = '\n'.join(parts)
+    else:
+        # 没有 <p> 段落的页面：取 <article> 或 <body> 中去掉链接后的文本
+        container = next(iter(root.iter('article')), None)
+        if container is None:
+            container = root.find('body') if root.find('body') is not None else root
+        for a in list(container.iter('a')):
+            a.drop_tree()
+        text = _text(container)
+    return text[:max_chars]
+
+
+class ArticleFetcher:
+    """按需抓取文章正文并分批回调
+
+    用法::
+
+        fetcher = ArticleFetcher(cache=PageCache('article_cache'))
+        stats = fetcher.run(urls, on_batch)   # on_batch([(url, 正文), ...])
+    """
+
+    def __init__(self, cache=None, per_host_limit=2, total_limit=16, timeout=15, proxy=None,
+                 max_bytes=MAX_ARTICLE_BYTES, max_chars=MAX_ARTICLE_CHARS, batch_size=BATCH_SIZE,
+                 progress=None, cancel_event=None):
+        self.cache = cache
+        self.per_host_limit = per_host_limit
+        self.total_limit = total_limit
+        self.timeout = timeout
+        self.proxy = proxy
+        self.max_bytes = max_bytes
+        self.max_chars = max_chars
+        self.batch_size = batch_size
+        self.progress = progress
+        self.cancel_event = cancel_event
+        self.stats = {'fetched': 0, 'cached': 0, 'failed': 0, 'missing': 0, 'empty': 0, 'bytes': 0}
+
+    @property
+    def replay(self):
+        return self.cache is not None and self.cache.replay
+
+    def run(self, urls, on_batch):
+        """抓取 urls（可为任意迭代器）对应的正文，每积攒一批调用一次 on_batch，返回统计"""
+        with stage('fetch_articles') as span:
+            asyncio.run(self._run(iter(urls), on_batch))
+            span.items = self.stats['fetched'] + self.stats['cached']
+            span.size = self.stats['bytes']
+        METRICS.count('article_cache_hits', self.stats['cached'])
+        METRICS.count('article_errors', self.stats['failed'])
+        return dict(self.stats)
+
+    async def _run(self, urls, on_batch):
+        batch = []
+        flush_lock = asyncio.Lock()
+
+        async def flush():
+            nonlocal batch
+            async with flush_lock:
+                if not batch:
+                    return
+                ready, batch = batch, []
+                # 关键词统计在线程中执行，期间其余文章继续抓取；同一时间只处理一批
+                await asyncio.get_running_loop().run_in_executor(None, on_batch, ready)
+
+        async def worker(fetcher):
+            # 所有协程共享同一个迭代器，链接只在需要时才取出
+            for url in urls:
+                if self.cancel_event is not None and self.cancel_event.is_set():
+                    return
+                text = await self._body(fetcher, url)
+                if text:
+                    batch.append((url, text))
+                    if len(batch) >= self.batch_size:
+                        await flush()
+                done = sum(self.stats[key] for key in ('fetched', 'cached', 'failed', 'missing'))
+                if self.progress is not None and done % 50 == 0:
+                    self.progress('articles', f"已处理 {done} 篇文章")
+
+        if self.replay:
+            await asyncio.gather(*(worker(None) for _ in range(self.total_limit)))
+        else:
+            async with HttpFetcher(per_host_limit=self.per_host_limit, total_limit=self.total_limit,
+                                   timeout=self.timeout, headers=ARTICLE_HEADERS, proxy=self.proxy,
+                                   max_bytes=self.max_bytes) as fetcher:
+                await asyncio.gather(*(worker(fetcher) for _ in range(self.total_limit)))
+        await flush()
+
+    async def _body(self, fetcher, url):
+        cache = self.cache
+        if cache is not None:
+            entry = await self._in_thread(cache.get, KIND_ARTICLE, url)
+            if entry is not None:
+                self.stats['cached'] += 1
+                return entry.text
+            if cache.replay:
+                self.stats['missing'] += 1
+                return ''
+
+        try:
+            status, headers, html = await fetcher.fetch(url)
+        except Exception as e:
+            # 单篇文章失败（超时、状态码、超过大小上限等）不影响其余文章
+            self.stats['failed'] += 1
+            print(f"抓取文章失败 {url}: {e}")
+            return ''
+        self.stats['fetched'] += 1
+        self.stats['bytes'] += len(html)
+        content_type = headers.get('Content-Type', '')
+        is_html = 'html' in content_type or not content_type
+        # 正文提取与缓存读写都是同步的CPU/磁盘操作，放到线程中执行，不阻塞其余文章的下载
+        text = await self._in_thread(extract_main_text, html, self.max_chars) if is_html else ''
+        if not text:
+            self.stats['empty'] += 1
+        if cache is not None:
+            # 没有正文的页面也写入缓存，以后不再重复抓取
+            await self._in_thread(cache.put, KIND_ARTICLE, url, text, content_type='text/plain; charset=utf-8')
+        return text
+
+    @staticmethod
+    async def _in_thread(func, *args, **kwargs):
+        return await asyncio.get_running_loop().run_in_executor(None, functools.partial(func, *args, **kwargs))
+
+
+def article_urls(titles, links, limit=None):
+    """按标题顺序生成去重后的文章链接（惰性生成，最多 limit 个）"""
+    def generate():
+        seen = set()
+        for title in titles:
+            url = links.get(title)
+            if url and url.startswith(('http://', 'https://')) and url not in seen:
+                seen.add(url)
+                yield url
+    return islice(generate(), limit)
+
+
+def analyze_articles(titles, links, engine, top_n=20, limit=None, **options):
+    """抓取标题对应的文章正文并流式统计关键词，返回 (关键词列表, 抓取统计)
+
+    engine 为 :class:`~new_crawler.keywords.KeywordEngine`；options 传给 :class:`ArticleFetcher`。
+    正文不经过分词缓存，逐批转换为词语编号语料后累加计数，统计完即释放。
+    """
+    aggregate = KeywordAggregate(engine)
+
+    def on_batch(batch):
+        corpus = Corpus(engine.vocabulary)
+        corpus.add(engine.tokenize_texts([text for _url, text in batch]))
+        aggregate.add_corpus(corpus)
+
+    stats = ArticleFetcher(**options).run(article_urls(titles, links, limit), on_batch)
+    stats['articles'] = aggregate.title_count
+    return aggregate.top(top_n), stats
@@ -0,0 +1,170 @@
+"""多进程批量解析与关键词统计
+
+批量处理大量已保存的页面时，解析（BeautifulSoup 等）与 jieba 分词都受 GIL 限制，
+单进程只能用满一个核。本模块把工作分两步交给进程池：
+
+1. 按页面分发解析任务：页面以文件引用（缓存中的 .gz 文件或普通 HTML 文件）或共享内存块
+   的名字传给子进程，由子进程自己读取，大段 HTML 不经过 pickle；子进程只返回标题列表。
+2. 父进程按页面顺序去重后，把标题分批交给子进程分词计数：每批返回本批出现的词语与
+   对应的 TF/DF 部分计数（NumPy 数组），父进程归并（reduce）到同一个
+   :class:`~new_crawler.keywords.KeywordAggregate` 中再统一计算权重。
+
+结果与单进程的 解析→去重→analyze_keywords 完全一致。子进程启动时从快照加载分词词典
+（见 :mod:`new_crawler.dictionary`），每个进程只加载一次。
+
+用法::
+
+    with SharedPages() as shared:
+        refs = [file_page('a.html'), shared.add(html, url)]
+        results = analyze_pages(refs, workers=4)
+"""
+import gzip
+import os
+import time
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+from .corpus import Corpus
+from .dedup import ordered_unique
+from .dictionary import configure, is_loaded, load_dictionary
+from .keywords import KeywordAggregate, KeywordEngine
+from .metrics import stage
+from .parsers import parse_html
+
+# 每个工作进程分到的标题批数（批越多负载越均衡，批越少归并次数越少）
+BATCHES_PER_WORKER = 4
+
+PageRef = namedtuple('PageRef', ['kind', 'location', 'size', 'url'])
+PageRef.__doc__ = """页面引用：kind 为 'file'（location 为文件路径，.gz 自动解压）或
+'shm'（location 为共享内存块名，size 为字节数）；url 用于选择站点解析配置"""
+
+
+def file_page(path, url=None):
+    """引用磁盘上的HTML文件"""
+    return PageRef('file', path, 0, url)
+
+
+class SharedPages:
+    """把内存中的HTML放入共享内存块，供子进程按名字读取；退出时释放全部内存块"""
+
+    def __init__(self):
+        self.blocks = []
+
+    def add(self, html, url=None):
+        data = html.encode('utf-8')
+        block = shared_memory.SharedMemory(create=True, size=max(len(data), 1))
+        block.buf[:len(data)] = data
+        self.blocks.append(block)
+        return PageRef('shm', block.name, len(data), url)
+
+    def close(self):
+        for block in self.blocks:
+            block.close()
+            block.unlink()
+        self.blocks = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def load_page(ref):
+    """按引用读取页面HTML"""
+    if ref.kind == 'shm':
+        # 进程池的子进程与父进程共用同一个资源跟踪器，附加时重复登记没有影响，由父进程负责释放
+        block = shared_memory.SharedMemory(name=ref.location)
+        try:
+            return bytes(block.buf[:ref.size]).decode('utf-8', errors='replace')
+        finally:
+            block.close()
+    opener = gzip.open if ref.location.endswith('.gz') else open
+    with opener(ref.location, 'rb') as f:
+        return f.read().decode('utf-8', errors='replace')
+
+
+# ---------- 工作进程 ----------
+
+_worker_engine = None
+
+
+def _init_worker(user_dicts):
+    """进程池初始化：加载分词词典，创建进程内的关键词引擎"""
+    global _worker_engine
+    if user_dicts and not is_loaded():
+        configure(user_dicts=user_dicts)
+    load_dictionary()
+    _worker_engine = KeywordEngine(workers=1)
+
+
+def _parse_page(ref, backend):
+    return parse_html(load_page(ref), backend=backend, url=ref.url)
+
+
+def _count_titles(titles):
+    """分词并计数，返回 (词语列表, TF, DF, 标题数)，只包含本批出现的词"""
+    engine = _worker_engine
+    corpus = Corpus(engine.vocabulary)
+    corpus.add(engine.tokenize_texts(titles))
+    tf, df = engine.counts(corpus)
+    ids = tf.nonzero()[0]
+    return engine.vocabulary.decode(ids), tf[ids], df[ids], len(titles)
+
+
+# ---------- 调度与归并 ----------
+
+def _batches(items, count):
+    size = max(1, -(-len(items) // count))
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+
+def analyze_pages(pages, workers=None, backend='html.parser', top_n=20, engine=None,
+                  user_dicts=None, progress=None):
+    """多进程解析页面并统计关键词，返回结果字典
+
+    pages 为 :class:`PageRef` 列表；workers 为进程数（默认 CPU 核数，1 时在当前进程内执行）；
+    engine 为归并与计算权重使用的 :class:`~new_crawler.keywords.KeywordEngine`。
+    返回 {'titles', 'keywords', 'pages', 'workers', 'elapsed'}。
+    """
+    workers = workers or os.cpu_count() or 1
+    engine = engine or KeywordEngine()
+    aggregate = KeywordAggregate(engine)
+    started = time.perf_counter()
+
+    executor = None
+    if workers > 1:
+        executor = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(user_dicts,))
+        run = executor.map
+    else:
+        _init_worker(user_dicts)
+        run = map
+    try:
+        with stage('parse', backend=backend, workers=workers) as span:
+            chunksize = max(1, len(pages) // (workers * BATCHES_PER_WORKER)) if executor else 1
+            options = {'chunksize': chunksize} if executor else {}
+            page_titles = list(run(_parse_page, pages, [backend] * len(pages), **options))
+            titles = ordered_unique(title for page in page_titles for title in page)
+            span.items = len(titles)
+        if progress is not None:
+            progress('parse', f"已解析{len(pages)}个页面，共{len(titles)}条标题")
+
+        with stage('tokenize', workers=workers) as span:
+            for words, tf, df, count in run(_count_titles, _batches(titles, workers * BATCHES_PER_WORKER)):
+                aggregate.merge(words, tf, df, count)
+            span.items = len(titles)
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    keywords = aggregate.top(top_n)
+    if progress is not None:
+        progress('keywords', f"关键词分析完成，共{len(keywords)}个")
+    return {
+        'titles': titles,
+        'keywords': keywords,
+        'pages': len(pages),
+        'workers': workers,
+        'elapsed': time.perf_counter() - started,
+    }
@@ -0,0 +1,341 @@
+"""无头浏览器池
+
+预先启动若干个 Edge 实例，爬取任务借用后归还，避免每次爬取都冷启动浏览器。
+归还时清理 Cookie 与本地存储；浏览器累计加载页数过多、页面 JS 堆占用过高或健康检查失败时自动替换。
+（JS 堆由页面的 ``performance.memory`` 读取，不是浏览器进程的内存。）
+
+默认使用精简配置：页面加载策略为 eager（DOM 就绪即返回，不等待图片等子资源），
+禁用图片，并通过 CDP 的 ``Network.setBlockedURLs`` 屏蔽媒体、字体与广告统计域名的请求。
+我们只需要链接文本，这些资源只会增加流量、加载时间和浏览器内存。
+样式表默认不屏蔽（block_css=True 时才屏蔽）：无限滚动依赖页面布局，没有样式时
+信息流可能不再触发加载。
+"""
+import atexit
+import threading
+import time
+
+from .metrics import stage
+
+# 精简模式的页面加载策略：'eager' 在 DOM 就绪后返回，'none' 发出导航后立即返回
+LEAN_PAGE_LOAD_STRATEGY = 'eager'
+
+# 精简模式下屏蔽的资源扩展名（图片另由浏览器设置整体禁用，包括没有扩展名的图片地址）
+BLOCKED_EXTENSIONS = (
+    'png', 'jpg', 'jpeg', 'gif', 'webp', 'avif', 'svg', 'ico', 'bmp',   # 图片
+    'mp4', 'webm', 'm3u8', 'ts', 'mp3', 'm4a', 'flv',                   # 音视频
+    'woff', 'woff2', 'ttf', 'otf', 'eot',                               # 字体
+)
+
+# block_css=True 时额外屏蔽的样式表扩展名
+STYLESHEET_EXTENSIONS = ('css',)
+
+# 精简模式下屏蔽的广告与统计域名（含子域名），可通过 blocked_domains 参数替换或扩展
+BLOCKED_DOMAINS = (
+    'google-analytics.com',
+    'googletagmanager.com',
+    'googlesyndication.com',
+    'doubleclick.net',
+    'hm.baidu.com',
+    'cnzz.com',
+    'mcs.snssdk.com',
+    'mon.snssdk.com',
+    'mcs.zijieapi.com',
+    'mon.zijieapi.com',
+)
+
+
+def build_edge_options(user_agent=None, lean=False, page_load_strategy=None):
+    """配置无头浏览器选项
+
+    lean 为 True 时使用精简配置（默认 eager 加载策略、禁用图片与自动播放）；
+    page_load_strategy 可显式指定 'normal' / 'eager' / 'none'。
+    """
+    from selenium.webdriver.edge.options import Options as EdgeOptions
+
+    options = EdgeOptions()
+    options.add_argument('--headless')  # 无头模式
+    options.add_argument('--disable-gpu')
+    options.add_argument('--no-sandbox')
+    options.add_argument('--disable-dev-shm-usage')
+    if user_agent:
+        options.add_argument(f'user-agent={user_agent}')
+    if lean:
+        options.page_load_strategy = page_load_strategy or LEAN_PAGE_LOAD_STRATEGY
+        options.add_argument('--blink-settings=imagesEnabled=false')
+        options.add_argument('--mute-audio')
+        options.add_argument('--autoplay-policy=user-gesture-required')
+        options.add_experimental_option('prefs', {'profile.managed_default_content_settings.images': 2})
+    elif page_load_strategy:
+        options.page_load_strategy = page_load_strategy
+    return options
+
+
+def blocked_url_patterns(extensions=BLOCKED_EXTENSIONS, domains=BLOCKED_DOMAINS):
+    """生成 ``Network.setBlockedURLs`` 使用的通配符列表"""
+    patterns = []
+    for ext in extensions:
+        patterns.extend((f'*.{ext}', f'*.{ext}?*'))
+    for domain in domains:
+        patterns.extend((f'*://{domain}/*', f'*://*.{domain}/*'))
+    return patterns
+
+
+def block_requests(driver, patterns):
+    """通过 CDP 屏蔽匹配的请求，浏览器不支持时返回 False（页面照常加载）"""
+    try:
+        driver.execute_cdp_cmd('Network.enable', {})
+        driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': list(patterns)})
+        return True
+    except Exception as e:
+        print(f"无法启用请求屏蔽: {e}")
+        return False
+
+
+def create_driver(user_agent=None, lean=False, page_load_strategy=None, blocked_domains=BLOCKED_DOMAINS,
+                  block_css=False):
+    """创建浏览器实例；lean 为 True 时使用精简配置并屏蔽无关资源的请求（block_css 时包括样式表）"""
+    from selenium import webdriver
+
+    with stage('browser_start', lean=lean):
+        driver = webdriver.Edge(options=build_edge_options(user_agent, lean, page_load_strategy))
+        if lean:
+            extensions = BLOCKED_EXTENSIONS + (STYLESHEET_EXTENSIONS if block_css else ())
+            block_requests(driver, blocked_url_patterns(extensions, blocked_domains))
+    return driver
+
+
+class _PooledDriver:
+    """池中的一个浏览器及其使用统计"""
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.pages = 0
+        self.borrows = 0
+        self.created_at = time.time()
+
+
+class DriverPool:
+    """可复用的浏览器池
+
+    用法::
+
+        pool = DriverPool(size=2)
+        with pool.borrow() as driver:
+            driver.get(url)
+            pool.add_pages(driver, 3)
+        pool.close()
+    """
+
+    def __init__(self, size=1, max_pages=200, max_js_heap_mb=1024, user_agent=None,
+                 factory=None, prestart=True, lean=True, page_load_strategy=None,
+                 blocked_domains=BLOCKED_DOMAINS, block_css=False):
+        self.size = size
+        self.max_pages = max_pages
+        self.max_js_heap_mb = max_js_heap_mb
+        self.user_agent = user_agent
+        self.lean = lean
+        self.factory = factory or (lambda: create_driver(self.user_agent, lean=lean,
+                                                         page_load_strategy=page_load_strategy,
+                                                         blocked_domains=blocked_domains,
+                                                         block_css=block_css))
+
+        self._idle = []
+        self._entries = {}  # id(driver) -> _PooledDriver
+        self._creating = 0
+        self._closed = False
+        self._cond = threading.Condition()
+
+        if prestart:
+            self.warm_up()
+
+    # ---- 生命周期 ----
+
+    def warm_up(self, count=None):
+        """在后台线程中预启动浏览器，不阻塞调用方"""
+        count = self.size if count is None else count
+        for _ in range(count):
+            with self._cond:
+                if self._closed or len(self._entries) + self._creating >= self.size:
+                    return
+                self._creating += 1
+            threading.Thread(target=self._start_one, name='driver-warmup', daemon=True).start()
+
+    def _start_one(self):
+        entry = None
+        try:
+            entry = _PooledDriver(self.factory())
+        except Exception as e:
+            print(f"预启动浏览器失败: {e}")
+        with self._cond:
+            self._creating -= 1
+            if entry is not None:
+                if self._closed:
+                    self._quit(entry.driver)
+                else:
+                    self._entries[id(entry.driver)] = entry
+                    self._idle.append(entry)
+            self._cond.notify_all()
+
+    def close(self):
+        """关闭池中所有浏览器"""
+        with self._cond:
+            self._closed = True
+            entries = list(self._entries.values())
+            self._entries.clear()
+            self._idle.clear()
+            self._cond.notify_all()
+        for entry in entries:
+            self._quit(entry.driver)
+
+    # ---- 借用与归还 ----
+
+    def acquire(self, timeout=None):
+        """借出一个健康的浏览器；池已满且全部被占用时等待归还"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._cond:
+                if self._closed:
+                    raise RuntimeError("浏览器池已关闭")
+                entry = self._idle.pop() if self._idle else None
+                create = False
+                if entry is None:
+                    if len(self._entries) + self._creating < self.size:
+                        self._creating += 1
+                        create = True
+                    else:
+                        remaining = None if deadline is None else deadline - time.monotonic()
+                        if remaining is not None and remaining <= 0:
+                            raise TimeoutError("等待可用浏览器超时")
+                        self._cond.wait(remaining)
+                        continue
+
+            if create:
+                try:
+                    entry = _PooledDriver(self.factory())
+                finally:
+                    with self._cond:
+                        self._creating -= 1
+                        # 创建失败时空出的名额要唤醒等待中的线程
+                        self._cond.notify_all()
+                with self._cond:
+                    self._entries[id(entry.driver)] = entry
+            elif not self._is_healthy(entry.driver):
+                print("浏览器健康检查失败，重新创建")
+                self._discard(entry)
+                continue
+
+            entry.borrows += 1
+            return entry.driver
+
+    def release(self, driver, pages=0):
+        """归还浏览器：清理会话状态，必要时回收并补充新实例"""
+        entry = self._entries.get(id(driver))
+        if entry is None:
+            self._quit(driver)
+            return
+        entry.pages += pages
+
+        recycle = entry.pages >= self.max_pages
+        if not recycle:
+            heap = self._js_heap_mb(driver)
+            recycle = heap is not None and heap >= self.max_js_heap_mb
+        if not recycle:
+            recycle = not self._reset(driver)
+
+        if recycle or self._closed:
+            self._discard(entry)
+            self.warm_up(1)
+            return
+
+        with self._cond:
+            self._idle.append(entry)
+            self._cond.notify_all()
+
+    def add_pages(self, driver, pages):
+        """记录浏览器加载的页数，用于达到上限后回收"""
+        entry = self._entries.get(id(driver))
+        if entry is not None:
+            entry.pages += pages
+
+    def borrow(self, timeout=None):
+        """以上下文管理器形式借用浏览器"""
+        return _Borrowed(self, timeout)
+
+    # ---- 内部工具 ----
+
+    def _discard(self, entry):
+        with self._cond:
+            self._entries.pop(id(entry.driver), None)
+            if entry in self._idle:
+                self._idle.remove(entry)
+            self._cond.notify_all()
+        self._quit(entry.driver)
+
+    @staticmethod
+    def _quit(driver):
+        try:
+            driver.quit()
+        except Exception:
+            pass
+
+    @staticmethod
+    def _is_healthy(driver):
+        try:
+            return driver.execute_script("return 1;") == 1
+        except Exception:
+            return False
+
+    @staticmethod
+    def _js_heap_mb(driver):
+        """读取页面 JS 堆占用（MB），浏览器不支持时返回 None"""
+        try:
+            used = driver.execute_script(
+                "return window.performance && performance.memory ? performance.memory.usedJSHeapSize : null;")
+        except Exception:
+            return None
+        return used / (1024 * 1024) if used else None
+
+    @staticmethod
+    def _reset(driver):
+        """清除 Cookie、本地存储和缓存，返回是否成功"""
+        try:
+            driver.execute_script(
+                "try { window.localStorage.clear(); window.sessionStorage.clear(); } catch (e) {}")
+            try:
+                driver.execute_cdp_cmd('Network.clearBrowserCookies', {})
+                driver.execute_cdp_cmd('Network.clearBrowserCache', {})
+            except Exception:
+                driver.delete_all_cookies()
+            driver.get('about:blank')
+            return True
+        except Exception:
+            return False
+
+
+class _Borrowed:
+    def __init__(self, pool, timeout):
+        self.pool = pool
+        self.timeout = timeout
+        self.driver = None
+
+    def __enter__(self):
+        self.driver = self.pool.acquire(self.timeout)
+        return self.driver
+
+    def __exit__(self, exc_type, exc, tb):
+        self.pool.release(self.driver)
+        return False
+
+
+_default_pool = None
+_default_lock = threading.Lock()
+
+
+def get_default_pool(size=1, user_agent=None, lean=True):
+    """获取进程内共享的浏览器池（首次调用时创建并预启动）"""
+    global _default_pool
+    with _default_lock:
+        if _default_pool is None:
+            _default_pool = DriverPool(size=size, user_agent=user_agent, lean=lean)
+            atexit.register(_default_pool.close)
+        return _default_pool
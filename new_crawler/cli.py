@@ -0,0 +1,552 @@
+"""命令行入口
+
+    python -m new_crawler crawl --url URL --pages 3 --out output/
+    python -m new_crawler crawl --url URL1 --url URL2 --pool-size 2 --out output/
+    python -m new_crawler multi --sources sources.json --concurrency 4 --out output/
+    python -m new_crawler daemon --sources sources.json --interval 300 --out output/
+    python -m new_crawler crawl --url URL --articles 100 --out output/
+    python -m new_crawler batch --cache-dir page_cache --workers 4 --out output/
+    python -m new_crawler crawl --url URL --metrics-log metrics.jsonl --metrics-file metrics.prom
+    python -m new_crawler history --db history.db keywords --since 7d
+    python -m new_crawler history --db history.db search 人工智能
+    python -m new_crawler history --db history.db export history.parquet --since 30d
+    python -m new_crawler gui
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+
+def _add_common_arguments(parser):
+    """crawl 与 multi 共用的参数"""
+    parser.add_argument('--pages', type=int, default=None,
+                        help='滚动加载页数（默认3；指定--target时为滚动上限）')
+    parser.add_argument('--out', default='output', help='结果输出目录')
+    parser.add_argument('--top', type=int, default=20, help='提取关键词数量')
+    parser.add_argument('--no-wordcloud', action='store_true', help='不生成词云图')
+    parser.add_argument('--adaptive', action='store_true',
+                        help='自适应滚动：内容增长即继续，信息流到底提前结束')
+    parser.add_argument('--target', type=int, default=None, help='目标标题条数（达到即停止滚动）')
+    parser.add_argument('--incremental', action='store_true',
+                        help='滚动过程中在浏览器内增量提取标题，不拉取整页源码')
+    parser.add_argument('--parser', default='html.parser',
+                        help='整页解析后端：html.parser / lxml / lxml-xpath / selectolax / auto')
+    parser.add_argument('--engine', choices=('auto', 'http', 'browser'), default='auto',
+                        help='抓取引擎（auto：有数据接口的站点走HTTP，其余用浏览器）')
+    parser.add_argument('--api-base', default=None, help='替换HTTP接口的主机地址（如本地替身服务器）')
+    parser.add_argument('--proxy', default=None,
+                        help='HTTP抓取与文章正文抓取使用的代理（如 http://127.0.0.1:8080）')
+    parser.add_argument('--pool-size', type=int, default=1, help='预启动的浏览器数量')
+    parser.add_argument('--full-page', action='store_true',
+                        help='浏览器加载完整页面（不屏蔽图片、媒体、字体与广告统计请求）')
+    parser.add_argument('--block-css', action='store_true',
+                        help='精简模式下同时屏蔽样式表（更省流量，但依赖布局的无限滚动可能不再加载）')
+    parser.add_argument('--page-load-strategy', choices=('normal', 'eager', 'none'), default=None,
+                        help='浏览器页面加载策略（默认精简模式为eager，--full-page时为normal）')
+    parser.add_argument('--block-domain', action='append', default=None,
+                        help='额外屏蔽的广告/统计域名（含子域名），可重复指定')
+    parser.add_argument('--keyword-cache', default=None,
+                        help='分词缓存库路径；以前分析过的标题不再重复分词')
+    parser.add_argument('--user-dict', action='append', default=None,
+                        help='jieba 自定义词典，可重复指定（与默认词典一起合并进词典快照）')
+    parser.add_argument('--dedup-db', default=None,
+                        help='持久化去重库路径；指定后只分析以前没见过的标题（含近似重复）')
+    parser.add_argument('--dedup-threshold', type=float, default=None,
+                        help='近似重复阈值：标题字符三元组的 Jaccard 相似度（默认0.8，设为1只去除精确重复）')
+    parser.add_argument('--history-db', default=None,
+                        help='爬取历史库路径；每次爬取的标题、来源与时间都写入该库')
+    parser.add_argument('--cache-dir', default=None,
+                        help='页面缓存目录：录制渲染后的页面与HTTP响应（HTTP抓取使用条件请求）')
+    parser.add_argument('--replay', action='store_true',
+                        help='从 --cache-dir 回放，不联网、不启动浏览器')
+    parser.add_argument('--trend-state', default=None,
+                        help='热度趋势状态文件（.npz）；指定后累计多次运行的新标题并输出 trends.csv')
+    parser.add_argument('--metrics-log', default=None,
+                        help='运行指标日志（JSON行）：每个阶段的耗时、CPU时间、内存与条目数')
+    parser.add_argument('--metrics-file', default=None,
+                        help='Prometheus 文本格式的指标文件（结束时写出；持续爬取时每轮更新）')
+    parser.add_argument('--metrics-port', type=int, default=None,
+                        help='在该端口提供 /metrics 端点（Prometheus 文本格式）')
+
+
+def build_parser():
+    """构建命令行参数解析器"""
+    parser = argparse.ArgumentParser(prog='python -m new_crawler', description='新闻爬虫分析系统')
+    subparsers = parser.add_subparsers(dest='command')
+
+    # 无界面批量爬取
+    crawl = subparsers.add_parser('crawl', help='无界面爬取并输出结果')
+    crawl.add_argument('--url', action='append', default=None,
+                       help='目标网站URL，可重复指定多个（默认今日头条）')
+    crawl.add_argument('--articles', type=int, default=0,
+                       help='沿标题链接抓取前N篇文章正文并输出正文关键词 article_keywords.csv（默认0为不抓取）')
+    crawl.add_argument('--article-cache', default=None,
+                       help='文章正文缓存目录（默认使用 --cache-dir，未指定时为 article_cache）；缓存过的文章不再抓取')
+    crawl.add_argument('--article-concurrency', type=int, default=2, help='抓取正文时每个主机的并发数')
+    crawl.add_argument('--article-max-kb', type=int, default=2048, help='单个文章页的大小上限（KB）')
+    _add_common_arguments(crawl)
+
+    # 多来源并发爬取
+    multi = subparsers.add_parser('multi', help='并发爬取多个来源并合并结果')
+    multi.add_argument('--url', action='append', default=None,
+                       help='来源URL，可重复指定（未指定且无--sources时使用全部内置站点）')
+    multi.add_argument('--sources', default=None,
+                       help='来源配置JSON文件：[{"url": ..., "pages": 3, "priority": 1, "name": ...}, ...]')
+    multi.add_argument('--concurrency', type=int, default=4, help='全局并发任务数上限')
+    multi.add_argument('--rate', type=float, default=1.0, help='每个域名每秒允许启动的任务数')
+    multi.add_argument('--retries', type=int, default=2, help='失败重试次数')
+    _add_common_arguments(multi)
+
+    # 持续爬取
+    daemon = subparsers.add_parser('daemon', help='按间隔持续爬取，只增量处理新标题')
+    daemon.add_argument('--url', action='append', default=None,
+                        help='来源URL，可重复指定（未指定且无--sources时使用全部内置站点）')
+    daemon.add_argument('--sources', default=None,
+                        help='来源配置JSON文件，可为每个来源单独指定 "interval"（秒）')
+    daemon.add_argument('--interval', type=float, default=300, help='默认爬取间隔（秒）')
+    daemon.add_argument('--cycles', type=int, default=None, help='运行指定轮数后退出（默认一直运行）')
+    daemon.add_argument('--concurrency', type=int, default=4, help='全局并发任务数上限')
+    daemon.add_argument('--rate', type=float, default=1.0, help='每个域名每秒允许启动的任务数')
+    daemon.add_argument('--retries', type=int, default=2, help='失败重试次数')
+    daemon.add_argument('--keyword-horizon', type=float, default=7 * 86400,
+                        help='关键词排名只统计最近这段时间（秒）内的新标题（默认7天）')
+    _add_common_arguments(daemon)
+
+    # 多进程批量分析
+    batch = subparsers.add_parser('batch', help='多进程批量解析已保存的页面并统计关键词')
+    batch.add_argument('html', nargs='*', help='HTML文件（可为 .gz 压缩文件）')
+    batch.add_argument('--cache-dir', default=None, help='同时处理该页面缓存中录制的全部浏览器页面')
+    batch.add_argument('--workers', type=int, default=None, help='工作进程数（默认CPU核数，1为单进程）')
+    batch.add_argument('--parser', default='html.parser',
+                       help='解析后端：html.parser / lxml / lxml-xpath / selectolax / auto')
+    batch.add_argument('--out', default='output', help='结果输出目录')
+    batch.add_argument('--top', type=int, default=20, help='提取关键词数量')
+    batch.add_argument('--no-wordcloud', action='store_true', help='不生成词云图')
+    batch.add_argument('--user-dict', action='append', default=None, help='jieba 自定义词典，可重复指定')
+
+    # 历史查询
+    history = subparsers.add_parser('history', help='查询爬取历史库')
+    history.add_argument('--db', default='history.db', help='爬取历史库路径')
+    queries = history.add_subparsers(dest='query')
+    keywords = queries.add_parser('keywords', help='统计时间窗口内的关键词')
+    keywords.add_argument('--since', default=None, help='起始时间：7d / 12h 或 ISO 日期')
+    keywords.add_argument('--until', default=None, help='结束时间：7d / 12h 或 ISO 日期')
+    keywords.add_argument('--source', default=None, help='只统计该来源（域名）')
+    keywords.add_argument('--top', type=int, default=20, help='输出关键词数量')
+    search = queries.add_parser('search', help='全文检索历史标题')
+    search.add_argument('text', help='检索词')
+    search.add_argument('--since', default=None, help='只返回该时间之后仍出现过的标题')
+    search.add_argument('--limit', type=int, default=50, help='最多返回条数')
+    runs = queries.add_parser('runs', help='列出最近的爬取记录')
+    runs.add_argument('--limit', type=int, default=20, help='最多返回条数')
+    export = queries.add_parser('export', help='分块导出历史标题（CSV / JSONL / Parquet）')
+    export.add_argument('path', help='输出文件，格式与压缩方式按扩展名识别（如 .csv.gz、.jsonl、.parquet）')
+    export.add_argument('--since', default=None, help='起始时间：7d / 12h 或 ISO 日期')
+    export.add_argument('--until', default=None, help='结束时间：7d / 12h 或 ISO 日期')
+    export.add_argument('--source', default=None, help='只导出该来源（域名）')
+    export.add_argument('--format', choices=('csv', 'jsonl', 'parquet'), default=None,
+                        help='导出格式（默认按扩展名）')
+    export.add_argument('--compression', default=None,
+                        help='压缩方式：CSV/JSONL 为 gzip/bz2/xz，Parquet 为 snappy/zstd/gzip/none')
+    export.add_argument('--chunk-size', type=int, default=5000, help='每批读取与写出的行数')
+
+    # 图形界面
+    subparsers.add_parser('gui', help='启动图形界面')
+
+    return parser
+
+
+def _default_pages(args):
+    if args.pages is None and not args.target:
+        return 3
+    return args.pages
+
+
+def _fetch_options(args, pool, page_cache=None):
+    """将命令行参数转换为 fetch_news 的关键字参数"""
+    return {
+        'page_cache': page_cache,
+        'pool': pool,
+        'adaptive': args.adaptive,
+        'target_count': args.target,
+        'incremental': args.incremental,
+        'parser_backend': args.parser,
+        'http_options': {'api_base': args.api_base, 'proxy': args.proxy},
+    }
+
+
+def _open_pool(args, urls):
+    """创建浏览器池；全部走HTTP引擎时不预启动浏览器"""
+    from .browser_pool import BLOCKED_DOMAINS, DriverPool
+    from .engine import HEADERS
+    from .http_engine import http_site_for_url
+
+    needs_browser = not args.replay and (args.engine == 'browser' or (
+        args.engine == 'auto' and any(http_site_for_url(u) is None for u in urls)))
+    return DriverPool(size=args.pool_size, user_agent=HEADERS["User-Agent"], prestart=needs_browser,
+                      lean=not args.full_page, page_load_strategy=args.page_load_strategy,
+                      blocked_domains=BLOCKED_DOMAINS + tuple(args.block_domain or ()),
+                      block_css=args.block_css)
+
+
+def _open_cache(args):
+    if not args.cache_dir:
+        if args.replay:
+            raise SystemExit("--replay 需要同时指定 --cache-dir")
+        return None
+    from .page_cache import PageCache
+    return PageCache(args.cache_dir, mode='replay' if args.replay else 'record')
+
+
+def _article_options(args, page_cache):
+    """返回 (run_pipeline 的 article_options, 需要关闭的正文缓存)，未开启正文抓取时为 (None, None)"""
+    if not args.articles:
+        return None, None
+    from .articles import DEFAULT_CACHE_DIR
+    from .page_cache import PageCache
+
+    own_cache = None
+    cache = page_cache
+    if args.article_cache or cache is None:
+        cache = own_cache = PageCache(args.article_cache or DEFAULT_CACHE_DIR,
+                                      mode='replay' if args.replay else 'record')
+    options = {
+        'limit': args.articles,
+        'cache': cache,
+        'per_host_limit': args.article_concurrency,
+        'max_bytes': args.article_max_kb * 1024,
+        'proxy': args.proxy,
+    }
+    return options, own_cache
+
+
+def _keyword_engine(args):
+    from .dictionary import configure
+    from .keywords import KeywordEngine
+
+    if args.user_dict:
+        configure(user_dicts=args.user_dict)
+    return KeywordEngine(cache_path=args.keyword_cache)
+
+
+def _open_dedup(args):
+    if not args.dedup_db:
+        return None
+    from .dedup import DEFAULT_THRESHOLD, DedupStore
+    threshold = DEFAULT_THRESHOLD if args.dedup_threshold is None else args.dedup_threshold
+    return DedupStore(args.dedup_db, threshold=threshold)
+
+
+def _open_history(args, keyword_engine):
+    if not args.history_db:
+        return None
+    from .storage import HistoryStore
+    return HistoryStore(args.history_db, tokenize=keyword_engine.tokenize)
+
+
+def _open_trends(args):
+    if not args.trend_state:
+        return None
+    from .trends import TrendEngine
+    return TrendEngine.open(args.trend_state)
+
+
+def _start_metrics(args):
+    """按参数打开指标日志与 HTTP 端点，返回端点服务器（未指定端口时为 None）"""
+    from .metrics import METRICS
+
+    if args.metrics_log:
+        METRICS.open_log(args.metrics_log)
+    if args.metrics_port is not None:
+        return METRICS.serve(args.metrics_port)
+    return None
+
+
+def _write_metrics(args):
+    if args.metrics_file:
+        from .metrics import METRICS
+        METRICS.write_prometheus(args.metrics_file)
+
+
+def _finish_metrics(args, server):
+    from .metrics import METRICS
+
+    _write_metrics(args)
+    if args.metrics_file:
+        print(f"运行指标已写入: {args.metrics_file}")
+    summary = METRICS.run_summary()
+    if summary:
+        print(f"各阶段耗时：{summary}")
+    if server is not None:
+        server.shutdown()
+    METRICS.close()
+
+
+def _write_trends(args, trend_engine, out_dir):
+    """保存趋势状态并输出趋势表"""
+    from .export import export_trends
+
+    trend_engine.save(args.trend_state)
+    rows = trend_engine.summary(top_n=args.top)
+    os.makedirs(out_dir, exist_ok=True)
+    export_trends(rows, os.path.join(out_dir, 'trends.csv'), window_names=list(trend_engine.windows))
+    return rows
+
+
+def cmd_crawl(args):
+    """执行无界面爬取，多个URL共享同一个浏览器池"""
+    from .engine import SITES, run_pipeline
+
+    urls = args.url or [SITES[0]]
+    pages = _default_pages(args)
+    page_cache = pool = dedup_store = keyword_engine = history_store = article_cache = None
+    try:
+        page_cache = _open_cache(args)
+        pool = _open_pool(args, urls)
+        dedup_store = _open_dedup(args)
+        keyword_engine = _keyword_engine(args)
+        history_store = _open_history(args, keyword_engine)
+        trend_engine = _open_trends(args)
+        article_options, article_cache = _article_options(args, page_cache)
+        for i, url in enumerate(urls, 1):
+            out_dir = args.out if len(urls) == 1 else os.path.join(args.out, f"site{i}")
+            options = _fetch_options(args, pool, page_cache)
+            results = run_pipeline(url, pages, out_dir=out_dir,
+                                   wordcloud=not args.no_wordcloud, top_n=args.top,
+                                   engine=args.engine, dedup_store=dedup_store,
+                                   keyword_engine=keyword_engine, history_store=history_store,
+                                   article_options=article_options, **options)
+            print(f"标题 {len(results['titles'])} 条（历史重复 {results['duplicates']} 条），"
+                  f"关键词 {len(results['keywords'])} 个，结果已写入: {out_dir}")
+            if article_options is not None:
+                stats = results['article_stats']
+                print(f"正文 {stats['articles']} 篇（新抓取 {stats['fetched']}，缓存 {stats['cached']}，"
+                      f"失败 {stats['failed']}，无正文 {stats['empty']}），"
+                      f"正文关键词 {len(results['article_keywords'])} 个")
+            if trend_engine is not None:
+                trend_engine.observe(results['titles'], keyword_engine)
+                _write_trends(args, trend_engine, out_dir)
+    finally:
+        # 打开到一半失败时，只关闭已经打开的资源
+        for resource in (pool, page_cache, article_cache, keyword_engine, dedup_store, history_store):
+            if resource is not None:
+                resource.close()
+    return 0
+
+
+def cmd_multi(args):
+    """并发爬取多个来源，合并去重后统一分析"""
+    from .engine import analyze_keywords, generate_wordcloud, save_records_csv, save_results_csv
+    from .metrics import METRICS
+    from .scheduler import CrawlScheduler
+
+    with METRICS.run(label='multi'):
+        sources = _load_sources(args, _default_pages(args))
+
+        started_at = time.time()
+        page_cache = _open_cache(args)
+        pool = _open_pool(args, [s.url for s in sources])
+        try:
+            scheduler = CrawlScheduler(max_workers=args.concurrency, browser_workers=args.pool_size,
+                                       domain_rate=args.rate, retries=args.retries,
+                                       fetch_options=_fetch_options(args, pool, page_cache))
+            results = scheduler.run(sources)
+        finally:
+            pool.close()
+            if page_cache is not None:
+                page_cache.close()
+
+        keyword_engine = _keyword_engine(args)
+        try:
+            history_store = _open_history(args, keyword_engine)
+            if history_store is not None:
+                with history_store:
+                    history_store.record_run(results['records'], label='multi', started_at=started_at)
+
+            dedup_store = _open_dedup(args)
+            if dedup_store is not None:
+                with dedup_store:
+                    fresh = set(dedup_store.filter(results['titles']))
+                results['titles'] = [t for t in results['titles'] if t in fresh]
+                results['records'] = [r for r in results['records'] if r['title'] in fresh]
+
+            keywords = analyze_keywords(results['titles'], top_n=args.top, engine=keyword_engine)
+            trend_engine = _open_trends(args)
+            if trend_engine is not None:
+                trend_engine.observe(results['titles'], keyword_engine)
+                _write_trends(args, trend_engine, args.out)
+            os.makedirs(args.out, exist_ok=True)
+            save_results_csv(keywords, results['titles'], os.path.join(args.out, 'keywords.csv'))
+            save_records_csv(results['records'], os.path.join(args.out, 'records.csv'))
+            with open(os.path.join(args.out, 'sources.json'), 'w', encoding='utf-8') as f:
+                json.dump(results['sources'], f, ensure_ascii=False, indent=2)
+            if not args.no_wordcloud:
+                generate_wordcloud(keywords, os.path.join(args.out, 'wordcloud.png'))
+        finally:
+            keyword_engine.close()
+
+        for name, stat in results['sources'].items():
+            status = f"失败: {stat['error']}" if stat['error'] else f"{stat['count']}条，{stat['elapsed']:.1f}秒"
+            print(f"  {name}: {status}")
+        print(f"共 {len(results['titles'])} 条去重标题，总耗时 {results['elapsed']:.1f}秒，结果已写入: {args.out}")
+        return 0
+
+
+def _load_sources(args, pages):
+    from urllib.parse import urlparse
+    from .engine import SITES
+    from .scheduler import Source
+
+    if args.sources:
+        with open(args.sources, 'r', encoding='utf-8') as f:
+            return [Source.from_dict(item) for item in json.load(f)]
+    urls = args.url or SITES
+    hosts = [urlparse(url).hostname for url in urls]
+    # 同一主机的多个地址以完整URL命名，避免来源名称重复
+    return [Source(url, max_pages=pages, engine=args.engine, name=url if hosts.count(host) > 1 else None)
+            for url, host in zip(urls, hosts)]
+
+
+def cmd_daemon(args):
+    """持续爬取：每个来源按自己的间隔重新爬取，只分析新出现的标题"""
+    import threading
+    from .daemon import CrawlDaemon
+    from .scheduler import CrawlScheduler
+
+    sources = _load_sources(args, _default_pages(args))
+    stop_event = threading.Event()
+    page_cache = pool = keyword_engine = history_store = dedup_store = trend_engine = None
+
+    def after_cycle(delta):
+        if trend_engine is not None:
+            trend_engine.save(args.trend_state)
+        _write_metrics(args)
+
+    try:
+        page_cache = _open_cache(args)
+        pool = _open_pool(args, [s.url for s in sources])
+        keyword_engine = _keyword_engine(args)
+        history_store = _open_history(args, keyword_engine)
+        dedup_store = _open_dedup(args)
+        trend_engine = _open_trends(args)
+        scheduler = CrawlScheduler(max_workers=args.concurrency, browser_workers=args.pool_size,
+                                   domain_rate=args.rate, retries=args.retries,
+                                   fetch_options=_fetch_options(args, pool, page_cache))
+        daemon = CrawlDaemon(sources, scheduler=scheduler, keyword_engine=keyword_engine,
+                             dedup_store=dedup_store, history_store=history_store,
+                             out_dir=args.out, top_n=args.top, wordcloud=not args.no_wordcloud,
+                             default_interval=args.interval, trend_engine=trend_engine,
+                             keyword_horizon=args.keyword_horizon, on_update=after_cycle)
+        try:
+            daemon.run(cycles=args.cycles, cancel_event=stop_event)
+        except KeyboardInterrupt:
+            stop_event.set()
+            print("收到中断信号，已停止")
+    finally:
+        # 打开到一半失败时，只关闭已经打开的资源
+        for resource in (pool, page_cache, keyword_engine, history_store, dedup_store):
+            if resource is not None:
+                resource.close()
+    return 0
+
+
+def cmd_batch(args):
+    """多进程批量解析已保存的页面（HTML文件与页面缓存），合并统计关键词"""
+    from .batch import PageRef, analyze_pages, file_page
+    from .engine import generate_wordcloud, save_results_csv
+
+    pages = [file_page(path) for path in args.html]
+    if args.cache_dir:
+        from .page_cache import KIND_PAGE, PageCache
+        with PageCache(args.cache_dir, mode='replay') as cache:
+            pages.extend(PageRef('file', entry.path, 0, entry.url) for entry in cache.entries(KIND_PAGE))
+    if not pages:
+        print("没有要处理的页面：请指定HTML文件或 --cache-dir")
+        return 1
+
+    if args.user_dict:
+        from .dictionary import configure
+        configure(user_dicts=args.user_dict)
+    results = analyze_pages(pages, workers=args.workers, backend=args.parser, top_n=args.top,
+                            user_dicts=args.user_dict)
+    os.makedirs(args.out, exist_ok=True)
+    save_results_csv(results['keywords'], results['titles'], os.path.join(args.out, 'keywords.csv'))
+    if not args.no_wordcloud:
+        generate_wordcloud(results['keywords'], os.path.join(args.out, 'wordcloud.png'))
+    print(f"{results['pages']} 个页面，{len(results['titles'])} 条去重标题，{results['workers']} 个进程，"
+          f"耗时 {results['elapsed']:.1f}秒（{results['pages'] / max(results['elapsed'], 1e-9):.1f} 页/秒），"
+          f"结果已写入: {args.out}")
+    return 0
+
+
+def _format_time(timestamp):
+    from datetime import datetime
+    return datetime.fromtimestamp(timestamp).strftime('%Y-%m-%d %H:%M')
+
+
+def cmd_history(args):
+    """查询爬取历史库：时间窗口关键词统计、全文检索、爬取记录"""
+    from .storage import HistoryStore, parse_time
+
+    if not args.query:
+        build_parser().parse_args(['history', '--help'])
+    if not os.path.exists(args.db):
+        print(f"历史库不存在: {args.db}")
+        return 1
+
+    with HistoryStore(args.db) as store:
+        if args.query == 'keywords':
+            rows = store.keyword_counts(since=parse_time(args.since), until=parse_time(args.until),
+                                        top_n=args.top, source=args.source)
+            for i, (word, count, titles) in enumerate(rows, 1):
+                print(f"{i:>3}. {word}\t出现{count}次\t{titles}条标题")
+        elif args.query == 'search':
+            for row in store.search(args.text, limit=args.limit, since=parse_time(args.since)):
+                print(f"[{_format_time(row['last_seen'])}] {row['title']}（{row['source']}，"
+                      f"出现{row['seen_count']}次）")
+        elif args.query == 'export':
+            from .export import export_history
+            count = export_history(store, args.path, since=parse_time(args.since),
+                                   until=parse_time(args.until), source=args.source,
+                                   chunk_size=args.chunk_size, fmt=args.format,
+                                   compression=args.compression)
+            print(f"已导出 {count} 条标题: {args.path}")
+        elif args.query == 'runs':
+            for run_id, label, started_at, finished_at, count, new_count in store.runs(args.limit):
+                print(f"#{run_id} {_format_time(started_at)} {label or ''}：{count}条标题，新增{new_count}条")
+    return 0
+
+
+def cmd_gui(args):
+    """启动图形界面（仅在此处导入tkinter）"""
+    from .new_crawler import main as gui_main
+    gui_main()
+    return 0
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+
+    crawl_commands = {'crawl': cmd_crawl, 'multi': cmd_multi, 'daemon': cmd_daemon}
+    if args.command in crawl_commands:
+        server = _start_metrics(args)
+        try:
+            return crawl_commands[args.command](args)
+        finally:
+            _finish_metrics(args, server)
+    if args.command == 'batch':
+        return cmd_batch(args)
+    if args.command == 'history':
+        return cmd_history(args)
+    if args.command == 'gui':
+        return cmd_gui(args)
+
+    parser.print_help()
+    return 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
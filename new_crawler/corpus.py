@@ -0,0 +1,239 @@
+"""紧凑的标题语料
+
+词表把词语映射为整数编号（每个词语只保存一个字符串对象），标题以词语编号序列保存：
+所有标题的编号连续存放在一个 int32 数组中，另用偏移数组记录每条标题的起止位置
+（与 CSR 稀疏矩阵的 indices/indptr 布局相同）。每条词语只占 4 字节，
+而不是每条标题一个元组加若干字符串对象。
+
+词频（TF）、文档频率（DF）、来源分布与共现次数都用 NumPy bincount / 唯一值计数
+在编号数组上直接计算，只有最终输出的少量关键词才转换回字符串。
+
+用法::
+
+    corpus = Corpus(vocabulary)
+    corpus.add(token_lists, sources=['toutiao', 'sina', ...])
+    tf = corpus.term_frequencies()           # 按词语编号索引的数组
+    df = corpus.document_frequencies()
+"""
+from collections import Counter
+from itertools import chain
+
+import numpy as np
+
+# 共现统计时每批展开为稠密矩阵的标题数
+COOCCURRENCE_CHUNK = 65536
+
+
+class Vocabulary:
+    """词语 ↔ 整数编号的映射，编号按第一次出现的顺序分配，只增不减"""
+
+    def __init__(self, words=()):
+        self.words = []
+        self.ids = {}
+        self._derived = {}
+        for word in words:
+            self.intern(word)
+
+    def __len__(self):
+        return len(self.words)
+
+    def __contains__(self, word):
+        return word in self.ids
+
+    def intern(self, word):
+        """返回词语的编号，新词分配新编号"""
+        try:
+            return self.ids[word]
+        except KeyError:
+            index = self.ids[word] = len(self.words)
+            self.words.append(word)
+            return index
+
+    def lookup(self, words):
+        """词语 → 编号数组，词表中没有的词为 -1"""
+        ids = self.ids
+        return np.fromiter((ids.get(word, -1) for word in words), dtype=np.int64, count=len(words))
+
+    def encode(self, tokens):
+        return np.fromiter(map(self.intern, tokens), dtype=np.int32)
+
+    def decode(self, ids):
+        """编号 → 词语列表"""
+        words = self.words
+        return [words[i] for i in np.asarray(ids).tolist()]
+
+    def counter(self, counts):
+        """把按编号索引的计数数组转换为 Counter（只包含非零项）"""
+        ids = np.flatnonzero(counts)
+        return Counter(dict(zip(self.decode(ids), counts[ids].tolist())))
+
+    def derive(self, name, func, dtype, shape=()):
+        """按编号索引的派生数组（如 IDF、停用词标记），新增词语时只计算新增部分
+
+        func 对单个词语返回一个值（shape 非空时返回该形状的数组），结果按 name 缓存。
+        """
+        array = self._derived.get(name)
+        done = 0 if array is None else len(array)
+        if done < len(self.words):
+            fresh = np.array([func(word) for word in self.words[done:]], dtype=dtype)
+            fresh = fresh.reshape((len(self.words) - done,) + tuple(shape))
+            array = fresh if array is None else np.concatenate([array, fresh])
+            self._derived[name] = array
+        elif array is None:
+            array = np.zeros((0,) + tuple(shape), dtype=dtype)
+        return array
+
+
+def grow(counts, size):
+    """把按编号索引的计数数组补零扩展到 size（词表增长后使用）"""
+    if len(counts) >= size:
+        return counts
+    grown = np.zeros(size, dtype=counts.dtype)
+    grown[:len(counts)] = counts
+    return grown
+
+
+class Corpus:
+    """以词语编号序列保存的标题集合，可选记录每条标题的来源"""
+
+    def __init__(self, vocabulary=None):
+        self.vocabulary = vocabulary if vocabulary is not None else Vocabulary()
+        self.source_names = Vocabulary()
+        self._tokens = np.zeros(0, dtype=np.int32)
+        self._offsets = np.zeros(1, dtype=np.int64)
+        self._sources = np.zeros(0, dtype=np.int32)
+        self._pending = []
+
+    def __len__(self):
+        return len(self._offsets) - 1 + sum(len(lengths) for _, lengths, _ in self._pending)
+
+    def add(self, token_lists, sources=None):
+        """追加一批标题的分词结果（词语序列的列表），sources 为对应的来源名称"""
+        token_lists = list(token_lists)
+        if not token_lists:
+            return
+        tokens = self.vocabulary.encode(chain.from_iterable(token_lists))
+        lengths = np.fromiter(map(len, token_lists), dtype=np.int64, count=len(token_lists))
+        if sources is None:
+            codes = np.full(len(token_lists), -1, dtype=np.int32)
+        else:
+            codes = self.source_names.encode(sources)
+        # 先暂存，读取时再一次性拼接，避免逐批追加的重复复制
+        self._pending.append((tokens, lengths, codes))
+
+    def _consolidate(self):
+        if not self._pending:
+            return
+        tokens, lengths, codes = zip(*self._pending)
+        self._pending = []
+        lengths = np.concatenate(lengths)
+        offsets = self._offsets[-1] + np.cumsum(lengths)
+        self._tokens = np.concatenate((self._tokens,) + tokens)
+        self._offsets = np.concatenate([self._offsets, offsets])
+        self._sources = np.concatenate((self._sources,) + codes)
+
+    @property
+    def tokens(self):
+        """所有标题的词语编号（int32，按标题顺序连续存放）"""
+        self._consolidate()
+        return self._tokens
+
+    @property
+    def offsets(self):
+        """第 i 条标题的词语编号为 tokens[offsets[i]:offsets[i + 1]]"""
+        self._consolidate()
+        return self._offsets
+
+    @property
+    def sources(self):
+        """每条标题的来源编号（见 source_names），未记录来源时为 -1"""
+        self._consolidate()
+        return self._sources
+
+    @property
+    def nbytes(self):
+        return self.tokens.nbytes + self.offsets.nbytes + self.sources.nbytes
+
+    def document(self, index):
+        offsets = self.offsets
+        return self.tokens[offsets[index]:offsets[index + 1]]
+
+    def words(self, index):
+        return tuple(self.vocabulary.decode(self.document(index)))
+
+    def doc_ids(self):
+        """与 tokens 对齐的标题序号"""
+        return np.repeat(np.arange(len(self), dtype=np.int64), np.diff(self.offsets))
+
+    def term_frequencies(self, exclude=None):
+        """各词语的出现次数（按编号索引），exclude 为按编号索引的布尔数组，标记的词计为 0"""
+        counts = np.bincount(self.tokens, minlength=len(self.vocabulary))
+        if exclude is not None:
+            counts[:len(exclude)][exclude] = 0
+        return counts
+
+    def _unique_pairs(self, tokens=None, doc_ids=None):
+        """(标题序号, 词语编号) 去重，同一标题中重复的词只保留一次"""
+        tokens = self.tokens if tokens is None else tokens
+        doc_ids = self.doc_ids() if doc_ids is None else doc_ids
+        width = max(len(self.vocabulary), 1)
+        keys = np.unique(doc_ids * width + tokens)
+        return keys // width, keys % width
+
+    def document_frequencies(self, exclude=None):
+        """出现各词语的标题数（按编号索引）"""
+        _, tokens = self._unique_pairs()
+        counts = np.bincount(tokens, minlength=len(self.vocabulary))
+        if exclude is not None:
+            counts[:len(exclude)][exclude] = 0
+        return counts
+
+    def _select(self, ids):
+        """只保留 ids 中的词，返回去重后的 (标题序号, ids 中的位置)"""
+        position = np.full(len(self.vocabulary), -1, dtype=np.int64)
+        ids = np.asarray(ids, dtype=np.int64)
+        valid = (ids >= 0) & (ids < len(position))
+        position[ids[valid]] = np.flatnonzero(valid)
+        local = position[self.tokens]
+        keep = local >= 0
+        return self._unique_pairs(local[keep], self.doc_ids()[keep])
+
+    def source_counts(self, ids):
+        """ids 中每个词在各来源中出现的标题数，返回形状为 (len(ids), 来源数) 的数组"""
+        n_sources = max(len(self.source_names), 1)
+        docs, local = self._select(ids)
+        sources = self.sources[docs]
+        known = sources >= 0
+        flat = np.bincount(local[known] * n_sources + sources[known], minlength=len(ids) * n_sources)
+        return flat.reshape(len(ids), n_sources)
+
+    def cooccurrence(self, ids, chunk_size=COOCCURRENCE_CHUNK):
+        """ids 中两两词语同时出现的标题数，返回 (len(ids), len(ids)) 矩阵，对角线为文档频率
+
+        分批把相关标题展开为 标题×词 的 0/1 矩阵再相乘累加，内存只与批大小和 len(ids) 有关。
+        """
+        size = len(ids)
+        result = np.zeros((size, size), dtype=np.int64)
+        docs, local = self._select(ids)
+        if not len(docs):
+            return result
+        # 只保留含有这些词的标题，并重新连续编号
+        rows = np.unique(docs, return_inverse=True)[1].reshape(-1)
+        for start in range(0, int(rows.max()) + 1, chunk_size):
+            mask = (rows >= start) & (rows < start + chunk_size)
+            block = np.zeros((min(chunk_size, int(rows.max()) + 1 - start), size), dtype=np.float32)
+            block[rows[mask] - start, local[mask]] = 1
+            result += (block.T @ block).astype(np.int64)
+        return result
+
+    def incidence(self):
+        """标题×词语的稀疏计数矩阵（scipy.sparse.csr_matrix），可用于相似度等矩阵运算"""
+        try:
+            from scipy import sparse
+        except ImportError:
+            raise ImportError("稀疏矩阵需要安装 scipy：pip install scipy") from None
+        data = np.ones(len(self.tokens), dtype=np.int32)
+        matrix = sparse.csr_matrix((data, self.tokens, self.offsets),
+                                   shape=(len(self), len(self.vocabulary)))
+        matrix.sum_duplicates()
+        return matrix
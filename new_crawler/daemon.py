@@ -0,0 +1,203 @@
+"""持续爬取守护进程
+
+按各来源自己的间隔反复爬取，每轮只处理以前没见过的标题：新标题才会分词并累加到
+关键词统计中，标题记录追加写入，关键词表与词云只在排名变化时重新输出。
+因此每轮的开销与新增标题数成正比，而与信息流长度和历史数据量无关。
+长期运行时内存有界：已见标题超过 seen_ttl 秒未再出现即忘记（使用去重库时由去重库判断），
+关键词排名只统计最近 keyword_horizon 秒内的新标题。
+
+用法::
+
+    daemon = CrawlDaemon(sources, keyword_engine=engine, out_dir='output')
+    daemon.run(cancel_event=stop_event)
+"""
+import csv
+import os
+import time
+
+from .engine import CrawlCancelled, report, generate_wordcloud, save_records_csv
+from .export import export_keywords, export_trends
+from .keywords import KeywordAggregate, KeywordEngine
+from .metrics import METRICS
+from .scheduler import CrawlScheduler, Source, check_unique_names
+
+# 来源未指定间隔时的默认爬取间隔（秒）
+DEFAULT_INTERVAL = 300
+# 已见标题超过该时间（秒）没有再出现即忘记；与热度趋势的最长窗口一致
+SEEN_TTL = 7 * 86400
+# 关键词排名统计的时间范围（秒）
+KEYWORD_HORIZON = 7 * 86400
+# 已见标题达到该数量后才清理过期记录
+SEEN_PRUNE_SIZE = 10000
+
+
+def last_record_number(path):
+    """已有 records.csv 中最后一条记录的序号，文件不存在或为空时返回 0"""
+    if not os.path.exists(path):
+        return 0
+    last = 0
+    with open(path, 'r', newline='', encoding='utf-8') as f:
+        for row in csv.reader(f):
+            if row and row[0].isdigit():
+                last = int(row[0])
+    return last
+
+
+class CrawlDaemon:
+    """持续爬取并增量更新结果
+
+    scheduler 为 :class:`~new_crawler.scheduler.CrawlScheduler`，每轮只爬取已到期的来源；
+    dedup_store 不为空时用持久化指纹库判断新标题（可跨进程重启、识别近似重复），
+    否则只在本进程内按标题原文判断；history_store 不为空时每轮的全部标题都写入历史库；
+    trend_engine（:class:`~new_crawler.trends.TrendEngine`）不为空时新标题的词频同时计入热度趋势。
+    on_update 在每轮处理完成后以增量结果字典调用。
+    seen_ttl 与 keyword_horizon 见模块说明；out_dir 中已有 records.csv 时序号接着已有记录编号。
+    """
+
+    def __init__(self, sources, scheduler=None, keyword_engine=None, dedup_store=None,
+                 history_store=None, out_dir=None, top_n=20, wordcloud=True,
+                 default_interval=DEFAULT_INTERVAL, on_update=None, trend_engine=None,
+                 seen_ttl=SEEN_TTL, keyword_horizon=KEYWORD_HORIZON):
+        self.sources = [s if isinstance(s, Source) else Source.from_dict(s) for s in sources]
+        check_unique_names(self.sources)
+        self.scheduler = scheduler or CrawlScheduler()
+        self.keyword_engine = keyword_engine or KeywordEngine()
+        self.dedup_store = dedup_store
+        self.history_store = history_store
+        self.out_dir = out_dir
+        self.top_n = top_n
+        self.wordcloud = wordcloud
+        self.default_interval = default_interval
+        self.on_update = on_update
+        self.trend_engine = trend_engine
+
+        self.aggregate = KeywordAggregate(self.keyword_engine, horizon=keyword_horizon)
+        self.keywords = []
+        # 标题 → 最近一次出现的时间；使用去重库时不在内存中保留
+        self.seen = {}
+        self.seen_ttl = seen_ttl
+        self.record_count = last_record_number(os.path.join(out_dir, 'records.csv')) if out_dir else 0
+        self.cycle = 0
+        self._next_due = {s.name: 0.0 for s in self.sources}
+
+    def interval(self, source):
+        return source.interval or self.default_interval
+
+    def due_sources(self, now=None):
+        now = time.monotonic() if now is None else now
+        return [s for s in self.sources if self._next_due[s.name] <= now]
+
+    def _wait(self, cancel_event):
+        """等待到下一个来源到期，返回 False 表示等待期间被取消"""
+        delay = max(0.0, min(self._next_due.values()) - time.monotonic())
+        if cancel_event is not None:
+            return not cancel_event.wait(delay)
+        time.sleep(delay)
+        return True
+
+    def run(self, cycles=None, progress=None, cancel_event=None):
+        """持续运行，直到被取消或完成 cycles 轮"""
+        try:
+            while cycles is None or self.cycle < cycles:
+                due = self.due_sources()
+                if not due:
+                    if not self._wait(cancel_event):
+                        break
+                    continue
+                self.run_once(due, progress=progress, cancel_event=cancel_event)
+        except CrawlCancelled:
+            pass
+        report(progress, 'daemon', f"持续爬取已停止，共{self.cycle}轮，累计{self.record_count}条新标题")
+
+    def run_once(self, sources=None, progress=None, cancel_event=None):
+        """爬取一轮（默认为全部来源），返回本轮的增量结果"""
+        sources = sources if sources is not None else self.sources
+        started_at = time.time()
+        now = time.monotonic()
+        for source in sources:
+            self._next_due[source.name] = now + self.interval(source)
+
+        with METRICS.run(label=f"daemon#{self.cycle + 1}"):
+            results = self.scheduler.run(sources, progress=progress, cancel_event=cancel_event)
+            if self.history_store is not None:
+                self.history_store.record_run(results['records'], label='daemon', started_at=started_at)
+            delta = self.process(results['records'])
+        delta['sources'] = results['sources']
+        self.cycle += 1
+        report(progress, 'daemon', f"第{self.cycle}轮完成：{len(results['records'])}条标题，"
+                                    f"新增{len(delta['records'])}条，耗时{time.time() - started_at:.1f}秒")
+        if self.on_update is not None:
+            self.on_update(delta)
+        return delta
+
+    def _fresh(self, records, timestamp=None):
+        """筛出以前没见过的标题记录（同一轮内也去重）"""
+        if self.dedup_store is not None:
+            if not records:
+                return []
+            kept = set(self.dedup_store.filter([r['title'] for r in records]))
+            fresh = []
+            for record in records:
+                if record['title'] in kept:
+                    kept.discard(record['title'])
+                    fresh.append(record)
+            return fresh
+
+        timestamp = time.time() if timestamp is None else timestamp
+        fresh = []
+        for record in records:
+            if record['title'] not in self.seen:
+                fresh.append(record)
+            # 仍在信息流中的标题刷新时间，不会被忘记后再次当作新标题
+            self.seen[record['title']] = timestamp
+        self._forget(timestamp)
+        return fresh
+
+    def _forget(self, timestamp):
+        if len(self.seen) < SEEN_PRUNE_SIZE:
+            return
+        cutoff = timestamp - self.seen_ttl
+        self.seen = {title: ts for title, ts in self.seen.items() if ts >= cutoff}
+
+    def process(self, records):
+        """处理一轮的标题记录：只分析新标题并增量更新输出"""
+        fresh = self._fresh(records)
+        tf = self.aggregate.add([r['title'] for r in fresh])
+        expired = self.aggregate.expire()
+        trends = None
+        if self.trend_engine is not None:
+            # 直接复用本轮新标题的词频，趋势更新与历史数据量无关
+            self.trend_engine.add_counts(self.aggregate.vocabulary, tf, len(fresh))
+            trends = self.trend_engine.summary(top_n=self.top_n)
+
+        previous = self.keywords
+        if tf.any() or expired:
+            self.keywords = self.aggregate.top(self.top_n)
+        changed = [kw.word for kw in self.keywords] != [kw.word for kw in previous]
+
+        if self.out_dir and fresh:
+            os.makedirs(self.out_dir, exist_ok=True)
+            save_records_csv(fresh, os.path.join(self.out_dir, 'records.csv'),
+                             start=self.record_count + 1, append=True)
+        # 没有新标题时，旧批次过期同样会改变排名，关键词重算过就要更新输出
+        if self.out_dir and self.keywords is not previous:
+            os.makedirs(self.out_dir, exist_ok=True)
+            # 关键词表只有 top_n 行，每轮整体覆盖
+            export_keywords(self.keywords, os.path.join(self.out_dir, 'keywords.csv'))
+            if self.wordcloud and changed:
+                generate_wordcloud(self.keywords, os.path.join(self.out_dir, 'wordcloud.png'))
+        if self.out_dir and trends is not None:
+            os.makedirs(self.out_dir, exist_ok=True)
+            export_trends(trends, os.path.join(self.out_dir, 'trends.csv'),
+                          window_names=list(self.trend_engine.windows))
+        self.record_count += len(fresh)
+
+        return {
+            'cycle': self.cycle + 1,
+            'records': fresh,
+            'new_terms': self.aggregate.vocabulary.counter(tf),
+            'keywords': self.keywords,
+            'keywords_changed': changed,
+            'trends': trends,
+            'title_count': self.aggregate.title_count,
+        }
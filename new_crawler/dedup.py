@@ -0,0 +1,226 @@
+"""标题去重
+
+* :func:`ordered_unique` —— 保留首次出现顺序的精确去重（信息流顺序即热度排序）
+* :class:`DedupStore` —— 基于 SQLite 的持久化指纹库，跨多次运行记住已见过的标题。
+  精确重复按规范化标题的哈希（主键索引）判断；近似重复（同一新闻换个说法重发）
+  用字符三元组的 MinHash 签名通过 LSH 分桶索引只取出少量候选，再对候选计算
+  真实的三元组 Jaccard 相似度，不低于阈值才判为重复，因此查询代价不随历史规模线性增长。
+
+同一模板、不同主体的标题（如“北京今日暴雨预警发布”与“上海今日暴雨预警发布”）是不同的新闻，
+三元组 Jaccard 相似度约 0.6，低于默认阈值 0.8，不会被当作重复。
+"""
+import hashlib
+import os
+import re
+import sqlite3
+import time
+
+import numpy as np
+
+# MinHash 签名长度 = 分段数 × 每段行数。成为候选的概率 1-(1-s^ROWS)^BANDS 的拐点约为
+# (1/BANDS)^(1/ROWS) ≈ 0.71，略低于默认阈值：相似度 0.8 的标题约 95% 成为候选，
+# 0.5 的约 6%；候选再经真实相似度校验，误判的候选不会被当作重复
+LSH_BANDS = 16
+LSH_ROWS = 8
+NUM_PERM = LSH_BANDS * LSH_ROWS
+
+# 字符 n-gram 长度
+SHINGLE_SIZE = 3
+
+# 默认近似重复阈值（三元组 Jaccard 相似度）
+DEFAULT_THRESHOLD = 0.8
+
+# 签名参数变化时，已有指纹库的签名与分桶需要重建
+LSH_VERSION = f"{LSH_BANDS}x{LSH_ROWS}:{SHINGLE_SIZE}"
+
+_NORMALIZE_RE = re.compile(r'[\s\W_]+', re.UNICODE)
+
+
+def _hash64(data):
+    return int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), 'big')
+
+
+def _make_permutations(count, seed=1):
+    """生成固定的乘法-移位哈希参数，保证不同进程、不同运行之间签名一致"""
+    a = [_hash64(f'{seed}:a:{i}'.encode()) | 1 for i in range(count)]  # 乘数取奇数
+    b = [_hash64(f'{seed}:b:{i}'.encode()) for i in range(count)]
+    return np.array(a, dtype=np.uint64)[:, None], np.array(b, dtype=np.uint64)[:, None]
+
+
+_PERM_A, _PERM_B = _make_permutations(NUM_PERM)
+_EMPTY_SIGNATURE = np.full(NUM_PERM, np.iinfo(np.uint32).max, dtype=np.uint32)
+
+
+def ordered_unique(items):
+    """按首次出现顺序去重"""
+    return list(dict.fromkeys(items))
+
+
+def normalize(title):
+    """去掉空白和标点并转为小写，作为精确去重的键"""
+    return _NORMALIZE_RE.sub('', title).lower()
+
+
+def shingles(text, size=SHINGLE_SIZE):
+    """中文标题没有空格分词，直接取字符 n-gram 作为特征"""
+    if len(text) <= size:
+        return {text} if text else set()
+    return {text[i:i + size] for i in range(len(text) - size + 1)}
+
+
+def minhash(title):
+    """计算标题的 MinHash 签名（长度为 NUM_PERM 的 uint32 数组）"""
+    features = shingles(normalize(title))
+    if not features:
+        return _EMPTY_SIGNATURE.copy()
+    hashes = np.array([_hash64(s.encode('utf-8')) for s in features], dtype=np.uint64)[None, :]
+    # (a * h + b) mod 2^64 取高 32 位，对每个置换取所有特征中的最小值
+    with np.errstate(over='ignore'):
+        values = (_PERM_A * hashes + _PERM_B) >> np.uint64(32)
+    return values.min(axis=1).astype(np.uint32)
+
+
+def similarity(sig_a, sig_b):
+    """由两个签名估计 Jaccard 相似度"""
+    return np.count_nonzero(sig_a == sig_b) / NUM_PERM
+
+
+def jaccard(title_a, title_b):
+    """两个标题规范化后字符 n-gram 集合的真实 Jaccard 相似度"""
+    a, b = shingles(normalize(title_a)), shingles(normalize(title_b))
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+def lsh_buckets(signature):
+    """把签名切成 LSH_BANDS 段，每段哈希成一个桶号；任一桶相同即为候选"""
+    buckets = []
+    for band in range(LSH_BANDS):
+        rows = signature[band * LSH_ROWS:(band + 1) * LSH_ROWS]
+        bucket = _hash64(band.to_bytes(2, 'big') + rows.tobytes())
+        buckets.append(bucket - (1 << 63))  # SQLite 整数为有符号 64 位
+    return buckets
+
+
+class DedupStore:
+    """持久化的标题指纹库
+
+    用法::
+
+        with DedupStore('dedup.db') as store:
+            new_titles = store.filter(titles)   # 只返回以前没见过的标题，并记住它们
+
+    threshold 为判定近似重复的三元组 Jaccard 相似度阈值。
+    """
+
+    def __init__(self, path='dedup.db', threshold=DEFAULT_THRESHOLD):
+        self.path = path
+        self.threshold = threshold
+        if path != ':memory:' and os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.conn = sqlite3.connect(path)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self._create_tables()
+
+    def _create_tables(self):
+        self.conn.executescript('''
+            CREATE TABLE IF NOT EXISTS fingerprints (
+                key BLOB PRIMARY KEY,
+                title TEXT NOT NULL,
+                signature BLOB NOT NULL,
+                first_seen REAL NOT NULL
+            ) WITHOUT ROWID;
+            CREATE TABLE IF NOT EXISTS lsh_buckets (
+                bucket INTEGER NOT NULL,
+                key BLOB NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_lsh_buckets_bucket ON lsh_buckets (bucket);
+            CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value TEXT NOT NULL);
+        ''')
+        self.conn.commit()
+        self._migrate()
+
+    def _migrate(self):
+        """签名参数与库中记录的不一致时（旧版本创建的库），按保存的标题重建签名与分桶"""
+        row = self.conn.execute("SELECT value FROM meta WHERE name = 'lsh'").fetchone()
+        if row and row[0] == LSH_VERSION:
+            return
+        with self.conn:
+            self.conn.execute('DELETE FROM lsh_buckets')
+            for key, title in self.conn.execute('SELECT key, title FROM fingerprints').fetchall():
+                signature = minhash(title)
+                self.conn.execute('UPDATE fingerprints SET signature = ? WHERE key = ?',
+                                  (signature.tobytes(), key))
+                self.conn.executemany('INSERT INTO lsh_buckets VALUES (?, ?)',
+                                      [(bucket, key) for bucket in lsh_buckets(signature)])
+            self.conn.execute("INSERT OR REPLACE INTO meta VALUES ('lsh', ?)", (LSH_VERSION,))
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def __len__(self):
+        return self.conn.execute('SELECT COUNT(*) FROM fingerprints').fetchone()[0]
+
+    @staticmethod
+    def _key(title):
+        return hashlib.blake2b(normalize(title).encode('utf-8'), digest_size=16).digest()
+
+    def _near_match(self, title, buckets):
+        """查找真实相似度不低于阈值的已知标题，返回 (标题, 相似度) 或 None
+
+        LSH 候选只是可能相似，逐个计算与候选标题的三元组 Jaccard 相似度再判断。
+        """
+        placeholders = ', '.join('?' * len(buckets))
+        rows = self.conn.execute(f'''
+            SELECT f.title FROM fingerprints f
+            WHERE f.key IN (SELECT DISTINCT key FROM lsh_buckets WHERE bucket IN ({placeholders}))
+        ''', buckets)
+        for (candidate,) in rows:
+            score = jaccard(title, candidate)
+            if score >= self.threshold:
+                return candidate, score
+        return None
+
+    def check(self, title, near=True):
+        """返回匹配到的已知标题（未见过时返回 None），不写入指纹库"""
+        row = self.conn.execute('SELECT title FROM fingerprints WHERE key = ?',
+                                (self._key(title),)).fetchone()
+        if row:
+            return row[0]
+        if near:
+            signature = minhash(title)
+            match = self._near_match(title, lsh_buckets(signature))
+            if match is not None:
+                return match[0]
+        return None
+
+    def filter(self, titles, near=True, remember=True):
+        """按原顺序返回未见过的标题（同批次内的重复也会被去掉），remember 为 True 时写入指纹库"""
+        fresh = []
+        now = time.time()
+        with self.conn:
+            for title in titles:
+                key = self._key(title)
+                if self.conn.execute('SELECT 1 FROM fingerprints WHERE key = ?', (key,)).fetchone():
+                    continue
+                signature = minhash(title)
+                buckets = lsh_buckets(signature)
+                if near and self._near_match(title, buckets) is not None:
+                    continue
+                fresh.append(title)
+                # 先写入再处理下一条，使同批次内的近似重复也能被识别
+                self.conn.execute('INSERT INTO fingerprints VALUES (?, ?, ?, ?)',
+                                  (key, title, signature.tobytes(), now))
+                self.conn.executemany('INSERT INTO lsh_buckets VALUES (?, ?)',
+                                      [(bucket, key) for bucket in buckets])
+            if not remember:
+                self.conn.rollback()
+        return fresh
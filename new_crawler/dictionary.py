@@ -0,0 +1,249 @@
+"""分词词典快照
+
+jieba 冷启动时要读取前缀词典缓存（marshal，约1秒）、逐行解析 dict.txt 构建词性表、
+再逐行解析 idf.txt，合计约2秒。本模块把这些结果（含自定义词典）一次性合并为一个
+pickle 快照文件：之后的进程读取快照（反序列化约0.5秒）并直接装入 jieba，不再解析任何文本词典。
+jieba 的分词器与词性标注器只接受 Python 字典，快照读取后仍要在内存中重建这些字典，
+因此不使用 mmap 等零拷贝格式。
+快照文件名由 jieba 版本、词典与 IDF 文件、自定义词典的路径/大小/修改时间计算，
+任何一个变化都会自动重建。
+
+快照保存在当前用户自己的缓存目录中（``~/.cache/new_crawler``，Windows 为
+``%LOCALAPPDATA%\\new_crawler``）：目录以 0700 权限创建，读取前检查目录与文件属于当前用户且
+其他用户不可写，否则不读取快照（pickle 可以执行任意代码）。不同的自定义词典组合（如图形界面与
+命令行）各有自己的快照，写入新快照时只保留最近使用的 SNAPSHOTS_KEPT 个。
+
+用法::
+
+    lexicon = load_dictionary(user_dicts=['userdict.txt'])
+    lexicon.idf, lexicon.median_idf, lexicon.stop_words
+"""
+import hashlib
+import os
+import pickle
+import sys
+import threading
+from collections import namedtuple
+
+from .metrics import stage
+
+# 快照格式版本，结构变化时递增
+SNAPSHOT_VERSION = 1
+# 缓存目录中最多保留的快照数（按最近使用时间）
+SNAPSHOTS_KEPT = 4
+
+
+def _user_cache_dir():
+    if os.name == 'nt':
+        base = os.environ.get('LOCALAPPDATA') or os.path.join(os.path.expanduser('~'), 'AppData', 'Local')
+    else:
+        base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(base, 'new_crawler')
+
+
+DEFAULT_CACHE_DIR = _user_cache_dir()
+
+Lexicon = namedtuple('Lexicon', ['idf', 'median_idf', 'stop_words'])
+Lexicon.__doc__ = """关键词权重所需的词表：IDF 表、IDF 中位数（未登录词使用）与停用词"""
+
+_lock = threading.Lock()
+_lexicon = None
+_user_dicts = []
+_cache_dir = None
+
+
+def configure(user_dicts=None, cache_dir=None):
+    """设置自定义词典与快照目录，需在第一次加载之前调用"""
+    global _cache_dir
+    with _lock:
+        if _lexicon is not None:
+            raise RuntimeError("分词词典已加载，无法再修改配置")
+        if user_dicts is not None:
+            _user_dicts[:] = [os.path.abspath(path) for path in user_dicts]
+        if cache_dir is not None:
+            _cache_dir = cache_dir
+
+
+def load_dictionary(user_dicts=None, cache_dir=None):
+    """加载分词词典（进程内只加载一次，多线程同时调用时只有一个线程实际加载），返回 :class:`Lexicon`"""
+    global _lexicon
+    if user_dicts is not None or cache_dir is not None:
+        configure(user_dicts, cache_dir)
+    with _lock:
+        if _lexicon is None:
+            _lexicon = _load(list(_user_dicts), _cache_dir or DEFAULT_CACHE_DIR)
+        return _lexicon
+
+
+def is_loaded():
+    return _lexicon is not None
+
+
+def _file_signature(path):
+    st = os.stat(path)
+    return f"{path}:{st.st_size}:{st.st_mtime_ns}"
+
+
+def snapshot_path(user_dicts=(), cache_dir=DEFAULT_CACHE_DIR):
+    """当前 jieba 版本、词典与自定义词典对应的快照文件路径"""
+    import jieba
+
+    base = os.path.dirname(os.path.abspath(jieba.__file__))
+    parts = [f"v{SNAPSHOT_VERSION}", jieba.__version__, sys.version.split()[0],
+             _file_signature(os.path.join(base, 'dict.txt')),
+             _file_signature(os.path.join(base, 'analyse', 'idf.txt'))]
+    parts.extend(_file_signature(path) for path in user_dicts)
+    digest = hashlib.sha1('\n'.join(parts).encode('utf-8')).hexdigest()[:16]
+    return os.path.join(cache_dir, f"jieba-{digest}.pickle")
+
+
+def _is_private(st):
+    """stat 结果属于当前用户且其他用户不可写（Windows 上依赖用户目录本身的权限）"""
+    if not hasattr(os, 'getuid'):
+        return True
+    return st.st_uid == os.getuid() and not st.st_mode & 0o022
+
+
+def _private_dir(path):
+    """创建（0700）并检查缓存目录，不安全时抛出 PermissionError"""
+    os.makedirs(path, mode=0o700, exist_ok=True)
+    st = os.stat(path)
+    if not _is_private(st):
+        raise PermissionError(f"缓存目录不属于当前用户或其他用户可写: {path}")
+    if hasattr(os, 'getuid') and st.st_mode & 0o077:
+        # 旧版本创建的目录：收紧为只有当前用户可访问
+        os.chmod(path, 0o700)
+
+
+def _load(user_dicts, cache_dir):
+    path = snapshot_path(user_dicts, cache_dir)
+    with stage('dictionary_load') as span:
+        try:
+            _private_dir(cache_dir)
+            data = _read_snapshot(path)
+            span.fields['snapshot'] = 'hit'
+            _touch(path)
+        except PermissionError as e:
+            print(f"不读取分词词典快照: {e}")
+            data = None
+        except (OSError, ValueError, EOFError, pickle.UnpicklingError):
+            data = None
+        if data is not None:
+            _install(data)
+        else:
+            print("正在构建分词词典快照...")
+            data = _build(user_dicts)
+            _write_snapshot(path, data)
+            span.fields['snapshot'] = 'built'
+        span.items = len(data['word_tags'])
+    return Lexicon(data['idf'], data['median_idf'], frozenset(data['stop_words']))
+
+
+def _read_snapshot(path):
+    with open(path, 'rb') as f:
+        if not _is_private(os.fstat(f.fileno())):
+            raise PermissionError(f"快照文件不属于当前用户或其他用户可写: {path}")
+        data = pickle.load(f)
+    if not isinstance(data, dict) or data.get('version') != SNAPSHOT_VERSION:
+        raise ValueError(f"分词词典快照版本不符: {path}")
+    return data
+
+
+def _touch(path):
+    """记录快照的使用时间，清理旧快照时按修改时间保留最近使用的"""
+    try:
+        os.utime(path)
+    except OSError:
+        pass
+
+
+def _write_snapshot(path, data):
+    """写入快照（只有当前用户可读写），并清理同目录下最久未用的快照"""
+    directory = os.path.dirname(path)
+    try:
+        _private_dir(directory)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, 'O_BINARY', 0), 0o600)
+        with os.fdopen(fd, 'wb') as f:
+            pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        print(f"写入分词词典快照失败: {e}")
+        return
+    _prune_snapshots(directory)
+
+
+def _prune_snapshots(directory, keep=SNAPSHOTS_KEPT):
+    """只保留最近使用的 keep 个快照（jieba 或快照格式升级后，旧快照不再被使用，逐渐被清理）"""
+    snapshots = []
+    for name in os.listdir(directory):
+        if name.startswith('jieba-') and name.endswith('.pickle'):
+            path = os.path.join(directory, name)
+            try:
+                snapshots.append((os.stat(path).st_mtime, path))
+            except OSError:
+                pass
+    snapshots.sort(reverse=True)
+    for _mtime, path in snapshots[keep:]:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+def _build(user_dicts):
+    """按常规方式完整加载 jieba（含自定义词典），并整理为快照数据"""
+    import jieba
+    import jieba.analyse
+    import jieba.finalseg
+    import jieba.posseg
+
+    jieba.initialize()
+    for path in user_dicts:
+        jieba.load_userdict(path)
+    jieba.posseg.dt.makesure_userdict_loaded()
+    tfidf = jieba.analyse.default_tfidf
+
+    # 让三张表共享同一批词语字符串，pickle 时相同的词只写一次，读取也更快
+    freq = jieba.dt.FREQ
+    canonical = {word: word for word in freq}
+    tags = {}
+    word_tags = {canonical.get(word, word): tags.setdefault(tag, tag)
+                 for word, tag in jieba.posseg.dt.word_tag_tab.items()}
+    idf = {canonical.get(word, word): value for word, value in tfidf.idf_freq.items()}
+    return {
+        'version': SNAPSHOT_VERSION,
+        'freq': freq,
+        'total': jieba.dt.total,
+        'word_tags': word_tags,
+        'force_split': sorted(jieba.finalseg.Force_Split_Words),
+        'idf': idf,
+        'median_idf': tfidf.median_idf,
+        'stop_words': sorted(tfidf.stop_words),
+    }
+
+
+def _install(data):
+    """把快照装入 jieba 的默认分词器与词性标注器"""
+    import jieba
+    import jieba.finalseg
+
+    tokenizer = jieba.dt
+    with tokenizer.lock:
+        tokenizer.FREQ = data['freq']
+        tokenizer.total = data['total']
+        tokenizer.initialized = True
+    for word in data['force_split']:
+        jieba.finalseg.add_force_split(word)
+
+    if 'jieba.posseg' not in sys.modules:
+        # jieba.posseg 导入时会用 jieba.dt 的词典文件逐行构建词性表；导入期间换成空词典的
+        # 分词器跳过这一步，导入后再换回默认分词器并装入快照中的词性表
+        jieba.dt = jieba.Tokenizer(os.devnull)
+        try:
+            import jieba.posseg
+        finally:
+            jieba.dt = tokenizer
+    posseg = sys.modules['jieba.posseg']
+    posseg.dt.tokenizer = tokenizer
+    posseg.dt.word_tag_tab = data['word_tags']
@@ -0,0 +1,548 @@
+"""爬虫核心流程：抓取、解析、关键词分析、词云生成
+
+本模块不依赖 tkinter，可在无界面的服务器上直接导入使用。
+selenium、matplotlib 等较重的依赖在第一次用到时才导入，导入本模块本身很快。
+"""
+import csv
+import os
+import random
+import time
+from urllib.parse import urlparse
+
+from .browser_pool import create_driver
+from .extract import IncrementalExtractor
+from .http_engine import fetch_http_news, http_site_for_url
+from .page_cache import KIND_PAGE, CacheMiss
+from .metrics import METRICS, stage
+from .render import render_wordcloud
+from .parsers import (
+    PROFILES,
+    clean_title,
+    is_valid_title,
+    parse_html,
+    profile_for_url,
+    select_texts,
+)
+
+
+def configure_matplotlib():
+    """导入 matplotlib 并设置中文字体（在第一次绘图前调用）"""
+    import matplotlib as mpl
+    mpl.rcParams['font.family'] = 'SimHei'
+    mpl.rcParams['axes.unicode_minus'] = False
+    return mpl
+
+HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/137.0.0.0 Safari/537.36 Edg/137.0.0.0',
+    'Accept-Language': 'zh-CN,zh;q=0.9,en;q=0.8,en-GB;q=0.7,en-US;q=0.6',
+    'Referer': 'https://www.toutiao.com/?wid=1749629680587',
+    'Connection': 'keep-alive',
+    'cookie': '__ac_signature=_02B4Z6wo00f01nrq8DQAAIDCTc40aQknxBp6yvSAAPcC18; tt_webid=7514602195262998043; ttcid=d5ff4ab5e68b44f7bb9c87892deac82121; local_city_cache=%E6%98%86%E6%98%8E; csrftoken=39c6428b3d1b7e51935cde22decf2a9f; s_v_web_id=verify_mbroc7mr_VRv6bIsa_zpqw_4kbn_9EDx_jt6kEMHV7N5K; _ga=GA1.1.1856050421.1749629686; gfkadpd=24,6457; ttwid=1%7CuZcAxZgZZfPS6UG0OuNgX05vm6CkUyZXfQxbgxUqDt8%7C1750258656%7Cab19f283c650496fbf31de472aa49057815555da11eece3b37a6a4fc9ab89d89; tt_scid=ITq8rHHUIrgxDdYxq4Vmli19XZuYOWlzdFONbOswKUsfMpibH36gSZMl5dfTBWHqaa67; _ga_QEHZPBE5HH=GS2.1.s1750258657$o9$g1$t1750258796$j60$l0$h0'
+}  # 今日头条
+
+class CrawlCancelled(Exception):
+    """爬取任务被用户取消"""
+
+
+def report(progress, stage, message):
+    """输出进度信息，并在提供回调时转发给调用方"""
+    print(message)
+    if progress is not None:
+        progress(stage, message)
+
+
+def _check_cancel(cancel_event):
+    if cancel_event is not None and cancel_event.is_set():
+        raise CrawlCancelled("爬取已取消")
+
+
+def _sleep(seconds, cancel_event=None):
+    """等待指定时间，可被取消信号提前打断"""
+    if cancel_event is not None:
+        cancel_event.wait(seconds)
+    else:
+        time.sleep(seconds)
+
+
+# 默认站点列表
+SITES = (
+    "https://www.toutiao.com/?wid=1749629680587",
+    "https://news.sina.com.cn/roll/#pageid=153&lid=2509&k=&num=50&page=1"
+)
+
+
+# 自适应滚动时用于统计已加载条目数的选择器（与 parse_titles 的主选择器一致）
+FEED_ITEM_SELECTOR = 'a[target="_blank"]'
+
+# 读取页面高度与条目数
+_FEED_STATE_JS = "return [document.body.scrollHeight, document.querySelectorAll(arguments[0]).length];"
+
+# 自适应滚动未指定次数时的滚动上限
+MAX_ADAPTIVE_SCROLLS = 100
+
+# 打开页面后等待内容出现的最长时间（秒）
+FEED_TIMEOUT = 15
+# 信息流选择器、主选择器各自的等待时间（秒）：站点改版导致选择器失效时，不必每次都等满 FEED_TIMEOUT
+FEED_SELECTOR_TIMEOUT = 3
+
+
+def scroll_to_load_content(driver, scroll_count, progress=None, cancel_event=None,
+                           adaptive=False, target_count=None, item_selector=FEED_ITEM_SELECTOR,
+                           wait_timeout=5.0, idle_limit=3, poll_interval=0.2, on_scroll=None):
+    """滚动页面加载隐藏内容，返回实际滚动次数
+
+    progress 为 ``progress(stage, message)`` 形式的回调；cancel_event 被置位时抛出 CrawlCancelled。
+
+    adaptive 为 True 时不再固定随机等待：每次滚动后轮询页面高度和条目数，
+    一旦增长立即进行下一次滚动，最多等待 wait_timeout 秒；连续 idle_limit 次
+    没有新内容则认为信息流已到底，提前结束。指定 target_count 时，
+    条目数达到目标即停止，此时 scroll_count 仅作为滚动上限（可为 None）。
+
+    on_scroll 为每次滚动等待结束后调用的 ``on_scroll(scroll_index)`` 回调，
+    可用于增量提取已加载的内容。
+    """
+    if adaptive or target_count:
+        return _scroll_adaptive(driver, scroll_count, progress, cancel_event, target_count,
+                                item_selector, wait_timeout, idle_limit, poll_interval, on_scroll)
+
+    print(f"开始滚动页面以加载隐藏内容（{scroll_count}次）...")
+    for i in range(scroll_count):
+        _check_cancel(cancel_event)
+
+        with stage('scroll', index=i + 1):
+            # 滚动到底部
+            driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+            report(progress, 'scroll', f"滚动 {i + 1}/{scroll_count}，等待内容加载...")
+
+            # 随机等待时间（1-3秒）
+            _sleep(random.uniform(1, 3), cancel_event)
+        if on_scroll is not None:
+            on_scroll(i + 1)
+
+    _check_cancel(cancel_event)
+    return scroll_count
+
+
+def _scroll_adaptive(driver, scroll_count, progress, cancel_event, target_count,
+                     item_selector, wait_timeout, idle_limit, poll_interval, on_scroll):
+    """按内容增长情况滚动，详见 scroll_to_load_content"""
+    max_scrolls = scroll_count or MAX_ADAPTIVE_SCROLLS
+    height, count = driver.execute_script(_FEED_STATE_JS, item_selector)
+    print(f"开始自适应滚动（最多{max_scrolls}次，当前{count}条）...")
+
+    idle = 0
+    scrolls = 0
+    while scrolls < max_scrolls:
+        _check_cancel(cancel_event)
+        if target_count and count >= target_count:
+            print(f"已达到目标条目数 {target_count}")
+            break
+
+        scrolls += 1
+        with stage('scroll', index=scrolls) as span:
+            driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+
+            # 轮询直到页面高度或条目数增长，或等待超时
+            deadline = time.monotonic() + wait_timeout
+            grew = False
+            loaded = count
+            while time.monotonic() < deadline:
+                _sleep(poll_interval, cancel_event)
+                _check_cancel(cancel_event)
+                new_height, new_count = driver.execute_script(_FEED_STATE_JS, item_selector)
+                if new_height > height or new_count > count:
+                    grew = True
+                    height, count = new_height, new_count
+                    break
+            span.items = count - loaded
+
+        total = f"/{scroll_count}" if scroll_count else ""
+        report(progress, 'scroll', f"滚动 {scrolls}{total}，已加载{count}条")
+        if on_scroll is not None:
+            on_scroll(scrolls)
+
+        if grew:
+            idle = 0
+        else:
+            idle += 1
+            if idle >= idle_limit:
+                print(f"连续{idle}次滚动没有新内容，停止滚动")
+                break
+
+    _check_cancel(cancel_event)
+    return scrolls
+
+
+def _wait_for_feed(driver, profile, timeout=FEED_TIMEOUT, step_timeout=FEED_SELECTOR_TIMEOUT):
+    """等待页面内容出现，返回等到的选择器（都没有等到时返回 None）
+
+    eager/none 加载策略下 driver.get 返回时信息流可能尚未渲染，因此先等待站点的信息流条目选择器，
+    而不是只等 <body>；它在 step_timeout 秒内没有出现时依次改等主选择器与 <body>，
+    总等待时间不超过 timeout。超时后照常继续，由后续滚动与解析决定能取到多少内容。
+    """
+    from selenium.common.exceptions import TimeoutException
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support import expected_conditions as EC
+    from selenium.webdriver.support.ui import WebDriverWait
+
+    deadline = time.monotonic() + timeout
+    candidates = list(dict.fromkeys((profile.feed_selector, profile.selectors[0], 'body')))
+    for i, selector in enumerate(candidates):
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            break
+        wait = remaining if i == len(candidates) - 1 else min(step_timeout, remaining)
+        try:
+            WebDriverWait(driver, wait).until(EC.presence_of_element_located((By.CSS_SELECTOR, selector)))
+            return selector
+        except TimeoutException:
+            if i < len(candidates) - 1:
+                print(f"等待页面内容超时（{selector}），改为等待 {candidates[i + 1]}")
+    print("等待页面内容超时，继续处理当前页面")
+    return None
+
+
+def fetch_toutiao_news(url, max_page, progress=None, cancel_event=None, pool=None,
+                       adaptive=False, target_count=None, incremental=False, prune=False,
+                       on_titles=None, parser_backend='html.parser', page_cache=None,
+                       lean=True, feed_timeout=FEED_TIMEOUT, links=None):
+    """使用Selenium爬取新闻标题
+
+    提供 pool（:class:`~new_crawler.browser_pool.DriverPool`）时从池中借用预热的浏览器，
+    结束后归还；否则临时创建浏览器并在结束时关闭。
+    adaptive / target_count 的含义见 :func:`scroll_to_load_content`。
+
+    incremental 为 True 时每次滚动后在浏览器内提取新标题，不再拉取整页源码；
+    prune 为 True 时清空已提取节点的内容以控制页面内存；
+    on_titles 为 ``on_titles(new_titles)`` 回调，滚动过程中即可收到新标题。
+    parser_backend 为整页解析时使用的后端，见 :mod:`new_crawler.parsers`。
+    page_cache（:class:`~new_crawler.page_cache.PageCache`）不为空时录制渲染后的整页源码
+    （增量提取时录制标题列表），供之后离线回放。
+    lean 为临时创建浏览器时是否使用精简配置（见 :mod:`new_crawler.browser_pool`），使用 pool 时由池的配置决定；
+    feed_timeout 为打开页面后等待信息流条目出现的秒数。
+    links 为字典时写入 {标题: 文章链接}。
+    """
+    report(progress, 'start', f"开始爬取新闻网站，目标URL: {url}")
+
+    # 创建或借用浏览器实例
+    if pool is not None:
+        driver = pool.acquire()
+    else:
+        driver = create_driver(HEADERS["User-Agent"], lean=lean)
+    all_titles = []
+    scrolls = 0
+
+    try:
+        # 打开网页
+        _check_cancel(cancel_event)
+        with stage('page_load', url=url) as span:
+            driver.get(url)
+            report(progress, 'load', "页面加载完成，等待内容渲染...")
+
+            # 等待信息流条目出现（而不只是 <body>），选择器失效时很快退回主选择器与 <body>
+            profile = profile_for_url(url)
+            ready = _wait_for_feed(driver, profile, feed_timeout)
+            span.fields['feed_ready'] = ready == profile.feed_selector
+            span.fields['ready_selector'] = ready
+
+        if incremental:
+            scrolls = _scroll_and_extract(driver, url, max_page, progress, cancel_event,
+                                          adaptive, target_count, prune, on_titles, all_titles, links)
+        else:
+            # 滚动加载更多内容
+            scrolls = scroll_to_load_content(driver, scroll_count=max_page,
+                                             progress=progress, cancel_event=cancel_event,
+                                             adaptive=adaptive, target_count=target_count)
+
+            # 获取页面源码
+            with stage('page_source') as span:
+                html_content = driver.page_source
+                span.size = len(html_content)
+            if page_cache is not None:
+                page_cache.put_page(url, html_content)
+
+            # 解析新闻标题
+            titles = parse_html(html_content, backend=parser_backend, url=url, links=links)
+            all_titles.extend(titles)
+            if on_titles is not None:
+                on_titles(titles)
+        if incremental and page_cache is not None:
+            page_cache.put_records(url, all_titles)
+        report(progress, 'parse', f"获取到{len(all_titles)}条新闻标题")
+
+    except CrawlCancelled:
+        print("爬取已取消，正在关闭浏览器")
+        raise
+    except Exception as e:
+        print(f"爬取失败: {e}")
+        raise e
+    finally:
+        if pool is not None:
+            pool.release(driver, pages=scrolls + 1)
+        else:
+            driver.quit()
+
+    # 去重并返回（保留信息流中的先后顺序）
+    from .dedup import ordered_unique
+    unique_titles = ordered_unique(all_titles)
+    print(f"共获取到{len(unique_titles)}条唯一新闻标题")
+    return unique_titles
+
+
+def fetch_news(url, max_page, progress=None, cancel_event=None, engine='auto',
+               http_options=None, page_cache=None, links=None, **browser_options):
+    """按站点选择抓取引擎：有数据接口的站点走 HTTP 引擎，其余使用浏览器
+
+    engine 可为 ``'auto'``、``'http'`` 或 ``'browser'``；browser_options 传给
+    :func:`fetch_toutiao_news`，http_options 传给 :func:`~new_crawler.http_engine.fetch_http_news`。
+    page_cache 为回放模式时不启动浏览器，直接解析录制的页面。
+    links 为字典时写入 {标题: 文章链接}（回放增量提取的标题列表时没有链接）。
+    """
+    if engine == 'auto':
+        engine = 'http' if http_site_for_url(url) is not None else 'browser'
+
+    if engine == 'browser':
+        if page_cache is not None and page_cache.replay:
+            return replay_browser_news(url, page_cache, progress=progress,
+                                       parser_backend=browser_options.get('parser_backend', 'html.parser'),
+                                       links=links)
+        return fetch_toutiao_news(url, max_page, progress=progress, cancel_event=cancel_event,
+                                  page_cache=page_cache, links=links, **browser_options)
+
+    report(progress, 'start', f"开始通过HTTP接口抓取，目标URL: {url}")
+    titles = fetch_http_news(url, max_page, progress=progress, cancel_event=cancel_event,
+                             cache=page_cache, links=links, target_count=browser_options.get('target_count'),
+                             **(http_options or {}))
+    _check_cancel(cancel_event)
+    report(progress, 'parse', f"获取到{len(titles)}条新闻标题")
+    return titles
+
+
+def replay_browser_news(url, page_cache, progress=None, parser_backend='html.parser', links=None):
+    """从页面缓存回放一次浏览器爬取：重新解析录制的整页源码，或直接取出录制的标题"""
+    snapshot = page_cache.get_browser_snapshot(url)
+    if snapshot is None:
+        raise CacheMiss(f"缓存中没有 {url} 的录制内容")
+    kind, content = snapshot
+    from .dedup import ordered_unique
+    if kind == KIND_PAGE:
+        titles = ordered_unique(parse_html(content, backend=parser_backend, url=url, links=links))
+    else:
+        titles = ordered_unique(content)
+    report(progress, 'parse', f"从缓存回放，获取到{len(titles)}条新闻标题")
+    return titles
+
+
+def _scroll_and_extract(driver, url, max_page, progress, cancel_event, adaptive, target_count,
+                        prune, on_titles, all_titles, links=None):
+    """边滚动边提取标题，按首次出现顺序去重后追加到 all_titles，返回滚动次数"""
+    extractor = IncrementalExtractor(driver, prune=prune,
+                                     selectors=profile_for_url(url).selectors)
+    seen = set()
+
+    def harvest(scroll_index=0):
+        new_titles = []
+        with stage('parse', backend='incremental') as span:
+            for text, href in extractor.harvest():
+                title = clean_title(text)
+                if is_valid_title(title) and title not in seen:  # 过滤过短标题
+                    seen.add(title)
+                    new_titles.append(title)
+                    if links is not None and href:
+                        links[title] = href
+            span.items = len(new_titles)
+        if new_titles:
+            all_titles.extend(new_titles)
+            if on_titles is not None:
+                on_titles(new_titles)
+        report(progress, 'parse', f"已提取{len(all_titles)}条标题")
+
+    harvest()
+    scrolls = scroll_to_load_content(driver, scroll_count=max_page,
+                                     progress=progress, cancel_event=cancel_event,
+                                     adaptive=adaptive, target_count=target_count,
+                                     on_scroll=harvest)
+    return scrolls
+
+
+def parse_titles(soup):
+    """解析HTML获取新闻标题"""
+    titles = []
+
+    # 依次尝试 a[target=_blank] 及备用选择器（见 parsers.DEFAULT_SELECTORS）
+    for text in select_texts(soup, PROFILES['default']):
+        # 提取标题文本并清理
+        title = clean_title(text)
+
+        if is_valid_title(title):  # 过滤过短标题
+            titles.append(title)
+
+    return titles
+
+
+_default_keyword_engine = None
+
+
+def get_keyword_engine():
+    """进程内共享的关键词引擎（内存缓存）"""
+    global _default_keyword_engine
+    if _default_keyword_engine is None:
+        from .keywords import KeywordEngine
+        _default_keyword_engine = KeywordEngine()
+    return _default_keyword_engine
+
+
+def analyze_keywords(titles, top_n=20, engine=None):
+    '''分析新闻标题中的关键词
+
+    返回按 TF-IDF 权重降序排列的 :class:`~new_crawler.keywords.Keyword` 列表，
+    每项包含词语、权重、出现次数和文档频率。engine 为空时使用共享的 KeywordEngine。
+    '''
+    if not titles:
+        return []
+
+    engine = engine or get_keyword_engine()
+    return engine.analyze(titles, top_n=top_n)
+
+
+def generate_wordcloud(keywords, save_path='wordcloud.png', size=(1000, 700), dpi=300):
+    """生成热点词汇图（带标题与说明的高分辨率PNG，用于保存导出）"""
+    if not keywords:
+        print("没有关键词可生成词云")
+        return save_path
+
+    # 按关键词权重渲染词云（结果会被缓存）
+    image = render_wordcloud(keywords, size=size)
+
+    # 生成并保存词云图（直接使用Agg画布，不经过pyplot，避免加载GUI后端）
+    configure_matplotlib()
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    fig = Figure(figsize=(15, 10))
+    FigureCanvasAgg(fig)
+    ax = fig.add_subplot(111)
+    ax.imshow(image, interpolation='bilinear')
+    ax.axis('off')
+    ax.set_title('新闻热点词汇分析', fontsize=20, pad=20)
+
+    # 添加底部信息
+    fig.text(0.5, 0.01,
+             f"数据来源: 新闻网站 | 生成时间: {time.strftime('%Y-%m-%d %H:%M')}",
+             ha='center', fontsize=10, color='gray')
+
+    with stage('save', format='png', path=save_path) as span:
+        fig.savefig(save_path, bbox_inches='tight', dpi=dpi)
+        span.size = os.path.getsize(save_path)
+    print(f"热点词汇图已保存至: {save_path}")
+
+    return save_path
+
+
+def save_results_csv(keywords, titles, file_path):
+    """将关键词和新闻标题分别保存为CSV文件，返回两个文件路径"""
+    with stage('save', format='csv', path=file_path) as span, \
+            open(file_path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(["排名", "关键词", "权重", "出现次数"])
+        for i, kw in enumerate(keywords, 1):
+            if isinstance(kw, str):
+                writer.writerow([i, kw, '', ''])
+            else:
+                writer.writerow([i, kw.word, f"{kw.weight:.6f}", kw.count])
+        span.items = len(keywords)
+
+    # 保存新闻标题到另一个文件
+    titles_path = os.path.splitext(file_path)[0] + "_titles.csv"
+    with stage('save', format='csv', path=titles_path) as span, \
+            open(titles_path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(["序号", "新闻标题"])
+        for i, title in enumerate(titles, 1):
+            writer.writerow([i, title])
+        span.items = len(titles)
+
+    return file_path, titles_path
+
+
+def save_records_csv(records, file_path, start=1, append=False):
+    """保存带来源的标题记录；append 为 True 时追加到已有文件末尾，序号从 start 开始"""
+    exists = append and os.path.exists(file_path)
+    with stage('save', format='csv', path=file_path) as span, \
+            open(file_path, 'a' if append else 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        if not exists:
+            writer.writerow(["序号", "新闻标题", "来源"])
+        for i, record in enumerate(records, start):
+            writer.writerow([i, record['title'], record['source']])
+        span.items = len(records)
+    return file_path
+
+
+def run_pipeline(url, max_pages, out_dir=None, wordcloud=True, top_n=20,
+                 progress=None, cancel_event=None, pool=None, adaptive=False, target_count=None,
+                 incremental=False, parser_backend='html.parser', engine='auto', http_options=None,
+                 dedup_store=None, keyword_engine=None, history_store=None, page_cache=None,
+                 article_options=None):
+    """完整执行一次 爬取→分析→词云 流程，返回结果字典
+
+    out_dir 不为空时，将关键词、标题CSV以及词云图写入该目录。
+    dedup_store（:class:`~new_crawler.dedup.DedupStore`）不为空时，只分析以前没见过的标题。
+    history_store（:class:`~new_crawler.storage.HistoryStore`）不为空时，本次爬到的全部标题写入历史库。
+    page_cache（:class:`~new_crawler.page_cache.PageCache`）用于录制或离线回放，见 :func:`fetch_news`。
+    article_options 不为空时沿标题链接抓取文章正文并统计正文关键词（见
+    :func:`~new_crawler.articles.analyze_articles`，``limit`` 为最多抓取的篇数，其余项传给
+    :class:`~new_crawler.articles.ArticleFetcher`），结果中增加 article_keywords 与 article_stats。
+    """
+    source = urlparse(url).hostname or url
+    links = {} if article_options is not None else None
+    with METRICS.run(label=url), METRICS.bind_source(source):
+        started_at = time.time()
+        titles = fetch_news(url, max_pages, progress=progress, cancel_event=cancel_event,
+                            engine=engine, http_options=http_options, page_cache=page_cache, links=links,
+                            pool=pool, adaptive=adaptive, target_count=target_count,
+                            incremental=incremental, parser_backend=parser_backend)
+        _check_cancel(cancel_event)
+        crawled = len(titles)
+        METRICS.count('source_titles', crawled, source=source)
+        if history_store is not None:
+            history_store.record_run([{'title': title, 'source': source, 'url': url} for title in titles],
+                                     label=url, started_at=started_at)
+            report(progress, 'history', f"已写入历史库，共{len(titles)}条标题")
+        if dedup_store is not None:
+            titles = dedup_store.filter(titles)
+            report(progress, 'dedup', f"去除历史重复后剩余{len(titles)}/{crawled}条标题")
+        keywords = analyze_keywords(titles, top_n=top_n, engine=keyword_engine)
+        report(progress, 'keywords', f"关键词分析完成，共{len(keywords)}个")
+
+        results = {
+            'url': url,
+            'titles': titles,
+            'duplicates': crawled - len(titles),
+            'keywords': keywords,
+            'wordcloud_path': None
+        }
+
+        if article_options is not None:
+            from .articles import analyze_articles
+
+            report(progress, 'articles', f"正在抓取{len(links)}条链接中的文章正文...")
+            article_keywords, article_stats = analyze_articles(
+                titles, links, keyword_engine or get_keyword_engine(), top_n=top_n,
+                progress=progress, cancel_event=cancel_event, **article_options)
+            _check_cancel(cancel_event)
+            results['article_keywords'] = article_keywords
+            results['article_stats'] = article_stats
+            report(progress, 'articles', f"正文关键词分析完成，共{article_stats['articles']}篇正文")
+
+        if out_dir:
+            os.makedirs(out_dir, exist_ok=True)
+            save_results_csv(keywords, titles, os.path.join(out_dir, 'keywords.csv'))
+            if article_options is not None:
+                from .export import export_keywords
+                export_keywords(results['article_keywords'], os.path.join(out_dir, 'article_keywords.csv'))
+            if wordcloud:
+                results['wordcloud_path'] = generate_wordcloud(
+                    keywords, os.path.join(out_dir, 'wordcloud.png'))
+
+        return results
@@ -0,0 +1,274 @@
+"""结果导出
+
+按固定大小的分块流式写出记录，支持 CSV、JSONL 与列式 Parquet（需要安装 pyarrow）。
+CSV/JSONL 可选 gzip / bz2 / xz 压缩，Parquet 可选 snappy / zstd / gzip 等列压缩。
+数据既可以来自本次结果（内存中的列表），也可以来自爬取历史库（按主键分页读取），
+导出大量历史数据时内存占用只与分块大小有关。
+
+用法::
+
+    export_keywords(keywords, 'keywords.parquet')
+    export_records(records, 'titles.jsonl.gz')
+    export_history(store, 'history.csv', since=parse_time('30d'))
+"""
+import bz2
+import csv
+import gzip
+import json
+import lzma
+import os
+import time
+from collections import namedtuple
+from datetime import datetime
+
+from .engine import CrawlCancelled, report
+from .metrics import stage
+
+# 每次写出的行数
+CHUNK_SIZE = 5000
+
+Column = namedtuple('Column', ['name', 'header', 'type'])
+Column.__doc__ = """导出列：name 为 JSONL/Parquet 字段名，header 为 CSV 表头，type 取 int/float/str/time"""
+
+KEYWORD_COLUMNS = (
+    Column('rank', '排名', 'int'),
+    Column('word', '关键词', 'str'),
+    Column('weight', '权重', 'float'),
+    Column('count', '出现次数', 'int'),
+    Column('df', '标题数', 'int'),
+)
+
+RECORD_COLUMNS = (
+    Column('index', '序号', 'int'),
+    Column('title', '新闻标题', 'str'),
+    Column('source', '来源', 'str'),
+    Column('url', '链接', 'str'),
+)
+
+HISTORY_COLUMNS = (
+    Column('id', '编号', 'int'),
+    Column('title', '新闻标题', 'str'),
+    Column('source', '来源', 'str'),
+    Column('url', '链接', 'str'),
+    Column('first_seen', '首次出现', 'time'),
+    Column('last_seen', '最近出现', 'time'),
+    Column('seen_count', '出现次数', 'int'),
+)
+
+FORMATS = ('csv', 'jsonl', 'parquet')
+
+# 文本格式的压缩方式 → (打开函数, 扩展名)
+TEXT_COMPRESSIONS = {
+    'gzip': (gzip.open, '.gz'),
+    'bz2': (bz2.open, '.bz2'),
+    'xz': (lzma.open, '.xz'),
+}
+
+_EXTENSIONS = {'.csv': 'csv', '.jsonl': 'jsonl', '.ndjson': 'jsonl', '.parquet': 'parquet', '.pq': 'parquet'}
+
+
+class ExportError(Exception):
+    """导出格式或参数不受支持"""
+
+
+def split_path(path):
+    """拆分出包含压缩后缀的扩展名：titles.jsonl.gz → ('titles', '.jsonl.gz')"""
+    root, ext = os.path.splitext(path)
+    if ext.lower() in {suffix for _, suffix in TEXT_COMPRESSIONS.values()}:
+        root, inner = os.path.splitext(root)
+        ext = inner + ext
+    return root, ext
+
+
+def detect_format(path):
+    """根据文件名推断 (格式, 压缩方式)，如 titles.jsonl.gz → ('jsonl', 'gzip')"""
+    ext = split_path(path)[1].lower()
+    compression = None
+    for name, (_, suffix) in TEXT_COMPRESSIONS.items():
+        if ext.endswith(suffix):
+            compression = name
+            ext = ext[:-len(suffix)]
+            break
+    fmt = _EXTENSIONS.get(ext, 'csv')
+    return fmt, compression
+
+
+def chunked(rows, size=CHUNK_SIZE):
+    """把行迭代器切分为固定大小的列表"""
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _format_time(value):
+    return datetime.fromtimestamp(value).isoformat(timespec='seconds') if value is not None else ''
+
+
+class _TextWriter:
+    def __init__(self, path, columns, compression):
+        self.columns = columns
+        if compression is None:
+            self.file = open(path, 'w', encoding='utf-8', newline='')
+        elif compression in TEXT_COMPRESSIONS:
+            self.file = TEXT_COMPRESSIONS[compression][0](path, 'wt', encoding='utf-8', newline='')
+        else:
+            raise ExportError(f"CSV/JSONL 不支持压缩方式: {compression}")
+        self._times = [i for i, column in enumerate(columns) if column.type == 'time']
+
+    def _convert(self, row):
+        if not self._times:
+            return row
+        row = list(row)
+        for i in self._times:
+            row[i] = _format_time(row[i])
+        return row
+
+    def close(self):
+        self.file.close()
+
+
+class _CsvWriter(_TextWriter):
+    def __init__(self, path, columns, compression, metadata):
+        super().__init__(path, columns, compression)
+        self.writer = csv.writer(self.file)
+        self.writer.writerow([column.header for column in columns])
+
+    def write(self, chunk):
+        self.writer.writerows(self._convert(row) for row in chunk)
+
+
+class _JsonlWriter(_TextWriter):
+    def __init__(self, path, columns, compression, metadata):
+        super().__init__(path, columns, compression)
+        self.names = [column.name for column in columns]
+
+    def write(self, chunk):
+        self.file.write(''.join(
+            json.dumps(dict(zip(self.names, self._convert(row))), ensure_ascii=False) + '\n'
+            for row in chunk))
+
+
+class _ParquetWriter:
+    def __init__(self, path, columns, compression, metadata):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ExportError("导出 Parquet 需要安装 pyarrow：pip install pyarrow") from None
+        self.pa = pa
+        types = {'int': pa.int64(), 'float': pa.float64(), 'str': pa.string(), 'time': pa.timestamp('ms')}
+        self.columns = columns
+        self.schema = pa.schema([(column.name, types[column.type]) for column in columns],
+                                metadata={k: str(v) for k, v in (metadata or {}).items()})
+        self.writer = pq.ParquetWriter(path, self.schema, compression=compression or 'snappy')
+
+    def _array(self, values, column, field):
+        pa = self.pa
+        if column.type == 'time':
+            # 秒级时间戳 → 毫秒整数 → timestamp 列
+            return pa.array([None if v is None else int(v * 1000) for v in values],
+                            pa.int64()).cast(field.type)
+        return pa.array(values, field.type)
+
+    def write(self, chunk):
+        columns = list(zip(*chunk))
+        arrays = [self._array(values, column, field)
+                  for values, column, field in zip(columns, self.columns, self.schema)]
+        self.writer.write_table(self.pa.Table.from_arrays(arrays, schema=self.schema))
+
+    def close(self):
+        self.writer.close()
+
+
+_WRITERS = {'csv': _CsvWriter, 'jsonl': _JsonlWriter, 'parquet': _ParquetWriter}
+
+
+def export_rows(path, columns, chunks, fmt=None, compression=None, total=None, metadata=None,
+                progress=None, cancel_event=None):
+    """把分块的行数据写入文件，返回写出的行数
+
+    chunks 为行元组列表的迭代器（列顺序与 columns 一致）；fmt/compression 为 None 时按文件名推断。
+    先写入临时文件，完成后再替换目标文件，取消或出错时不会留下不完整的文件。
+    """
+    guessed_fmt, guessed_compression = detect_format(path)
+    fmt = fmt or guessed_fmt
+    if fmt not in _WRITERS:
+        raise ExportError(f"不支持的导出格式: {fmt}")
+    if compression is None and fmt != 'parquet':
+        compression = guessed_compression
+    if compression == 'none':
+        compression = None
+
+    metadata = dict(metadata or {}, exported_at=_format_time(time.time()))
+    if os.path.dirname(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+    part_path = path + '.part'
+    count = 0
+    with stage('save', format=fmt, path=path) as span:
+        writer = None
+        try:
+            writer = _WRITERS[fmt](part_path, columns, compression, metadata)
+            for chunk in chunks:
+                if cancel_event is not None and cancel_event.is_set():
+                    raise CrawlCancelled("导出已取消")
+                writer.write(chunk)
+                count += len(chunk)
+                span.items = count
+                done = f"{count}/{total}" if total else str(count)
+                report(progress, 'export', f"正在导出 {os.path.basename(path)}：已写出{done}行")
+            writer.close()
+        except BaseException:
+            # 关闭失败（如压缩流写出剩余数据时磁盘已满）也要删除临时文件
+            try:
+                if writer is not None:
+                    writer.close()
+            finally:
+                if os.path.exists(part_path):
+                    os.remove(part_path)
+            raise
+        os.replace(part_path, path)
+        span.size = os.path.getsize(path)
+    return count
+
+
+def export_keywords(keywords, path, chunk_size=CHUNK_SIZE, **options):
+    """导出关键词（排名、词语、权重、出现次数、标题数）"""
+    rows = ((i, kw.word, float(kw.weight), kw.count, kw.df) for i, kw in enumerate(keywords, 1))
+    return export_rows(path, KEYWORD_COLUMNS, chunked(rows, chunk_size), total=len(keywords), **options)
+
+
+def export_records(records, path, chunk_size=CHUNK_SIZE, **options):
+    """导出带来源的标题记录"""
+    rows = ((i, record['title'], record.get('source'), record.get('url'))
+            for i, record in enumerate(records, 1))
+    return export_rows(path, RECORD_COLUMNS, chunked(rows, chunk_size), total=len(records), **options)
+
+
+def trend_columns(window_names):
+    """趋势表的导出列：关键词、各窗口次数、期望次数、上升倍数、突发分数"""
+    return ((Column('word', '关键词', 'str'),)
+            + tuple(Column(name, f"{name}次数", 'int') for name in window_names)
+            + (Column('baseline', '期望次数', 'float'),
+               Column('rise', '上升倍数', 'float'),
+               Column('burst', '突发分数', 'float')))
+
+
+def export_trends(rows, path, window_names=('1h', '24h', '7d'), chunk_size=CHUNK_SIZE, **options):
+    """导出趋势表（:meth:`TrendEngine.summary` 的结果）"""
+    columns = trend_columns(window_names)
+    values = (tuple(row[column.name] for column in columns) for row in rows)
+    return export_rows(path, columns, chunked(values, chunk_size), total=len(rows), **options)
+
+
+def export_history(store, path, since=None, until=None, source=None, chunk_size=CHUNK_SIZE, **options):
+    """从爬取历史库分页导出时间窗口内出现过的标题"""
+    total = store.count_records(since=since, until=until, source=source)
+    chunks = store.iter_records(since=since, until=until, source=source, chunk_size=chunk_size)
+    metadata = {'since': _format_time(since) if since else '', 'until': _format_time(until) if until else '',
+                'source': source or ''}
+    return export_rows(path, HISTORY_COLUMNS, chunks, total=total, metadata=metadata, **options)
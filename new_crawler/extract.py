@@ -0,0 +1,51 @@
+"""浏览器内增量提取
+
+每次滚动后注入一段脚本，只取回尚未采集过的标题节点（文本与链接），
+无需在结束时通过 ``driver.page_source`` 拉取整个页面再解析。
+已采集的节点会打上标记，可选择清空其内容以控制页面内存。
+"""
+from .parsers import DEFAULT_SELECTORS
+
+# 与 parse_titles 一致的选择器顺序：主选择器无结果时才使用备用选择器
+TITLE_SELECTORS = DEFAULT_SELECTORS
+
+# arguments[0]: 选择器列表；arguments[1]: 是否清空已采集节点
+_HARVEST_JS = """
+var selectors = arguments[0], prune = arguments[1];
+var nodes = [];
+for (var i = 0; i < selectors.length; i++) {
+    nodes = document.querySelectorAll(selectors[i]);
+    if (nodes.length) break;
+}
+var out = [];
+for (var j = 0; j < nodes.length; j++) {
+    var el = nodes[j];
+    if (el.hasAttribute('data-nc-harvested')) continue;
+    el.setAttribute('data-nc-harvested', '1');
+    var href = el.getAttribute('href') || '';
+    if (href) href = el.href;
+    out.push([el.textContent || '', href]);
+    if (prune) {
+        // 保留原有高度，避免页面变短影响信息流继续加载
+        el.style.display = 'block';
+        el.style.height = el.offsetHeight + 'px';
+        el.textContent = '';
+    }
+}
+return out;
+"""
+
+
+class IncrementalExtractor:
+    """每次调用 :meth:`harvest` 返回自上次以来新出现的 (原始文本, 链接) 记录"""
+
+    def __init__(self, driver, prune=False, selectors=TITLE_SELECTORS):
+        self.driver = driver
+        self.prune = prune
+        self.selectors = list(selectors)
+        self.harvested = 0
+
+    def harvest(self):
+        records = self.driver.execute_script(_HARVEST_JS, self.selectors, self.prune) or []
+        self.harvested += len(records)
+        return [(text, href) for text, href in records]
@@ -0,0 +1,274 @@
+"""基于 asyncio 的 HTTP 抓取引擎
+
+新浪滚动新闻等分页站点背后是普通的数据接口，不需要浏览器渲染。
+本模块用 aiohttp 连接池（keep-alive）并发抓取第 1..N 页，按主机限制并发数，
+并解析 JSON 或 HTML 响应。只指定目标条数时逐批抓取，够数即停（最多 :data:`MAX_PAGES` 页）。站点是否走 HTTP 引擎由 :func:`http_site_for_url` 决定。
+提供 :class:`~new_crawler.page_cache.PageCache` 时，录制模式下发送条件请求并缓存响应，
+回放模式下直接从缓存返回，不发出任何请求。
+"""
+import asyncio
+import json
+from urllib.parse import urlencode, urljoin, urlparse, parse_qsl
+
+from .metrics import stage
+from .page_cache import KIND_HTTP, CacheMiss
+from .parsers import clean_title, is_valid_title, parse_html
+
+# HTTP 引擎使用的通用请求头（今日头条的 Cookie/Referer 不应发给其他站点）
+HTTP_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/137.0.0.0 Safari/537.36 Edg/137.0.0.0',
+    'Accept-Language': 'zh-CN,zh;q=0.9,en;q=0.8,en-GB;q=0.7,en-US;q=0.6',
+    'Accept': 'application/json, text/html;q=0.9, */*;q=0.8',
+}
+
+# 未指定页数（按目标条数抓取）时最多抓取的页数
+MAX_PAGES = 20
+
+# 条件请求头，小写
+CONDITIONAL_HEADERS = ('if-none-match', 'if-modified-since')
+
+
+class HttpFetchError(Exception):
+    """HTTP 抓取失败"""
+
+
+class HttpSite:
+    """可以直接通过 HTTP 抓取的站点
+
+    子类需实现 :meth:`page_urls`（生成每页的请求地址）和 :meth:`parse`（从响应中取出记录）。
+    """
+
+    name = 'http'
+    hosts = ()
+
+    def page_urls(self, url, max_page, api_base=None):
+        """返回第 1..max_page 页的请求地址，max_page 为 None 时取 :data:`MAX_PAGES`"""
+        raise NotImplementedError
+
+    def parse(self, body, content_type, url):
+        """返回 [(标题, 链接), ...]"""
+        if 'json' in content_type:
+            return self.parse_json(json.loads(body))
+        return [(title, '') for title in parse_html(body, url=url)]
+
+    def parse_json(self, data):
+        raise NotImplementedError
+
+
+class SinaRollSite(HttpSite):
+    """新浪滚动新闻：页面参数写在 URL 的 # 片段中，数据来自 feed.mix.sina.com.cn 接口"""
+
+    name = 'sina'
+    hosts = ('news.sina.com.cn',)
+    api = 'https://feed.mix.sina.com.cn/api/roll/get'
+
+    def page_urls(self, url, max_page, api_base=None):
+        parsed = urlparse(url)
+        params = dict(parse_qsl(parsed.fragment or parsed.query, keep_blank_values=True))
+        params.setdefault('pageid', '153')
+        params.setdefault('lid', '2509')
+        params.setdefault('num', '50')
+        start = int(params.get('page') or 1)
+
+        api = self.api
+        if api_base:
+            api = api_base.rstrip('/') + urlparse(self.api).path
+        urls = []
+        for page in range(start, start + (max_page or MAX_PAGES)):
+            params['page'] = str(page)
+            urls.append(f"{api}?{urlencode(params)}")
+        return urls
+
+    def parse_json(self, data):
+        items = (data.get('result') or {}).get('data') or []
+        return [(item.get('title') or '', item.get('url') or '') for item in items]
+
+
+HTTP_SITES = {
+    'sina': SinaRollSite(),
+}
+
+
+def http_site_for_url(url):
+    """返回可以走 HTTP 引擎的站点配置，需要浏览器渲染的站点返回 None"""
+    host = urlparse(url or '').hostname or ''
+    for site in HTTP_SITES.values():
+        if any(host == h or host.endswith('.' + h) for h in site.hosts):
+            return site
+    return None
+
+
+class HttpFetcher:
+    """共享连接池的异步抓取器，按主机限制并发数
+
+    用法::
+
+        async with HttpFetcher(per_host_limit=4) as fetcher:
+            pages = await fetcher.fetch_all(urls)
+    """
+
+    def __init__(self, per_host_limit=4, total_limit=32, timeout=15, headers=None, proxy=None,
+                 max_bytes=20 * 1024 * 1024, cache=None):
+        self.per_host_limit = per_host_limit
+        self.total_limit = total_limit
+        self.timeout = timeout
+        self.headers = dict(headers or HTTP_HEADERS)
+        self.proxy = proxy
+        self.max_bytes = max_bytes
+        self.cache = cache
+        self.session = None
+        self._host_limits = {}
+
+    async def __aenter__(self):
+        import aiohttp
+
+        connector = aiohttp.TCPConnector(limit=self.total_limit, limit_per_host=self.per_host_limit,
+                                         keepalive_timeout=30)
+        self.session = aiohttp.ClientSession(connector=connector, headers=self.headers,
+                                             timeout=aiohttp.ClientTimeout(total=self.timeout))
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.session.close()
+
+    def _limit(self, url):
+        host = urlparse(url).netloc
+        if host not in self._host_limits:
+            self._host_limits[host] = asyncio.Semaphore(self.per_host_limit)
+        return self._host_limits[host]
+
+    async def fetch(self, url, headers=None):
+        """抓取单个地址，返回 (状态码, 响应头, 文本)"""
+        cache = self.cache
+        if cache is not None and cache.replay:
+            try:
+                entry = cache.require(KIND_HTTP, url)
+            except CacheMiss as e:
+                raise HttpFetchError(str(e)) from None
+            return entry.status, {'Content-Type': entry.content_type}, entry.text
+
+        cached = cache.get(KIND_HTTP, url) if cache is not None else None
+        if cached is not None:
+            headers = dict(headers or {}, **cached.validators())
+
+        async with self._limit(url):
+            async with self.session.get(url, headers=headers, proxy=self.proxy) as resp:
+                if resp.status != 304:
+                    return await self._read(url, resp)
+                if cached is not None:
+                    # 内容未变化，使用缓存
+                    cache.touch(KIND_HTTP, url)
+                    return cached.status, {'Content-Type': cached.content_type}, cached.text
+            # 调用方自带条件头但本地没有缓存，去掉条件头重新请求完整内容
+            headers = {k: v for k, v in (headers or {}).items() if k.lower() not in CONDITIONAL_HEADERS}
+            async with self.session.get(url, headers=headers, proxy=self.proxy) as resp:
+                if resp.status == 304:
+                    raise HttpFetchError(f"{url} 返回 304 但没有可用的缓存")
+                return await self._read(url, resp)
+
+    async def _read(self, url, resp):
+        """读取完整响应并写入缓存，304 不会走到这里"""
+        if resp.status >= 400:
+            raise HttpFetchError(f"{url} 返回状态码 {resp.status}")
+        body = await resp.content.read(self.max_bytes + 1)
+        if len(body) > self.max_bytes:
+            raise HttpFetchError(f"{url} 响应超过 {self.max_bytes} 字节")
+        charset = resp.charset or 'utf-8'
+        text = body.decode(charset, errors='replace')
+        if self.cache is not None:
+            # 缓存统一保存为 UTF-8
+            self.cache.put(KIND_HTTP, url, text, content_type=resp.headers.get('Content-Type', ''),
+                           etag=resp.headers.get('ETag'), last_modified=resp.headers.get('Last-Modified'),
+                           status=resp.status)
+        return resp.status, resp.headers, text
+
+    async def fetch_all(self, urls):
+        """并发抓取多个地址，按输入顺序返回结果"""
+        return await asyncio.gather(*(self.fetch(url) for url in urls))
+
+
+def _unique_titles(records):
+    return len({title for title in map(clean_title, (text for text, _ in records)) if is_valid_title(title)})
+
+
+async def fetch_site_async(site, url, max_page, progress=None, cancel_event=None,
+                           per_host_limit=4, api_base=None, proxy=None, cache=None, target_count=None):
+    """并发抓取站点第 1..N 页，返回按页面顺序排列的 [(标题, 链接), ...]
+
+    指定 target_count 时每批并发抓取 per_host_limit 页，唯一标题够数、某页为空或
+    （回放时）后续页面没有录制即停止；max_page 为 None 时最多抓取 :data:`MAX_PAGES` 页。
+    """
+    urls = site.page_urls(url, max_page, api_base=api_base)
+    records = [None] * len(urls)
+    wave = max(1, per_host_limit) if target_count else len(urls)
+
+    async with HttpFetcher(per_host_limit=per_host_limit, proxy=proxy, cache=cache) as fetcher:
+        async def one(index, page_url):
+            try:
+                status, headers, text = await fetcher.fetch(page_url)
+            except HttpFetchError:
+                # 按目标条数回放时，录制范围以外的页面视为到底
+                if target_count and index and cache is not None and cache.replay:
+                    records[index] = []
+                    return index
+                raise
+            records[index] = site.parse(text, headers.get('Content-Type', ''), page_url)
+            return index
+
+        done = 0
+        for begin in range(0, len(urls), wave):
+            tasks = [asyncio.ensure_future(one(i, urls[i])) for i in range(begin, min(begin + wave, len(urls)))]
+            try:
+                for future in asyncio.as_completed(tasks):
+                    await future
+                    done += 1
+                    if progress is not None:
+                        progress('page', f"已抓取 {done}/{len(urls)} 页")
+                    if cancel_event is not None and cancel_event.is_set():
+                        break
+            finally:
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+            if cancel_event is not None and cancel_event.is_set():
+                break
+            fetched = records[:begin + len(tasks)]
+            if target_count and (not all(fetched) or
+                                 _unique_titles([r for page in fetched for r in page]) >= target_count):
+                break
+
+    return [record for page in records if page for record in page]
+
+
+def fetch_http_news(url, max_page, progress=None, cancel_event=None, per_host_limit=4,
+                    api_base=None, proxy=None, site=None, cache=None, links=None, target_count=None):
+    """同步接口：通过 HTTP 引擎抓取新闻标题（按页面顺序去重）
+
+    max_page 为 None 时按 target_count 逐批抓取，够数即停（见 :func:`fetch_site_async`）；
+    proxy 为 HTTP 代理地址（如 ``http://127.0.0.1:8080``）；
+    api_base 可替换接口的协议与主机（如 ``http://127.0.0.1:8000``），用于指向本地替身服务器；
+    cache 为 :class:`~new_crawler.page_cache.PageCache`，用于录制或回放；
+    links 为字典时写入 {标题: 文章链接}。
+    """
+    site = site or http_site_for_url(url)
+    if site is None:
+        raise ValueError(f"该站点不支持HTTP引擎: {url}")
+
+    with stage('fetch_http', pages=max_page) as span:
+        records = asyncio.run(fetch_site_async(site, url, max_page, progress=progress,
+                                               cancel_event=cancel_event,
+                                               per_host_limit=per_host_limit,
+                                               api_base=api_base, proxy=proxy, cache=cache,
+                                               target_count=target_count))
+        span.items = len(records)
+
+    titles = []
+    seen = set()
+    for text, href in records:
+        title = clean_title(text)
+        if is_valid_title(title) and title not in seen:
+            seen.add(title)
+            titles.append(title)
+            if links is not None and href:
+                links[title] = urljoin(url, href)
+    return titles
@@ -0,0 +1,362 @@
+"""关键词提取引擎
+
+每条标题只分词、词性标注一次，结果按标题哈希缓存（可持久化到 SQLite），
+以前见过的标题不再重复分词；大批量标题的分词分散到进程池中执行。
+词频（TF）、文档频率（DF）与 TF-IDF 权重都由逐条标题的分词结果计算，
+权重与 ``jieba.analyse.extract_tags`` 的算法一致（IDF 表与停用词相同）。
+统计时标题转换为词语编号语料（见 :mod:`new_crawler.corpus`），计数在编号数组上完成。
+jieba 词典在第一次分词时才从快照加载（见 :mod:`new_crawler.dictionary`），导入本模块不加载词典。
+"""
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from collections import Counter, OrderedDict, deque, namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from .corpus import Corpus, Vocabulary, grow
+from .dictionary import load_dictionary
+from .metrics import stage
+
+# 允许的词性：地名、名词、动名词、动词
+DEFAULT_ALLOW_POS = ('ns', 'n', 'vn', 'v')
+
+# 未缓存标题超过该数量时才启用进程池（子进程启动并加载词典快照也需要时间）
+PARALLEL_THRESHOLD = 5000
+
+# 分词缓存在内存中最多保留的标题数（超过后淘汰最久未用的，SQLite 中的记录不受影响）
+MEMORY_CACHE_SIZE = 200000
+
+Keyword = namedtuple('Keyword', ['word', 'weight', 'count', 'df'])
+Keyword.__doc__ = """关键词：word 词语，weight TF-IDF 权重，count 出现次数，df 出现该词的标题数"""
+
+
+def _pos_cut():
+    """确保分词词典已加载，返回 jieba.posseg.cut"""
+    load_dictionary()
+    import jieba.posseg
+    return jieba.posseg.cut
+
+
+def tokenize_title(title, allow_pos=DEFAULT_ALLOW_POS, cut=None):
+    """对单条标题分词并按词性过滤，返回词语元组"""
+    tokens = []
+    for pair in (cut or _pos_cut())(title):
+        word = pair.word.strip()
+        if len(word) < 2 or pair.flag not in allow_pos:
+            continue
+        tokens.append(word)
+    return tuple(tokens)
+
+
+def _tokenize_batch(titles, allow_pos):
+    """进程池任务：批量分词"""
+    cut = _pos_cut()
+    return [tokenize_title(title, allow_pos, cut) for title in titles]
+
+
+def _title_key(title, allow_pos=DEFAULT_ALLOW_POS):
+    # 分词结果与词性过滤有关，非默认词性时把词性加入哈希；默认词性的键与旧缓存文件保持一致
+    data = title.encode('utf-8')
+    if tuple(allow_pos) != DEFAULT_ALLOW_POS:
+        data = ','.join(allow_pos).encode('utf-8') + b'\0' + data
+    return hashlib.blake2b(data, digest_size=16).digest()
+
+
+class TokenCache:
+    """标题 → 分词结果的缓存，path 为 None 时只保存在内存中
+
+    内存中是最多 max_memory 条的 LRU 缓存；缓存键包含 allow_pos，不同词性过滤的结果互不混用。
+    """
+
+    def __init__(self, path=None, allow_pos=DEFAULT_ALLOW_POS, max_memory=MEMORY_CACHE_SIZE):
+        self.path = path
+        self.allow_pos = tuple(allow_pos)
+        self.max_memory = max_memory
+        self.memory = OrderedDict()
+        self.conn = None
+        self._lock = threading.Lock()
+        if path:
+            if os.path.dirname(path):
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+            self.conn = sqlite3.connect(path, check_same_thread=False)
+            self.conn.execute('PRAGMA journal_mode=WAL')
+            self.conn.execute('CREATE TABLE IF NOT EXISTS tokens (key BLOB PRIMARY KEY, tokens TEXT NOT NULL) '
+                              'WITHOUT ROWID')
+            self.conn.commit()
+
+    def get_many(self, titles):
+        """返回 {标题: 分词结果}，只包含已缓存的标题"""
+        found = {}
+        missing = []
+        with self._lock:
+            for title in titles:
+                key = _title_key(title, self.allow_pos)
+                if key in self.memory:
+                    self.memory.move_to_end(key)
+                    found[title] = self.memory[key]
+                else:
+                    missing.append((title, key))
+
+        if self.conn is not None and missing:
+            with self._lock:
+                for start in range(0, len(missing), 500):
+                    chunk = missing[start:start + 500]
+                    by_key = {key: title for title, key in chunk}
+                    placeholders = ', '.join('?' * len(chunk))
+                    rows = self.conn.execute(
+                        f'SELECT key, tokens FROM tokens WHERE key IN ({placeholders})', list(by_key))
+                    for key, text in rows:
+                        tokens = tuple(text.split('\t')) if text else ()
+                        self._remember(key, tokens)
+                        found[by_key[key]] = tokens
+        return found
+
+    def put_many(self, items):
+        """写入 {标题: 分词结果}"""
+        rows = []
+        with self._lock:
+            for title, tokens in items.items():
+                key = _title_key(title, self.allow_pos)
+                self._remember(key, tokens)
+                rows.append((key, '\t'.join(tokens)))
+        if self.conn is not None and rows:
+            with self._lock, self.conn:
+                self.conn.executemany('INSERT OR REPLACE INTO tokens VALUES (?, ?)', rows)
+
+    def _remember(self, key, tokens):
+        # 调用方持有 self._lock
+        self.memory[key] = tokens
+        self.memory.move_to_end(key)
+        while len(self.memory) > self.max_memory:
+            self.memory.popitem(last=False)
+
+    def close(self):
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None
+
+
+class KeywordEngine:
+    """带缓存、可并行的关键词引擎
+
+    用法::
+
+        engine = KeywordEngine(cache_path='keyword_cache.db')
+        keywords = engine.analyze(titles, top_n=20)   # [Keyword(word, weight, count, df), ...]
+
+    IDF 表与停用词在第一次使用时才加载，创建引擎本身很快。
+    """
+
+    def __init__(self, cache_path=None, workers=None, allow_pos=DEFAULT_ALLOW_POS,
+                 parallel_threshold=PARALLEL_THRESHOLD):
+        self.allow_pos = tuple(allow_pos)
+        self.cache = TokenCache(cache_path, allow_pos=self.allow_pos)
+        self.workers = workers or os.cpu_count() or 1
+        self.parallel_threshold = parallel_threshold
+        self.vocabulary = Vocabulary()
+
+    @property
+    def idf(self):
+        return load_dictionary().idf
+
+    @property
+    def median_idf(self):
+        return load_dictionary().median_idf
+
+    @property
+    def stop_words(self):
+        return load_dictionary().stop_words
+
+    def tokenize(self, titles):
+        """返回与 titles 一一对应的分词结果，未缓存的标题才会实际分词"""
+        with stage('tokenize') as span:
+            unique = list(dict.fromkeys(titles))
+            cached = self.cache.get_many(unique)
+            missing = [title for title in unique if title not in cached]
+
+            if missing:
+                if len(missing) >= self.parallel_threshold and self.workers > 1:
+                    fresh = self._tokenize_parallel(missing)
+                else:
+                    fresh = _tokenize_batch(missing, self.allow_pos)
+                new_items = dict(zip(missing, fresh))
+                self.cache.put_many(new_items)
+                cached.update(new_items)
+            span.items = len(unique)
+            span.fields['tokenized'] = len(missing)
+
+        return [cached[title] for title in titles]
+
+    def tokenize_texts(self, texts):
+        """分词但不使用缓存（文章正文等长文本，缓存只会占用内存），返回词语元组列表"""
+        texts = list(texts)
+        with stage('tokenize', kind='text') as span:
+            if len(texts) >= self.parallel_threshold and self.workers > 1:
+                tokens = self._tokenize_parallel(texts)
+            else:
+                tokens = _tokenize_batch(texts, self.allow_pos)
+            span.items = len(texts)
+            span.size = sum(map(len, texts))
+        return tokens
+
+    def _tokenize_parallel(self, titles):
+        chunk = max(1, len(titles) // (self.workers * 4))
+        batches = [titles[i:i + chunk] for i in range(0, len(titles), chunk)]
+        results = []
+        with ProcessPoolExecutor(max_workers=self.workers) as executor:
+            for tokens in executor.map(_tokenize_batch, batches, [self.allow_pos] * len(batches)):
+                results.extend(tokens)
+        return results
+
+    def corpus(self, titles, sources=None):
+        """分词并转换为共享词表的 :class:`~new_crawler.corpus.Corpus`"""
+        corpus = Corpus(self.vocabulary)
+        corpus.add(self.tokenize(titles), sources)
+        return corpus
+
+    def stop_mask(self):
+        """按词语编号索引的停用词标记"""
+        stop_words = self.stop_words
+        return self.vocabulary.derive('stop', lambda word: word.lower() in stop_words, bool)
+
+    def idf_vector(self):
+        """按词语编号索引的 IDF 值（未登录词取中位数）"""
+        lexicon = load_dictionary()
+        idf, median_idf = lexicon.idf, lexicon.median_idf
+        return self.vocabulary.derive('idf', lambda word: idf.get(word, median_idf), np.float64)
+
+    def counts(self, corpus):
+        """由语料计算按编号索引的词频与文档频率数组（已去除停用词）"""
+        stop = self.stop_mask()
+        return corpus.term_frequencies(exclude=stop), corpus.document_frequencies(exclude=stop)
+
+    def weigh_counts(self, tf, df, top_n=None):
+        """计算 TF-IDF 权重，返回按权重降序排列的 Keyword 列表（指定 top_n 时只取前 top_n 个）
+
+        tf、df 为按词语编号索引的词频与文档频率数组（见 :meth:`counts`）。
+        """
+        total = int(tf.sum())
+        if not total:
+            return []
+        weights = tf / total * self.idf_vector()[:len(tf)]
+        candidates = np.flatnonzero(tf)
+        if top_n is not None and len(candidates) > top_n:
+            # 先按权重取出前 top_n 名（含并列），只有这些词才转换为字符串参与最终排序
+            threshold = np.partition(weights[candidates], -top_n)[-top_n]
+            candidates = candidates[weights[candidates] >= threshold]
+        words = self.vocabulary.decode(candidates)
+        keywords = [Keyword(word, weight, count, doc_count) for word, weight, count, doc_count in
+                    zip(words, weights[candidates].tolist(), tf[candidates].tolist(), df[candidates].tolist())]
+        keywords.sort(key=lambda k: (-k.weight, -k.count, k.word))
+        return keywords if top_n is None else keywords[:top_n]
+
+    def analyze(self, titles, top_n=20):
+        """分析标题，返回权重最高的 top_n 个关键词"""
+        if not titles:
+            return []
+        tf, df = self.counts(self.corpus(titles))
+        return self.weigh_counts(tf, df, top_n=top_n)
+
+    def keyword_sources(self, keywords, records):
+        """统计每个关键词出现在哪些来源的标题中，返回 {词语: Counter(来源 -> 标题数)}
+
+        records 为带 ``title`` 与 ``source`` 的标题记录；分词结果直接来自缓存。
+        """
+        wanted = list(keyword_weights(keywords))
+        corpus = self.corpus([record['title'] for record in records], [record['source'] for record in records])
+        counts = corpus.source_counts(self.vocabulary.lookup(wanted))
+        names = corpus.source_names.words
+        sources = {}
+        for word, row in zip(wanted, counts.tolist()):
+            sources[word] = Counter({name: n for name, n in zip(names, row) if n})
+        return sources
+
+    def close(self):
+        self.cache.close()
+
+
+class KeywordAggregate:
+    """增量关键词统计
+
+    只对新增标题分词并把 TF/DF 累加到已有计数上，排名时直接由累计计数计算权重，
+    不需要重新扫描以前的标题。累计计数是按引擎词表编号索引的整数数组。
+    horizon（秒）不为空时只统计最近 horizon 秒内加入的标题：每批的计数以稀疏形式保留，
+    :meth:`expire` 时从累计计数中减去过期的批次，保留的数据量只与这段时间内的标题数有关。
+    """
+
+    def __init__(self, engine, horizon=None):
+        self.engine = engine
+        self.horizon = horizon
+        self.tf = np.zeros(0, dtype=np.int64)
+        self.df = np.zeros(0, dtype=np.int64)
+        self.title_count = 0
+        # (时间, 词语编号, TF, DF, 标题数)
+        self._batches = deque()
+
+    @property
+    def vocabulary(self):
+        return self.engine.vocabulary
+
+    def add(self, titles):
+        """累加一批新标题，返回这批标题按编号索引的词频数组"""
+        if not titles:
+            return np.zeros(len(self.vocabulary), dtype=np.int64)
+        return self.add_corpus(self.engine.corpus(titles))
+
+    def add_corpus(self, corpus, timestamp=None):
+        """累加一个已转换好的语料（须使用引擎的词表），返回其按编号索引的词频数组"""
+        tf, df = self.engine.counts(corpus)
+        size = len(self.vocabulary)
+        self.tf = grow(self.tf, size)
+        self.df = grow(self.df, size)
+        self.tf[:len(tf)] += tf
+        self.df[:len(df)] += df
+        self.title_count += len(corpus)
+        if self.horizon is not None and len(corpus):
+            ids = np.flatnonzero(tf)
+            timestamp = time.time() if timestamp is None else timestamp
+            self._batches.append((timestamp, ids, tf[ids], df[ids], len(corpus)))
+        return tf
+
+    def expire(self, timestamp=None):
+        """减去 horizon 之前加入的批次，返回减去的标题数"""
+        if self.horizon is None:
+            return 0
+        cutoff = (time.time() if timestamp is None else timestamp) - self.horizon
+        removed = 0
+        while self._batches and self._batches[0][0] < cutoff:
+            _, ids, tf, df, count = self._batches.popleft()
+            self.tf[ids] -= tf
+            self.df[ids] -= df
+            self.title_count -= count
+            removed += count
+        return removed
+
+    def merge(self, words, tf, df, title_count):
+        """归并其他进程算出的部分计数：words 为词语列表，tf/df 为对应的计数数组"""
+        ids = self.vocabulary.encode(words)
+        size = len(self.vocabulary)
+        self.tf = grow(self.tf, size)
+        self.df = grow(self.df, size)
+        # 同一批中的词语互不相同，可直接按编号累加
+        self.tf[ids] += tf
+        self.df[ids] += df
+        self.title_count += title_count
+
+    def top(self, top_n=20):
+        return self.engine.weigh_counts(self.tf, self.df, top_n=top_n)
+
+
+def keyword_weights(keywords):
+    """将关键词列表转换为 {词语: 权重}，兼容只有词语的旧格式"""
+    weights = {}
+    for rank, kw in enumerate(keywords):
+        if isinstance(kw, str):
+            weights[kw] = 1.0 / (rank + 1)
+        else:
+            weights[kw[0]] = kw[1]
+    return weights
@@ -0,0 +1,431 @@
+"""运行指标
+
+在流水线各阶段（启动浏览器、页面加载、每次滚动、页面源码、解析、分词、渲染、保存）周围计时，
+记录墙钟时间、CPU 时间（当前线程）、常驻内存与条目数，并按来源、按运行累计计数。
+峰值内存是进程启动以来的峰值（操作系统只提供这一项），不是单个阶段或单次运行的峰值。
+每个阶段结束时可写出一行 JSON 日志；累计指标可导出为 Prometheus 文本格式（文件或 HTTP 端点），
+界面状态栏显示本次运行的各阶段摘要。
+
+用法::
+
+    with stage('parse', source='toutiao') as span:
+        titles = parse_html(html)
+        span.items = len(titles)
+
+    METRICS.open_log('metrics.jsonl')
+    METRICS.write_prometheus('metrics.prom')
+"""
+import itertools
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# 阶段名称 → 状态栏中显示的名称，摘要按此顺序排列
+STAGE_LABELS = {
+    'browser_start': '启动浏览器',
+    'page_load': '页面加载',
+    'scroll': '滚动',
+    'page_source': '页面源码',
+    'fetch_http': 'HTTP抓取',
+    'parse': '解析',
+    'tokenize': '分词',
+    'render': '渲染',
+    'fetch_articles': '正文抓取',
+    'save': '保存',
+    'dictionary_load': '词典加载',
+    'import': '预导入',
+}
+
+PREFIX = 'crawler'
+
+
+def _psutil_memory():
+    """通过 psutil 取 (当前常驻内存, 峰值常驻内存)（KB），未安装时返回 None；只有 Windows 提供峰值"""
+    try:
+        import psutil
+    except ImportError:
+        return None
+    info = psutil.Process().memory_info()
+    peak = getattr(info, 'peak_wset', None)
+    return info.rss // 1024, peak // 1024 if peak else None
+
+
+def _win32_memory():
+    """Windows：通过 GetProcessMemoryInfo 取 (当前工作集, 峰值工作集)（KB）"""
+    import ctypes
+    from ctypes import wintypes
+
+    class ProcessMemoryCounters(ctypes.Structure):
+        _fields_ = [('cb', wintypes.DWORD), ('PageFaultCount', wintypes.DWORD),
+                    ('PeakWorkingSetSize', ctypes.c_size_t), ('WorkingSetSize', ctypes.c_size_t),
+                    ('QuotaPeakPagedPoolUsage', ctypes.c_size_t), ('QuotaPagedPoolUsage', ctypes.c_size_t),
+                    ('QuotaPeakNonPagedPoolUsage', ctypes.c_size_t), ('QuotaNonPagedPoolUsage', ctypes.c_size_t),
+                    ('PagefileUsage', ctypes.c_size_t), ('PeakPagefileUsage', ctypes.c_size_t)]
+
+    kernel32 = ctypes.windll.kernel32
+    kernel32.GetCurrentProcess.restype = wintypes.HANDLE
+    get_info = ctypes.windll.psapi.GetProcessMemoryInfo
+    get_info.argtypes = [wintypes.HANDLE, ctypes.POINTER(ProcessMemoryCounters), wintypes.DWORD]
+    get_info.restype = wintypes.BOOL
+    counters = ProcessMemoryCounters()
+    counters.cb = ctypes.sizeof(counters)
+    if not get_info(kernel32.GetCurrentProcess(), ctypes.byref(counters), counters.cb):
+        return None
+    return counters.WorkingSetSize // 1024, counters.PeakWorkingSetSize // 1024
+
+
+def _fallback_memory():
+    """没有 /proc 与 resource 时的 (当前, 峰值) 内存（KB），依次尝试 psutil 与 Win32 API"""
+    try:
+        memory = _psutil_memory()
+        if memory is None and os.name == 'nt':
+            memory = _win32_memory()
+    except (OSError, AttributeError, ValueError):
+        memory = None
+    return memory or (None, None)
+
+
+def rss_kb():
+    """当前常驻内存（KB），无法获取时返回 None"""
+    try:
+        with open('/proc/self/statm', 'r') as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf('SC_PAGE_SIZE') // 1024
+    except (OSError, ValueError, IndexError, AttributeError):
+        return _fallback_memory()[0]
+
+
+def peak_rss_kb():
+    """进程启动以来的峰值常驻内存（KB），无法获取时返回 None"""
+    if resource is None:
+        return _fallback_memory()[1]
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss // 1024 if sys.platform == 'darwin' else rss
+
+
+class Span:
+    """一次阶段计时；在 with 块内设置 items（条目数）、size（字节或字符数）及其他字段"""
+
+    def __init__(self, stage, source):
+        self.stage = stage
+        self.source = source
+        self.items = 0
+        self.size = 0
+        self.fields = {}
+        self.error = None
+        self.wall = 0.0
+        self.cpu = 0.0
+
+
+class _StageStats:
+    __slots__ = ('calls', 'wall', 'cpu', 'wall_max', 'items', 'size', 'errors')
+
+    def __init__(self):
+        self.calls = 0
+        self.wall = 0.0
+        self.cpu = 0.0
+        self.wall_max = 0.0
+        self.items = 0
+        self.size = 0
+        self.errors = 0
+
+    def add(self, span):
+        self.calls += 1
+        self.wall += span.wall
+        self.cpu += span.cpu
+        self.wall_max = max(self.wall_max, span.wall)
+        self.items += span.items
+        self.size += span.size
+        if span.error:
+            self.errors += 1
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _labels(labels):
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{key}="{_escape(value)}"' for key, value in labels) + '}'
+
+
+class Metrics:
+    """线程安全的指标注册表
+
+    stages 按（阶段, 来源）累计，counters 为带标签的计数器；
+    begin_run / end_run（或 run 上下文）之间的阶段另外计入本次运行，供状态栏摘要使用。
+    """
+
+    def __init__(self, log_path=None):
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._log = None
+        self._run_ids = itertools.count(1)
+        self.stages = {}
+        self.counters = {}
+        self.run_id = None
+        self.run_label = None
+        self.run_started = None
+        self.run_stages = {}
+        self.last_run_elapsed = None
+        self.listeners = []
+        if log_path:
+            self.open_log(log_path)
+
+    # ---------- 日志 ----------
+
+    def open_log(self, path):
+        """把每个阶段与运行事件以 JSON 行的形式追加写入 path"""
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        with self._lock:
+            if self._log is not None:
+                self._log.close()
+            self._log = open(path, 'a', encoding='utf-8')
+
+    def close(self):
+        with self._lock:
+            if self._log is not None:
+                self._log.close()
+                self._log = None
+
+    def _emit(self, event):
+        line = json.dumps(event, ensure_ascii=False, default=str)
+        with self._lock:
+            if self._log is not None:
+                self._log.write(line + '\n')
+                self._log.flush()
+            listeners = list(self.listeners)
+        for listener in listeners:
+            listener(event)
+
+    # ---------- 记录 ----------
+
+    @contextmanager
+    def bind_source(self, source):
+        """在当前线程内把之后未指定来源的阶段归属到 source"""
+        previous = getattr(self._local, 'source', None)
+        self._local.source = source
+        try:
+            yield
+        finally:
+            self._local.source = previous
+
+    @contextmanager
+    def stage(self, name, source=None, **fields):
+        """为一个阶段计时，产出 :class:`Span`；异常会被记录后原样抛出"""
+        span = Span(name, source or getattr(self._local, 'source', None) or '')
+        span.fields.update(fields)
+        wall, cpu = time.perf_counter(), time.thread_time()
+        try:
+            yield span
+        except BaseException as e:
+            span.error = type(e).__name__
+            raise
+        finally:
+            span.wall = time.perf_counter() - wall
+            span.cpu = time.thread_time() - cpu
+            self.observe(span)
+
+    def observe(self, span):
+        """累计一次已完成的阶段并写出日志"""
+        with self._lock:
+            self.stages.setdefault((span.stage, span.source), _StageStats()).add(span)
+            run_id = self.run_id
+            if run_id is not None:
+                self.run_stages.setdefault(span.stage, _StageStats()).add(span)
+        event = {
+            'event': 'stage', 'time': time.time(), 'run': run_id, 'stage': span.stage,
+            'source': span.source, 'wall': round(span.wall, 6), 'cpu': round(span.cpu, 6),
+            'rss_kb': rss_kb(), 'process_peak_rss_kb': peak_rss_kb(), 'items': span.items, 'size': span.size,
+            'thread': threading.current_thread().name,
+        }
+        if span.error:
+            event['error'] = span.error
+        event.update(span.fields)
+        self._emit(event)
+
+    def count(self, name, value=1, **labels):
+        """累加计数器 ``crawler_<name>_total``"""
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    # ---------- 运行 ----------
+
+    def begin_run(self, label=None):
+        """开始一次运行；已有运行进行中时返回 None（嵌套调用不另计一次）"""
+        with self._lock:
+            if self.run_id is not None:
+                return None
+            self.run_id = next(self._run_ids)
+            self.run_label = label
+            self.run_started = time.perf_counter()
+            self.run_stages = {}
+            run_id = self.run_id
+        self.count('runs')
+        self._emit({'event': 'run_start', 'time': time.time(), 'run': run_id, 'label': label})
+        return run_id
+
+    def end_run(self, run_id, status='ok'):
+        if run_id is None:
+            return
+        with self._lock:
+            elapsed = time.perf_counter() - self.run_started
+            stages = {name: {'calls': s.calls, 'wall': round(s.wall, 6), 'cpu': round(s.cpu, 6),
+                             'items': s.items, 'size': s.size}
+                      for name, s in self.run_stages.items()}
+            self.run_id = None
+            self.last_run_elapsed = elapsed
+        self.count('runs_finished', status=status)
+        self._emit({'event': 'run_end', 'time': time.time(), 'run': run_id, 'label': self.run_label,
+                    'status': status, 'elapsed': round(elapsed, 6), 'process_peak_rss_kb': peak_rss_kb(),
+                    'stages': stages})
+
+    @contextmanager
+    def run(self, label=None):
+        """一次完整运行（爬取→分析→输出）"""
+        run_id = self.begin_run(label)
+        status = 'ok'
+        try:
+            yield run_id
+        except BaseException as e:
+            status = 'cancelled' if type(e).__name__ == 'CrawlCancelled' else 'error'
+            raise
+        finally:
+            self.end_run(run_id, status)
+
+    def run_summary(self):
+        """本次（或最近一次）运行的各阶段摘要，如 ``页面加载 2.1s | 滚动×5 8.3s | 解析 320条 0.2s``"""
+        with self._lock:
+            stages = dict(self.run_stages)
+            running = self.run_id is not None
+            elapsed = (time.perf_counter() - self.run_started) if running else self.last_run_elapsed
+        if not stages:
+            return ''
+        order = list(STAGE_LABELS) + sorted(set(stages) - set(STAGE_LABELS))
+        parts = []
+        for name in order:
+            stats = stages.get(name)
+            if stats is None:
+                continue
+            text = STAGE_LABELS.get(name, name)
+            if stats.calls > 1:
+                text += f"×{stats.calls}"
+            if stats.items:
+                text += f" {stats.items}条"
+            parts.append(f"{text} {stats.wall:.1f}s")
+        if elapsed is not None:
+            parts.append(f"{'已用' if running else '总计'} {elapsed:.1f}s")
+        peak = peak_rss_kb()
+        if peak:
+            parts.append(f"进程峰值内存 {peak // 1024}MB")
+        return ' | '.join(parts)
+
+    # ---------- 导出 ----------
+
+    def render_prometheus(self):
+        """Prometheus 文本格式的全部指标"""
+        with self._lock:
+            stages = {key: (s.calls, s.wall, s.cpu, s.wall_max, s.items, s.size, s.errors)
+                      for key, s in self.stages.items()}
+            counters = dict(self.counters)
+            run_stages = {name: s.wall for name, s in self.run_stages.items()}
+
+        lines = []
+
+        def family(name, kind, help_text, samples):
+            if not samples:
+                return
+            lines.append(f"# HELP {PREFIX}_{name} {help_text}")
+            lines.append(f"# TYPE {PREFIX}_{name} {kind}")
+            for labels, value in samples:
+                lines.append(f"{PREFIX}_{name}{_labels(labels)} {value:g}")
+
+        stage_labels = {key: (('stage', key[0]), ('source', key[1])) for key in stages}
+        for index, (name, kind, help_text) in enumerate((
+                ('stage_calls_total', 'counter', 'Number of completed stage executions'),
+                ('stage_seconds_total', 'counter', 'Wall-clock seconds spent in each stage'),
+                ('stage_cpu_seconds_total', 'counter', 'CPU seconds (calling thread) spent in each stage'),
+                ('stage_seconds_max', 'gauge', 'Slowest single execution of each stage'),
+                ('stage_items_total', 'counter', 'Items produced by each stage'),
+                ('stage_size_total', 'counter', 'Bytes or characters processed by each stage'),
+                ('stage_errors_total', 'counter', 'Stage executions that raised an exception'))):
+            family(name, kind, help_text,
+                   [(stage_labels[key], values[index]) for key, values in sorted(stages.items())])
+
+        family('run_stage_seconds', 'gauge', 'Wall-clock seconds per stage in the current or last run',
+               [((('stage', name),), value) for name, value in sorted(run_stages.items())])
+
+        by_name = {}
+        for (name, labels), value in sorted(counters.items()):
+            by_name.setdefault(name, []).append((labels, value))
+        for name, samples in by_name.items():
+            family(f"{name}_total", 'counter', f"Total {name.replace('_', ' ')}", samples)
+
+        current, peak = rss_kb(), peak_rss_kb()
+        family('process_resident_memory_kb', 'gauge', 'Current resident set size',
+               [((), current)] if current is not None else [])
+        family('process_peak_resident_memory_kb', 'gauge',
+               'Peak resident set size since process start (not reset per run)',
+               [((), peak)] if peak is not None else [])
+        return '\n'.join(lines) + '\n'
+
+    def write_prometheus(self, path):
+        """写出 Prometheus 文本文件（先写临时文件再替换，适合 node_exporter 的 textfile 采集）"""
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(self.render_prometheus())
+        os.replace(tmp_path, path)
+        return path
+
+    def serve(self, port, host='127.0.0.1'):
+        """在后台线程中提供 ``/metrics`` HTTP 端点，返回服务器对象（调用 shutdown() 停止）"""
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        metrics = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split('?')[0] not in ('/', '/metrics'):
+                    self.send_error(404)
+                    return
+                body = metrics.render_prometheus().encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        server = ThreadingHTTPServer((host, port), Handler)
+        threading.Thread(target=server.serve_forever, name='metrics-http', daemon=True).start()
+        print(f"指标端点: http://{host}:{server.server_address[1]}/metrics")
+        return server
+
+
+# 进程内共享的注册表
+METRICS = Metrics()
+
+
+def stage(name, source=None, **fields):
+    """在共享注册表中为一个阶段计时，见 :meth:`Metrics.stage`"""
+    return METRICS.stage(name, source=source, **fields)
+
+
+def count(name, value=1, **labels):
+    """累加共享注册表中的计数器，见 :meth:`Metrics.count`"""
+    METRICS.count(name, value, **labels)
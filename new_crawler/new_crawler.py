@@ -1,24 +1,31 @@
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-import csv
 import os
+import sys
 import json
-from bs4 import BeautifulSoup
-import jieba
-import jieba.analyse
-from collections import Counter
-import matplotlib as mpl
-import matplotlib.pyplot as plt
-from wordcloud import WordCloud
-import re
-import random
-import time
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.edge.options import Options as EdgeOptions
+import functools
+
+if __name__ == "__main__" and not __package__:
+    # 兼容以脚本方式直接运行本文件
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    __package__ = "new_crawler"
+
+from .browser_pool import get_default_pool
+from .metrics import METRICS
+from .engine import (
+    HEADERS,
+    SITES,
+    fetch_news,
+    analyze_keywords,
+    generate_wordcloud,
+)
+from .export import export_history, export_keywords, export_records, split_path
+from .render import render_wordcloud
+from .scheduler import crawl_sources
+from .storage import HistoryStore
+from .views import KeywordTableView, PieChartView, TitleTableView, TrendTableView, WordcloudView
+from .warmup import warm_up
+from .worker import CrawlWorker, ExportWorker
 
 
 # 用户管理系统
@@ -57,16 +64,19 @@ class UserManager:
 
 # 图形化界面主应用
 class NewsCrawlerApp:
-    def __init__(self, root, crawler_functions):
+    def __init__(self, root, crawler_functions, trend_windows=()):
         self.root = root
         self.root.title("新闻爬虫分析系统")
         self.root.geometry("1000x700")
         self.root.resizable(True, True)
 
         self.crawler_functions = crawler_functions
+        self.trend_windows = tuple(trend_windows)
         self.user_manager = UserManager()
         self.current_user = None
         self.crawler_results = None
+        self.crawl_worker = None
+        self.export_worker = None
 
         # 创建主框架
         self.main_frame = ttk.Frame(root)
@@ -163,12 +173,12 @@ class NewsCrawlerApp:
         ttk.Label(control_frame, text="目标网站:").grid(row=0, column=0, padx=10, pady=10, sticky=tk.W)
         self.site_var = tk.StringVar()
         site_combobox = ttk.Combobox(control_frame, textvariable=self.site_var, width=40)
-        site_combobox['values'] = (
-            "https://www.toutiao.com/?wid=1749629680587",
-            "https://news.sina.com.cn/roll/#pageid=153&lid=2509&k=&num=50&page=1"
-        )
+        site_combobox['values'] = SITES
         site_combobox.current(0)
         site_combobox.grid(row=0, column=1, padx=10, pady=10)
+        self.all_sites_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(control_frame, text="同时爬取全部站点",
+                        variable=self.all_sites_var).grid(row=0, column=2, padx=10, pady=10, sticky=tk.W)
 
         # 页数选择
         ttk.Label(control_frame, text="爬取页数:").grid(row=1, column=0, padx=10, pady=10, sticky=tk.W)
@@ -176,17 +186,39 @@ class NewsCrawlerApp:
         page_spinbox = ttk.Spinbox(control_frame, from_=1, to=10, textvariable=self.page_var, width=10)
         page_spinbox.grid(row=1, column=1, padx=10, pady=10, sticky=tk.W)
 
+        # 滚动方式
+        ttk.Label(control_frame, text="目标条数:").grid(row=2, column=0, padx=10, pady=10, sticky=tk.W)
+        scroll_frame = ttk.Frame(control_frame)
+        scroll_frame.grid(row=2, column=1, padx=10, pady=10, sticky=tk.W)
+        self.target_var = tk.StringVar(value="0")
+        ttk.Spinbox(scroll_frame, from_=0, to=5000, increment=50, textvariable=self.target_var,
+                    width=10).pack(side=tk.LEFT)
+        ttk.Label(scroll_frame, text="（0 表示按页数滚动）").pack(side=tk.LEFT, padx=5)
+        self.adaptive_var = tk.BooleanVar(value=True)
+        ttk.Checkbutton(scroll_frame, text="自适应滚动", variable=self.adaptive_var).pack(side=tk.LEFT, padx=10)
+        self.incremental_var = tk.BooleanVar(value=True)
+        ttk.Checkbutton(scroll_frame, text="增量提取", variable=self.incremental_var).pack(side=tk.LEFT)
+
         # 按钮框架
         button_frame = ttk.Frame(control_frame)
-        button_frame.grid(row=2, column=0, columnspan=2, pady=20)
+        button_frame.grid(row=3, column=0, columnspan=2, pady=20)
 
         # 开始爬取按钮
-        crawl_button = ttk.Button(button_frame, text="开始爬取", command=self.start_crawling)
-        crawl_button.pack(side=tk.LEFT, padx=10)
+        self.crawl_button = ttk.Button(button_frame, text="开始爬取", command=self.start_crawling)
+        self.crawl_button.pack(side=tk.LEFT, padx=10)
+
+        # 取消爬取按钮
+        self.cancel_button = ttk.Button(button_frame, text="取消爬取", command=self.cancel_crawling,
+                                        state=tk.DISABLED)
+        self.cancel_button.pack(side=tk.LEFT, padx=10)
 
         # 保存结果按钮
-        save_button = ttk.Button(button_frame, text="保存结果", command=self.save_results)
-        save_button.pack(side=tk.LEFT, padx=10)
+        self.save_button = ttk.Button(button_frame, text="保存结果", command=self.save_results)
+        self.save_button.pack(side=tk.LEFT, padx=10)
+
+        # 导出历史按钮
+        self.history_button = ttk.Button(button_frame, text="导出历史", command=self.export_history)
+        self.history_button.pack(side=tk.LEFT, padx=10)
 
         # 创建结果显示框架
         result_frame = ttk.Frame(self.main_frame)
@@ -208,20 +240,33 @@ class NewsCrawlerApp:
         table_tab = ttk.Frame(self.notebook)
         self.notebook.add(table_tab, text="数据表格")
 
-        # 初始化标签页内容
-        self.wordcloud_frame = ttk.Frame(wordcloud_tab)
-        self.wordcloud_frame.pack(fill=tk.BOTH, expand=True)
-
-        self.pie_frame = ttk.Frame(pie_tab)
-        self.pie_frame.pack(fill=tk.BOTH, expand=True)
-
-        self.table_frame = ttk.Frame(table_tab)
-        self.table_frame.pack(fill=tk.BOTH, expand=True)
-
-        # 添加状态栏
+        # 新闻标题标签页
+        titles_tab = ttk.Frame(self.notebook)
+        self.notebook.add(titles_tab, text="新闻标题")
+
+        # 热度趋势标签页
+        trend_tab = ttk.Frame(self.notebook)
+        self.notebook.add(trend_tab, text="热度趋势")
+
+        # 初始化标签页内容（控件在标签页首次显示时创建，之后只更新数据）
+        self.result_views = {
+            str(wordcloud_tab): WordcloudView(wordcloud_tab),
+            str(pie_tab): PieChartView(pie_tab),
+            str(table_tab): KeywordTableView(table_tab),
+            str(titles_tab): TitleTableView(titles_tab),
+            str(trend_tab): TrendTableView(trend_tab, self.trend_windows),
+        }
+        self.notebook.bind("<<NotebookTabChanged>>", self.refresh_current_view)
+
+        # 添加状态栏：左侧为进度信息，右侧为本次运行各阶段耗时摘要
+        status_frame = ttk.Frame(self.main_frame)
+        status_frame.pack(side=tk.BOTTOM, fill=tk.X)
         self.status_var = tk.StringVar(value="就绪")
-        status_bar = ttk.Label(self.main_frame, textvariable=self.status_var, relief=tk.SUNKEN, anchor=tk.W)
-        status_bar.pack(side=tk.BOTTOM, fill=tk.X)
+        status_bar = ttk.Label(status_frame, textvariable=self.status_var, relief=tk.SUNKEN, anchor=tk.W)
+        status_bar.pack(side=tk.LEFT, fill=tk.X, expand=True)
+        self.metrics_var = tk.StringVar(value=METRICS.run_summary())
+        metrics_bar = ttk.Label(status_frame, textvariable=self.metrics_var, relief=tk.SUNKEN, anchor=tk.E)
+        metrics_bar.pack(side=tk.RIGHT)
 
     def clear_frame(self):
         """清除主框架中的所有内容"""
@@ -251,6 +296,13 @@ class NewsCrawlerApp:
 
     def logout(self):
         """退出登录"""
+        if self.crawl_worker is not None:
+            # 取消后台任务并丢弃其结果，浏览器由工作线程自行关闭
+            self.crawl_worker.cancel()
+            self.crawl_worker = None
+        if self.export_worker is not None:
+            self.export_worker.cancel()
+            self.export_worker = None
         self.current_user = None
         self.show_login_screen()
 
@@ -276,183 +328,189 @@ class NewsCrawlerApp:
             messagebox.showerror("注册失败", message)
 
     def start_crawling(self):
-        """开始爬取新闻"""
+        """开始爬取新闻（在后台线程中执行，界面保持响应）"""
+        if self.crawl_worker is not None and self.crawl_worker.is_alive():
+            messagebox.showwarning("提示", "已有爬取任务正在进行，请等待完成或先取消")
+            return
+
         site_url = self.site_var.get()
         max_pages = int(self.page_var.get())
+        target_count = int(self.target_var.get() or 0)
 
         if not site_url:
             messagebox.showerror("错误", "请选择目标网站")
             return
 
         self.status_var.set("爬取中，请稍候...")
-        self.root.update()
-
-        try:
-            # 调用爬虫函数
-            titles = self.crawler_functions['fetch_toutiao_news'](site_url, max_pages)
-
-            # 分析关键词
-            keywords = self.crawler_functions['analyze_keywords'](titles)
-
-            # 生成词云图
-            wordcloud_path = 'wordcloud.png'
-            self.crawler_functions['generate_wordcloud'](keywords, wordcloud_path)
-
-            # 保存结果
-            self.crawler_results = {
-                'titles': titles,
-                'keywords': keywords,
-                'wordcloud_path': wordcloud_path
-            }
-
-            # 更新UI显示结果
-            self.display_results()
-            self.status_var.set("爬取完成")
+        self.crawl_button.config(state=tk.DISABLED)
+        self.cancel_button.config(state=tk.NORMAL)
+
+        fetch_options = {
+            'adaptive': self.adaptive_var.get(),
+            'incremental': self.incremental_var.get(),
+            'target_count': target_count or None
+        }
+        # 指定目标条数时不再受页数限制，由自适应滚动自行判断何时结束
+        if target_count:
+            max_pages = None
+        if self.all_sites_var.get():
+            site_url = list(SITES)
+        self.crawl_worker = CrawlWorker(self.crawler_functions, site_url, max_pages,
+                                        fetch_options=fetch_options)
+        self.crawl_worker.start()
+        self.root.after(100, self.poll_crawl_worker)
+
+    def cancel_crawling(self):
+        """取消正在进行的爬取"""
+        if self.crawl_worker is not None and self.crawl_worker.is_alive():
+            self.crawl_worker.cancel()
+            self.status_var.set("正在取消，等待浏览器关闭...")
+            self.cancel_button.config(state=tk.DISABLED)
+
+    def poll_crawl_worker(self):
+        """定时读取后台任务的进度消息"""
+        worker = self.crawl_worker
+        if worker is None:
+            return
 
-        except Exception as e:
-            self.status_var.set("爬取失败")
-            messagebox.showerror("错误", f"爬取过程中发生错误:\n{str(e)}")
+        finished = False
+        for kind, payload in worker.poll():
+            if kind == 'progress':
+                stage, message = payload
+                self.status_var.set(message)
+            elif kind == 'done':
+                finished = True
+                # 保存结果并更新UI显示
+                self.crawler_results = payload
+                self.display_results()
+                self.status_var.set("爬取完成")
+            elif kind == 'cancelled':
+                finished = True
+                self.status_var.set("爬取已取消")
+            elif kind == 'error':
+                finished = True
+                self.status_var.set("爬取失败")
+                messagebox.showerror("错误", f"爬取过程中发生错误:\n{str(payload)}")
+        self.metrics_var.set(METRICS.run_summary())
+
+        if finished:
+            self.crawl_worker = None
+            self.crawl_button.config(state=tk.NORMAL)
+            self.cancel_button.config(state=tk.DISABLED)
+        else:
+            self.root.after(100, self.poll_crawl_worker)
 
     def display_results(self):
-        """显示爬取结果"""
+        """显示爬取结果：更新各标签页数据，只重绘当前可见的标签页"""
         if not self.crawler_results:
             return
 
-        # 显示词云图
-        self.display_wordcloud()
-
-        # 显示饼图
-        self.display_pie_chart()
-
-        # 显示数据表格
-        self.display_data_table()
-
-    def display_wordcloud(self):
-        """显示词云图"""
-        # 清除之前的显示
-        for widget in self.wordcloud_frame.winfo_children():
-            widget.destroy()
-
-        # 创建图像显示区域
-        image_label = ttk.Label(self.wordcloud_frame)
-        image_label.pack(fill=tk.BOTH, expand=True)
-
-        # 显示词云图
-        try:
-            from PIL import Image, ImageTk
-            img = Image.open(self.crawler_results['wordcloud_path'])
-            img = img.resize((600, 400), Image.Resampling.LANCZOS)
-            photo = ImageTk.PhotoImage(img)
-            image_label.configure(image=photo)
-            image_label.image = photo  # 保持引用
-        except Exception as e:
-            ttk.Label(self.wordcloud_frame, text=f"无法显示词云图: {str(e)}").pack()
-
-    def display_pie_chart(self):
-        """显示热点词汇饼图"""
-        # 清除之前的显示
-        for widget in self.pie_frame.winfo_children():
-            widget.destroy()
+        for view in self.result_views.values():
+            view.set_data(self.crawler_results)
+        self.refresh_current_view()
+
+    def refresh_current_view(self, event=None):
+        """绘制当前标签页（数据未变化时不重绘）"""
+        view = self.result_views.get(self.notebook.select())
+        if view is not None:
+            view.refresh()
+
+    # 导出文件类型（压缩格式按扩展名识别，如 .csv.gz、.jsonl.gz）
+    EXPORT_FILETYPES = [
+        ("CSV文件", "*.csv"),
+        ("JSON Lines文件", "*.jsonl"),
+        ("Parquet文件", "*.parquet"),
+        ("压缩文件", "*.gz *.bz2 *.xz"),
+        ("所有文件", "*.*")
+    ]
 
+    def save_results(self):
+        """在后台导出本次爬取的关键词、标题记录与词云图"""
         if not self.crawler_results or not self.crawler_results['keywords']:
-            ttk.Label(self.pie_frame, text="没有关键词数据").pack()
+            messagebox.showwarning("警告", "没有可保存的数据")
             return
 
-        # 创建饼图
-        fig, ax = plt.subplots(figsize=(6, 4))
-
-        # 准备数据 - 只取前20个关键词
-        keywords = self.crawler_results['keywords'][:20]
-        labels = [kw[:6] + '...' if len(kw) > 6 else kw for kw in keywords]  # 缩短长标签
-        sizes = [1] * len(keywords)  # 等分饼图
-
-        # 绘制饼图
-        ax.pie(sizes, labels=labels, autopct='%1.1f%%', startangle=90)
-        ax.axis('equal')  # 确保饼图是圆形
-
-        # 在Tkinter中显示饼图
-        canvas = FigureCanvasTkAgg(fig, master=self.pie_frame)
-        canvas.draw()
-        canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
-
-    def display_data_table(self):
-        """显示数据表格"""
-        # 清除之前的显示
-        for widget in self.table_frame.winfo_children():
-            widget.destroy()
+        # 请求保存文件位置
+        file_path = filedialog.asksaveasfilename(
+            defaultextension=".csv",
+            filetypes=self.EXPORT_FILETYPES,
+            title="保存热点词汇"
+        )
 
-        if not self.crawler_results or not self.crawler_results['keywords']:
-            ttk.Label(self.table_frame, text="没有关键词数据").pack()
+        if not file_path:
             return
 
-        # 创建表格框架
-        table_container = ttk.Frame(self.table_frame)
-        table_container.pack(fill=tk.BOTH, expand=True)
-
-        # 创建滚动条
-        scrollbar = ttk.Scrollbar(table_container)
-        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
-
-        # 创建表格
-        columns = ("排名", "关键词", "出现频率")
-        table = ttk.Treeview(table_container, columns=columns, show="headings", yscrollcommand=scrollbar.set)
-
-        # 配置列
-        table.column("排名", width=50, anchor=tk.CENTER)
-        table.column("关键词", width=150, anchor=tk.W)
-        table.column("出现频率", width=100, anchor=tk.CENTER)
-
-        # 设置列标题
-        table.heading("排名", text="排名")
-        table.heading("关键词", text="关键词")
-        table.heading("出现频率", text="出现频率")
-
-        # 添加数据
-        keywords = self.crawler_results['keywords']
-        for i, kw in enumerate(keywords, 1):
-            table.insert("", tk.END, values=(i, kw, "高频" if i <= 10 else "中频" if i <= 20 else "低频"))
-
-        table.pack(fill=tk.BOTH, expand=True)
-        scrollbar.config(command=table.yview)
-
-    def save_results(self):
-        """保存爬取结果"""
-        if not self.crawler_results or not self.crawler_results['keywords']:
-            messagebox.showwarning("警告", "没有可保存的数据")
+        results = self.crawler_results
+        root, ext = split_path(file_path)
+        titles_path = f"{root}_titles{ext}"
+        # 高分辨率词云图只在保存时导出
+        wordcloud_path = f"{root}_wordcloud.png"
+        generate = self.crawler_functions['generate_wordcloud']
+        self.start_export([
+            (file_path, functools.partial(export_keywords, results['keywords'], file_path)),
+            (titles_path, functools.partial(export_records, results['records'], titles_path)),
+            (wordcloud_path, lambda progress, cancel_event: generate(results['keywords'], wordcloud_path)),
+        ])
+
+    def export_history(self):
+        """在后台分块导出爬取历史库中的全部标题"""
+        if 'export_history' not in self.crawler_functions:
+            messagebox.showwarning("警告", "未启用爬取历史库")
             return
 
-        # 请求保存文件位置
         file_path = filedialog.asksaveasfilename(
             defaultextension=".csv",
-            filetypes=[("CSV文件", "*.csv"), ("所有文件", "*.*")],
-            title="保存热点词汇"
+            filetypes=self.EXPORT_FILETYPES,
+            title="导出爬取历史"
         )
 
         if not file_path:
             return
 
-        try:
-            # 保存关键词到CSV
-            keywords = self.crawler_results['keywords']
-            with open(file_path, 'w', newline='', encoding='utf-8') as f:
-                writer = csv.writer(f)
-                writer.writerow(["排名", "关键词"])
-                for i, kw in enumerate(keywords, 1):
-                    writer.writerow([i, kw])
+        self.start_export([
+            (file_path, functools.partial(self.crawler_functions['export_history'], path=file_path)),
+        ])
+
+    def start_export(self, jobs):
+        """启动后台导出任务，界面保持响应"""
+        if self.export_worker is not None and self.export_worker.is_alive():
+            messagebox.showwarning("提示", "已有导出任务正在进行，请等待完成")
+            return
 
-            # 保存新闻标题到另一个文件
-            titles_path = os.path.splitext(file_path)[0] + "_titles.csv"
-            titles = self.crawler_results['titles']
-            with open(titles_path, 'w', newline='', encoding='utf-8') as f:
-                writer = csv.writer(f)
-                writer.writerow(["序号", "新闻标题"])
-                for i, title in enumerate(titles, 1):
-                    writer.writerow([i, title])
+        self.save_button.config(state=tk.DISABLED)
+        self.history_button.config(state=tk.DISABLED)
+        self.export_worker = ExportWorker(jobs)
+        self.export_worker.start()
+        self.root.after(100, self.poll_export_worker)
 
-            messagebox.showinfo("保存成功", f"数据已保存到:\n{file_path}\n{titles_path}")
+    def poll_export_worker(self):
+        """定时读取导出任务的进度消息"""
+        worker = self.export_worker
+        if worker is None:
+            return
 
-        except Exception as e:
-            messagebox.showerror("保存失败", f"保存数据时出错:\n{str(e)}")
+        finished = False
+        for kind, payload in worker.poll():
+            if kind == 'progress':
+                self.status_var.set(payload[1])
+            elif kind == 'done':
+                finished = True
+                self.status_var.set("导出完成")
+                messagebox.showinfo("保存成功", "数据已保存到:\n" + "\n".join(payload))
+            elif kind == 'cancelled':
+                finished = True
+                self.status_var.set("导出已取消")
+            elif kind == 'error':
+                finished = True
+                self.status_var.set("导出失败")
+                messagebox.showerror("保存失败", f"保存数据时出错:\n{str(payload)}")
+
+        if finished:
+            self.export_worker = None
+            self.save_button.config(state=tk.NORMAL)
+            self.history_button.config(state=tk.NORMAL)
+        else:
+            self.root.after(100, self.poll_export_worker)
 
 
 # 主函数
@@ -460,201 +518,59 @@ def main():
     # 创建主窗口
     root = tk.Tk()
 
-    # 爬虫功能函数
-    crawler_functions = {
-        'fetch_toutiao_news': fetch_toutiao_news,
-        'analyze_keywords': analyze_keywords,
-        'generate_wordcloud': generate_wordcloud
-    }
-
-    # 创建应用
-    app = NewsCrawlerApp(root, crawler_functions)
-
-    # 启动主循环
-    root.mainloop()
-
-
-if __name__ == "__main__":
-    # 设置中文字体
-    mpl.rcParams['font.family'] = 'SimHei'
-    mpl.rcParams['axes.unicode_minus'] = False
-
-    HEADERS = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/137.0.0.0 Safari/537.36 Edg/137.0.0.0',
-        'Accept-Language': 'zh-CN,zh;q=0.9,en;q=0.8,en-GB;q=0.7,en-US;q=0.6',
-        'Referer': 'https://www.toutiao.com/?wid=1749629680587',
-        'Connection': 'keep-alive',
-        'cookie': '__ac_signature=_02B4Z6wo00f01nrq8DQAAIDCTc40aQknxBp6yvSAAPcC18; tt_webid=7514602195262998043; ttcid=d5ff4ab5e68b44f7bb9c87892deac82121; local_city_cache=%E6%98%86%E6%98%8E; csrftoken=39c6428b3d1b7e51935cde22decf2a9f; s_v_web_id=verify_mbroc7mr_VRv6bIsa_zpqw_4kbn_9EDx_jt6kEMHV7N5K; _ga=GA1.1.1856050421.1749629686; gfkadpd=24,6457; ttwid=1%7CuZcAxZgZZfPS6UG0OuNgX05vm6CkUyZXfQxbgxUqDt8%7C1750258656%7Cab19f283c650496fbf31de472aa49057815555da11eece3b37a6a4fc9ab89d89; tt_scid=ITq8rHHUIrgxDdYxq4Vmli19XZuYOWlzdFONbOswKUsfMpibH36gSZMl5dfTBWHqaa67; _ga_QEHZPBE5HH=GS2.1.s1750258657$o9$g1$t1750258796$j60$l0$h0'
-    }  # 今日头条
-
-    # 代理设置
-    PROXIES = {
-        'http': 'http://127.0.0.1:8080',
-    }
-
-
-    def scroll_to_load_content(driver, scroll_count):
-        """滚动页面加载隐藏内容"""
-        print(f"开始滚动页面以加载隐藏内容（{scroll_count}次）...")
-        for i in range(scroll_count):
-            # 滚动到底部
-            driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-            print(f"滚动 {i + 1}/{scroll_count}，等待内容加载...")
-
-            # 随机等待时间（1-3秒）
-            time.sleep(random.uniform(1, 3))
-
-
-    def fetch_toutiao_news(url, max_page):
-        """使用Selenium爬取新闻标题"""
-        print(f"开始爬取新闻网站，目标URL: {url}")
-
-        # 配置浏览器选项
-        options = EdgeOptions()
-        options.add_argument('--headless')  # 无头模式
-        options.add_argument('--disable-gpu')
-        options.add_argument('--no-sandbox')
-        options.add_argument('--disable-dev-shm-usage')
-        options.add_argument(f'user-agent={HEADERS["User-Agent"]}')
-
-        # 创建浏览器实例
-        driver = webdriver.Edge(options=options)
-        all_titles = []
-
-        try:
-            # 打开网页
-            driver.get(url)
-            print("页面加载完成，等待内容渲染...")
-
-            # 等待主要内容加载
-            WebDriverWait(driver, 15).until(
-                EC.presence_of_element_located((By.TAG_NAME, "body"))
-            )
-
-            # 滚动加载更多内容
-            scroll_to_load_content(driver, scroll_count=max_page)
-
-            # 获取页面源码
-            html_content = driver.page_source
-
-            # 解析HTML
-            soup = BeautifulSoup(html_content, 'html.parser')
-
-            # 解析新闻标题
-            titles = parse_titles(soup)
-            all_titles.extend(titles)
-            print(f"获取到{len(titles)}条新闻标题")
+    # 预热浏览器池，重复爬取时无需再冷启动浏览器
+    pool = get_default_pool(user_agent=HEADERS["User-Agent"])
 
-        except Exception as e:
-            print(f"爬取失败: {e}")
-            raise e
-        finally:
-            driver.quit()
+    # 关键词引擎（分词结果持久化缓存；界面模块导入时不导入 NumPy）
+    from .keywords import KeywordEngine
+    keyword_engine = KeywordEngine(cache_path='keyword_cache.db')
 
-        # 去重并返回
-        unique_titles = list(set(all_titles))
-        print(f"共获取到{len(unique_titles)}条唯一新闻标题")
-        return unique_titles
+    # 爬取历史库（复用关键词引擎的分词缓存）
+    history_store = HistoryStore('crawl_history.db', tokenize=keyword_engine.tokenize)
 
+    # 热度趋势（状态保存在文件中，跨会话累计；界面模块导入时不加载趋势引擎）
+    from .trends import TrendEngine
+    trend_path = 'keyword_trends.npz'
+    trend_engine = TrendEngine.open(trend_path)
 
-    def parse_titles(soup):
-        """解析HTML获取新闻标题"""
-        titles = []
+    def update_trends(titles):
+        trend_engine.observe(titles, keyword_engine)
+        return trend_engine.summary(top_n=100)
 
-        # 根据提供的HTML结构解析标题
-        title_elements = soup.find_all('a', target='_blank')
+    # 运行指标：各阶段的 JSON 日志，每次爬取结束后写出 Prometheus 文本文件
+    METRICS.open_log('crawl_metrics.jsonl')
 
-        # 备用选择器
-        if not title_elements:
-            title_elements = soup.select('.feed-card-article-r .title')
-        if not title_elements:
-            title_elements = soup.select('[aria-label]')
-
-        for elem in title_elements:
-            # 提取标题文本
-            title = elem.get_text().strip()
-
-            # 清理标题中的特殊字符和多余空格
-            title = re.sub(r'\s+', ' ', title)
-            title = re.sub(r'[\n\t]', '', title)
-
-            if title and len(title) > 5:  # 过滤过短标题
-                titles.append(title)
-
-        return titles
-
-
-    def analyze_keywords(titles, top_n=20):
-        '''分析新闻标题中的关键词'''
-        if not titles:
-            return []
-
-        # 合并所有标题为一个文本
-        text = ' '.join(titles)
-
-        # 使用jieba进行关键词提取
-        keywords = jieba.analyse.extract_tags(
-            text,
-            topK=top_n * 2,  # 提取更多关键词以便后续过滤
-            withWeight=False,
-            allowPOS=('ns', 'n', 'vn', 'v')  # 允许的词性：地名、名词、动名词、动词
-        )
-
-        # 过滤过短的词（长度至少为2）
-        filtered_keywords = [kw for kw in keywords if len(kw) > 1]
-
-        # 统计词频
-        word_counts = Counter(filtered_keywords)
-
-        # 获取前top_n个高频词
-        top_keywords = [word for word, count in word_counts.most_common(top_n)]
-
-        return top_keywords
-
-
-    def generate_wordcloud(keywords, save_path='wordcloud.png'):
-        """生成热点词汇图"""
-        if not keywords:
-            print("没有关键词可生成词云")
-            return save_path
-
-        # 创建关键词文本（词频越高，重复次数越多）
-        text = ' '.join(keywords * 3)  # 增加重复次数以突出重要词汇
-
-        # 设置中文字体路径
-        font_path = 'simhei.ttf'  # 确保字体文件存在
-
-        # 创建词云对象
-        wordcloud = WordCloud(
-            font_path=font_path,
-            width=1000,
-            height=700,
-            background_color='white',
-            max_words=100,
-            colormap='viridis',
-            contour_width=1,
-            contour_color='steelblue'
-        ).generate(text)
-
-        # 生成并保存词云图
-        plt.figure(figsize=(15, 10))
-        plt.imshow(wordcloud, interpolation='bilinear')
-        plt.axis('off')
-        plt.title('新闻热点词汇分析', fontsize=20, pad=20)
-
-        # 添加底部信息
-        plt.figtext(0.5, 0.01,
-                    f"数据来源: 新闻网站 | 生成时间: {time.strftime('%Y-%m-%d %H:%M')}",
-                    ha='center', fontsize=10, color='gray')
+    # 爬虫功能函数
+    crawler_functions = {
+        'fetch_news': functools.partial(fetch_news, pool=pool),
+        'crawl_sources': functools.partial(crawl_sources, browser_workers=pool.size,
+                                           fetch_options={'pool': pool}),
+        'analyze_keywords': functools.partial(analyze_keywords, engine=keyword_engine),
+        'keyword_sources': keyword_engine.keyword_sources,
+        'record_history': history_store.record_run,
+        'export_history': functools.partial(export_history, history_store),
+        'update_trends': update_trends,
+        'write_metrics': functools.partial(METRICS.write_prometheus, 'crawl_metrics.prom'),
+        'generate_wordcloud': generate_wordcloud,
+        'render_wordcloud': render_wordcloud
+    }
 
-        plt.savefig(save_path, bbox_inches='tight', dpi=300)
-        print(f"热点词汇图已保存至: {save_path}")
+    # 创建应用
+    app = NewsCrawlerApp(root, crawler_functions, trend_windows=list(trend_engine.windows))
 
-        # 关闭图形，避免在非GUI环境中出现问题
-        plt.close()
+    # 登录窗口显示后，在后台导入较重的依赖并加载分词词典
+    warm_up()
 
-        return save_path
+    # 启动主循环
+    try:
+        root.mainloop()
+    finally:
+        pool.close()
+        trend_engine.save(trend_path)
+        history_store.close()
+        keyword_engine.close()
+        METRICS.close()
 
 
-    # 启动GUI应用
-    main()
\ No newline at end of file
+if __name__ == "__main__":
+    main()
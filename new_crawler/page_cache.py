@@ -0,0 +1,225 @@
+"""页面录制/回放缓存
+
+录制模式（record）下，浏览器渲染后的整页 HTML、增量提取到的标题、HTTP 接口的响应
+连同 ETag / Last-Modified 一起写入缓存；HTTP 抓取会带上条件请求头，页面未变化时服务器返回
+304，直接使用缓存内容。回放模式（replay）下完全不联网、不启动浏览器，整个流程从缓存运行，
+便于离线复现某次爬取、可重复地测试解析器或事后排查问题。
+
+内容按 SHA-256 寻址、gzip 压缩存放在 ``blobs/`` 下（相同内容只存一份），
+索引保存在同目录的 SQLite 库中::
+
+    cache/
+        index.db
+        blobs/3f/3fa2...e1.gz
+"""
+import gzip
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+MODES = ('record', 'replay')
+
+# 缓存条目类型
+KIND_HTTP = 'http'        # HTTP 响应
+KIND_PAGE = 'page'        # 浏览器渲染后的整页 HTML
+KIND_RECORDS = 'records'  # 浏览器中增量提取到的标题列表（JSON）
+KIND_ARTICLE = 'article'  # 文章页提取出的正文（纯文本）
+
+
+class CacheMiss(Exception):
+    """回放模式下缓存中没有所需内容"""
+
+
+class CacheEntry:
+    """缓存条目；正文在第一次访问时才从磁盘读取并解压"""
+
+    def __init__(self, cache, url, digest, content_type, etag, last_modified, fetched_at, status):
+        self.cache = cache
+        self.url = url
+        self.digest = digest
+        self.content_type = content_type or ''
+        self.etag = etag
+        self.last_modified = last_modified
+        self.fetched_at = fetched_at
+        self.status = status
+        self._body = None
+
+    @property
+    def body(self):
+        if self._body is None:
+            self._body = self.cache.read_blob(self.digest)
+        return self._body
+
+    @property
+    def text(self):
+        return self.body.decode('utf-8', errors='replace')
+
+    @property
+    def path(self):
+        """内容文件（gzip）路径，可交给其他进程直接读取"""
+        return self.cache._blob_path(self.digest)
+
+    def validators(self):
+        """条件请求头"""
+        headers = {}
+        if self.etag:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified:
+            headers['If-Modified-Since'] = self.last_modified
+        return headers
+
+
+class PageCache:
+    """内容寻址的页面缓存
+
+    mode 为 ``'record'``（联网抓取并写入缓存）或 ``'replay'``（只从缓存读取）。
+    同一地址只保留最近一次录制的内容。
+    """
+
+    def __init__(self, root='page_cache', mode='record', compresslevel=6):
+        if mode not in MODES:
+            raise ValueError(f"不支持的缓存模式: {mode}")
+        self.root = root
+        self.mode = mode
+        self.compresslevel = compresslevel
+        os.makedirs(os.path.join(root, 'blobs'), exist_ok=True)
+        # 调度器在多个线程中抓取，用锁串行化对索引库的访问
+        self.conn = sqlite3.connect(os.path.join(root, 'index.db'), check_same_thread=False)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.execute('''
+            CREATE TABLE IF NOT EXISTS entries (
+                kind TEXT NOT NULL,
+                url TEXT NOT NULL,
+                digest TEXT NOT NULL,
+                content_type TEXT,
+                etag TEXT,
+                last_modified TEXT,
+                fetched_at REAL NOT NULL,
+                status INTEGER NOT NULL DEFAULT 200,
+                PRIMARY KEY (kind, url)
+            ) WITHOUT ROWID
+        ''')
+        self.conn.commit()
+        self._lock = threading.Lock()
+
+    @property
+    def replay(self):
+        return self.mode == 'replay'
+
+    def close(self):
+        with self._lock:
+            self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def __len__(self):
+        with self._lock:
+            return self.conn.execute('SELECT COUNT(*) FROM entries').fetchone()[0]
+
+    # ---------- 内容存储 ----------
+
+    def _blob_path(self, digest):
+        return os.path.join(self.root, 'blobs', digest[:2], digest + '.gz')
+
+    def write_blob(self, body):
+        """写入内容并返回其摘要，相同内容只写一次"""
+        digest = hashlib.sha256(body).hexdigest()
+        path = self._blob_path(digest)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{threading.get_ident()}.tmp"
+            with gzip.open(tmp_path, 'wb', compresslevel=self.compresslevel) as f:
+                f.write(body)
+            os.replace(tmp_path, path)
+        return digest
+
+    def read_blob(self, digest):
+        with gzip.open(self._blob_path(digest), 'rb') as f:
+            return f.read()
+
+    # ---------- 索引 ----------
+
+    def get(self, kind, url):
+        """返回缓存条目，没有时返回 None"""
+        with self._lock:
+            row = self.conn.execute('''
+                SELECT url, digest, content_type, etag, last_modified, fetched_at, status
+                FROM entries WHERE kind = ? AND url = ?
+            ''', (kind, url)).fetchone()
+        return CacheEntry(self, *row) if row else None
+
+    def put(self, kind, url, body, content_type='', etag=None, last_modified=None, status=200):
+        """写入（或覆盖）一个条目，body 为 bytes 或 str"""
+        if isinstance(body, str):
+            body = body.encode('utf-8')
+        digest = self.write_blob(body)
+        with self._lock, self.conn:
+            self.conn.execute('INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                              (kind, url, digest, content_type, etag, last_modified, time.time(), status))
+        return digest
+
+    def entries(self, kind):
+        """某一类型的全部条目，按地址排序"""
+        with self._lock:
+            rows = self.conn.execute('''
+                SELECT url, digest, content_type, etag, last_modified, fetched_at, status
+                FROM entries WHERE kind = ? ORDER BY url
+            ''', (kind,)).fetchall()
+        return [CacheEntry(self, *row) for row in rows]
+
+    def touch(self, kind, url):
+        """条件请求命中（304）时刷新抓取时间"""
+        with self._lock, self.conn:
+            self.conn.execute('UPDATE entries SET fetched_at = ? WHERE kind = ? AND url = ?',
+                              (time.time(), kind, url))
+
+    def require(self, kind, url):
+        """回放时取出条目，没有则抛出 :class:`CacheMiss`"""
+        entry = self.get(kind, url)
+        if entry is None:
+            raise CacheMiss(f"缓存中没有 {url} 的录制内容")
+        return entry
+
+    # ---------- 浏览器页面 ----------
+
+    def put_page(self, url, html):
+        return self.put(KIND_PAGE, url, html, content_type='text/html; charset=utf-8')
+
+    def put_records(self, url, titles):
+        body = json.dumps(list(titles), ensure_ascii=False)
+        return self.put(KIND_RECORDS, url, body, content_type='application/json; charset=utf-8')
+
+    def get_browser_snapshot(self, url):
+        """返回最近录制的浏览器结果：('page', html) 或 ('records', 标题列表)，没有时返回 None
+
+        两种都有时取较新的一条。
+        """
+        entries = [e for e in (self.get(KIND_PAGE, url), self.get(KIND_RECORDS, url)) if e is not None]
+        if not entries:
+            return None
+        entry = max(entries, key=lambda e: e.fetched_at)
+        if entry.content_type.startswith('application/json'):
+            return KIND_RECORDS, json.loads(entry.text)
+        return KIND_PAGE, entry.text
+
+    def prune(self):
+        """删除不再被任何条目引用的内容文件，返回删除的文件数"""
+        with self._lock:
+            referenced = {row[0] for row in self.conn.execute('SELECT digest FROM entries')}
+        removed = 0
+        blobs = os.path.join(self.root, 'blobs')
+        for prefix in os.listdir(blobs):
+            directory = os.path.join(blobs, prefix)
+            for name in os.listdir(directory):
+                if name.endswith('.gz') and name[:-3] not in referenced:
+                    os.remove(os.path.join(directory, name))
+                    removed += 1
+        return removed
@@ -0,0 +1,336 @@
+"""标题解析后端与站点选择器配置
+
+同一份HTML可以用不同的解析后端处理，结果与 ``BeautifulSoup(html, 'html.parser')``
+加 :func:`new_crawler.engine.parse_titles` 完全一致：
+
+* ``html.parser`` —— 原有实现，无需额外依赖
+* ``lxml``        —— BeautifulSoup + lxml，并用 SoupStrainer 只构建 <a> 节点
+* ``lxml-xpath``  —— 直接使用 lxml 与预编译的 XPath，不构建 BeautifulSoup 树
+* ``selectolax``  —— 基于 selectolax 的快速路径
+
+各解析库修复不规范HTML的方式不同：html.parser 不拆开嵌套的 <a>、不自动闭合未闭合的链接，
+``target`` 属性值区分大小写，未知实体按自己的方式解码。快速后端只在页面的链接结构足够简单时
+（没有嵌套与未闭合的链接，链接中只有成对的行内标签和常见字符引用）处理主选择器，
+其余情况与备用选择器都改用 html.parser，因此结果仍与 html.parser 一致。
+这些情况在 ``benchmarks.bench_parse`` 的一致性检查与 tests/test_parsers.py 中覆盖。
+lxml 与 selectolax 为可选依赖，未安装时对应后端不可用；各解析库都在第一次使用时才导入。
+"""
+import re
+from urllib.parse import urljoin, urlparse
+
+from .metrics import stage
+
+
+# 标题清理规则（只编译一次）
+_WHITESPACE_RE = re.compile(r'\s+')
+
+# 过短标题的长度阈值
+MIN_TITLE_LENGTH = 5
+
+
+def clean_title(text):
+    """清理标题中的特殊字符和多余空格"""
+    return _WHITESPACE_RE.sub(' ', text.strip())
+
+
+def is_valid_title(title):
+    return bool(title) and len(title) > MIN_TITLE_LENGTH
+
+
+class SiteProfile:
+    """站点的标题选择器配置
+
+    selectors 按顺序尝试，前一个选择器在整页中没有匹配时才使用下一个；
+    strain_tag 为主选择器所在的标签名，用于解析前的 SoupStrainer 预过滤；
+    feed_selector 为信息流条目的选择器，浏览器打开页面后等待它出现再开始滚动（默认为主选择器）。
+    """
+
+    def __init__(self, name, hosts, selectors, strain_tag=None, strain_attrs=None, feed_selector=None):
+        self.name = name
+        self.hosts = tuple(hosts)
+        self.selectors = tuple(selectors)
+        self.strain_tag = strain_tag
+        self.strain_attrs = strain_attrs or {}
+        self.feed_selector = feed_selector or self.selectors[0]
+        self._compiled = None
+        self._xpaths = None
+
+    @property
+    def compiled(self):
+        """预编译的 soupsieve 选择器"""
+        if self._compiled is None:
+            import soupsieve
+            self._compiled = [soupsieve.compile(sel) for sel in self.selectors]
+        return self._compiled
+
+    @property
+    def xpaths(self):
+        """预编译的 lxml XPath 表达式"""
+        if self._xpaths is None:
+            from lxml import etree
+            self._xpaths = [etree.XPath(_css_to_xpath(sel)) for sel in self.selectors]
+        return self._xpaths
+
+    def strainer(self):
+        if not self.strain_tag:
+            return None
+        from bs4 import SoupStrainer
+        return SoupStrainer(self.strain_tag, attrs=self.strain_attrs)
+
+
+# 通用选择器链（与 parse_titles 原有逻辑一致，备用选择器来自今日头条的页面结构）
+DEFAULT_SELECTORS = (
+    'a[target="_blank"]',
+    '.feed-card-article-r .title',
+    '[aria-label]',
+)
+
+# 主选择器对应的预过滤条件，与原有的 find_all('a', target='_blank') 相同（区分大小写）
+_BLANK_LINK = {'target': '_blank'}
+
+PROFILES = {
+    'toutiao': SiteProfile('toutiao', ('toutiao.com',), DEFAULT_SELECTORS,
+                           strain_tag='a', strain_attrs=_BLANK_LINK,
+                           feed_selector='[class*="feed-card"] a[target="_blank"]'),
+    'sina': SiteProfile('sina', ('news.sina.com.cn',), DEFAULT_SELECTORS,
+                        strain_tag='a', strain_attrs=_BLANK_LINK),
+    'default': SiteProfile('default', (), DEFAULT_SELECTORS,
+                           strain_tag='a', strain_attrs=_BLANK_LINK),
+}
+
+
+def profile_for_url(url):
+    """根据URL的域名选择站点配置"""
+    host = urlparse(url or '').hostname or ''
+    for profile in PROFILES.values():
+        if any(host == h or host.endswith('.' + h) for h in profile.hosts):
+            return profile
+    return PROFILES['default']
+
+
+def _css_to_xpath(selector):
+    """将本模块用到的几种简单CSS选择器转换为XPath"""
+    def cls(name):
+        return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+    if selector == 'a[target="_blank"]':
+        return '//a[@target="_blank"]'
+    if selector == '[aria-label]':
+        return '//*[@aria-label]'
+    m = re.fullmatch(r'\.([\w-]+) \.([\w-]+)', selector)
+    if m:
+        return f"//*[{cls(m.group(1))}]//*[{cls(m.group(2))}]"
+    m = re.fullmatch(r'\.([\w-]+) ([a-z]+)', selector)
+    if m:
+        return f"//*[{cls(m.group(1))}]//{m.group(2)}"
+    raise ValueError(f"不支持转换为XPath的选择器: {selector}")
+
+
+def select_items(soup, profile):
+    """在 BeautifulSoup 树上按选择器链取出 [(元素文本, href), ...]"""
+    for i, compiled in enumerate(profile.compiled):
+        if i == 0 and profile.strain_tag:
+            elements = soup.find_all(profile.strain_tag, attrs=profile.strain_attrs)
+        else:
+            elements = compiled.select(soup)
+        if elements:
+            return [(elem.get_text(), elem.get('href') or '') for elem in elements]
+    return []
+
+
+def select_texts(soup, profile):
+    """在 BeautifulSoup 树上按选择器链取出元素文本"""
+    return [text for text, _href in select_items(soup, profile)]
+
+
+def _texts_html_parser(html, profile):
+    from bs4 import BeautifulSoup
+    return select_items(BeautifulSoup(html, 'html.parser'), profile)
+
+
+# ---------- 快速后端 ----------
+#
+# 各解析库修复不规范HTML的方式不同（嵌套的 <a>、未闭合的链接、链接中的块级元素等），
+# 只有页面中的链接结构足够简单时，各库构建的链接子树才与 html.parser 相同。
+# 快速后端先用 _plain_links 检查页面，只处理主选择器；检查不通过或主选择器没有匹配时
+# 改用 html.parser 处理整页，结果因此与 html.parser 完全一致。
+
+_SKIPPED_RE = re.compile(r'<!--.*?-->|<(script|style)\b[^>]*>.*?</\1\s*>', re.S | re.I)
+# 各解析库按不同方式处理内容的元素（原样文本、外来元素、表单控件等），其中出现链接或未闭合时不走快速后端
+_SPECIAL_RE = re.compile(r'<(textarea|title|xmp|plaintext|iframe|noembed|noframes|noscript|template|'
+                         r'svg|math|select|object)\b[^>]*>(.*?)(</\1\s*>|$)', re.S | re.I)
+_LINK_TAG_RE = re.compile(r'</?a[\s/>]', re.I)
+_TAG_RE = re.compile(r'<(/?)([a-zA-Z][^\s/>]*)[^>]*>')
+# 各解析库解码方式相同的字符引用；链接文字中出现其他 & 写法（未知实体、缺少分号等）时不走快速后端
+_AMBIGUOUS_REF_RE = re.compile(r'&(?!(?:amp|lt|gt|quot|nbsp|#\d{2,7}|#x[0-9a-fA-F]{2,6});)')
+
+# 链接内可以出现的行内标签
+_INLINE_TAGS = frozenset(('span', 'b', 'i', 'em', 'strong', 'font', 'small', 'br', 'img', 'u', 's',
+                          'sub', 'sup', 'mark', 'time', 'abbr', 'cite', 'code', 'q', 'wbr'))
+
+
+def _plain_links(html):
+    """页面中的 <a> 没有嵌套、都已闭合、内部只有成对的行内标签时返回 True"""
+    html = _SKIPPED_RE.sub('', html)
+    for m in _SPECIAL_RE.finditer(html):
+        if not m.group(3) or _LINK_TAG_RE.search(m.group(2)):
+            return False
+    html = _SPECIAL_RE.sub('', html)
+    inside = False
+    open_tags = []
+    end = 0
+    for m in _TAG_RE.finditer(html):
+        if inside and _AMBIGUOUS_REF_RE.search(html, end, m.start()):
+            return False
+        end = m.end()
+        closing, name = m.group(1), m.group(2).lower()
+        if name == 'a':
+            if bool(closing) != inside or open_tags:
+                return False
+            inside = not inside
+        elif inside:
+            if name not in _INLINE_TAGS:
+                return False
+            if name in ('br', 'img', 'wbr'):
+                continue
+            if not closing:
+                open_tags.append(name)
+            elif not open_tags or open_tags.pop() != name:
+                return False
+    return not inside
+
+
+def _exact(fast):
+    """快速后端的包装：链接结构不简单或主选择器没有匹配时改用 html.parser"""
+    def extract(html, profile):
+        items = fast(html, profile) if _plain_links(html) else None
+        return items or _texts_html_parser(html, profile)
+    extract.__name__ = fast.__name__
+    extract.__doc__ = fast.__doc__
+    return extract
+
+
+def _texts_lxml(html, profile):
+    from bs4 import BeautifulSoup
+
+    # 只构建主选择器对应的节点
+    strainer = profile.strainer()
+    if strainer is None:
+        return []
+    return [(elem.get_text(), elem.get('href') or '') for elem in
+            BeautifulSoup(html, 'lxml', parse_only=strainer).find_all(
+                profile.strain_tag, attrs=profile.strain_attrs)]
+
+
+_text_xpath = None
+
+
+def _lxml_text(elem):
+    """元素文本，不含 <script>/<style> 的内容"""
+    global _text_xpath
+    if _text_xpath is None:
+        from lxml import etree
+        _text_xpath = etree.XPath('.//text()[not(ancestor::script) and not(ancestor::style)]')
+    return ''.join(_text_xpath(elem))
+
+
+def _texts_lxml_xpath(html, profile):
+    import lxml.etree
+    import lxml.html
+
+    if not html.strip():
+        return []
+    try:
+        root = lxml.html.fromstring(html)
+    except lxml.etree.ParserError:
+        # 只有注释、空白等没有元素的文档
+        return []
+    return [(_lxml_text(elem), elem.get('href') or '') for elem in profile.xpaths[0](root)]
+
+
+def _import_selectolax():
+    try:
+        from selectolax.lexbor import LexborHTMLParser as HTMLParser
+    except ImportError:
+        from selectolax.parser import HTMLParser
+    return HTMLParser
+
+
+def _texts_selectolax(html, profile):
+    tree = _import_selectolax()(html)
+    # 元素文本不含脚本与样式
+    tree.strip_tags(['script', 'style'])
+    # 属性值按原样比较（selectolax 的 target 属性选择器不区分大小写，html.parser 区分）
+    attrs = profile.strain_attrs
+    return [(elem.text(deep=True), elem.attributes.get('href') or '') for elem in tree.css(profile.selectors[0])
+            if all(elem.attributes.get(key) == value for key, value in attrs.items())]
+
+
+# 每个后端返回 [(元素文本, href), ...]
+BACKENDS = {
+    'html.parser': _texts_html_parser,
+    'lxml': _exact(_texts_lxml),
+    'lxml-xpath': _exact(_texts_lxml_xpath),
+    'selectolax': _exact(_texts_selectolax),
+}
+
+# 按速度排序的优先顺序
+_PREFERRED = ('selectolax', 'lxml-xpath', 'lxml', 'html.parser')
+
+
+def available_backends():
+    """返回当前环境中可用的解析后端"""
+    checks = {
+        'lxml': lambda: __import__('lxml'),
+        'lxml-xpath': lambda: __import__('lxml.etree'),
+        'selectolax': _import_selectolax,
+    }
+    names = []
+    for name in BACKENDS:
+        if name in checks:
+            try:
+                checks[name]()
+            except ImportError:
+                continue
+        names.append(name)
+    return names
+
+
+def best_backend():
+    """当前环境中最快的可用后端"""
+    available = available_backends()
+    for name in _PREFERRED:
+        if name in available:
+            return name
+    return 'html.parser'
+
+
+def parse_html(html, backend='html.parser', profile=None, url=None, links=None):
+    """使用指定后端从HTML中解析新闻标题
+
+    backend 可为 BACKENDS 中的名称或 ``'auto'``（选择最快的可用后端）；
+    profile 未指定时根据 url 自动选择站点配置。
+    links 为字典时写入 {标题: 文章链接}（相对链接按 url 补全，同一标题保留第一个链接）。
+    """
+    if backend == 'auto':
+        backend = best_backend()
+    try:
+        extract = BACKENDS[backend]
+    except KeyError:
+        raise ValueError(f"未知的解析后端: {backend}") from None
+    if profile is None:
+        profile = profile_for_url(url)
+    elif isinstance(profile, str):
+        profile = PROFILES[profile]
+
+    titles = []
+    with stage('parse', backend=backend) as span:
+        for text, href in extract(html, profile):
+            title = clean_title(text)
+            if is_valid_title(title):  # 过滤过短标题
+                titles.append(title)
+                if links is not None and href:
+                    links.setdefault(title, urljoin(url or '', href))
+        span.items = len(titles)
+        span.size = len(html)
+    return titles
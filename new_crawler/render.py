@@ -0,0 +1,99 @@
+"""词云渲染
+
+直接按目标显示尺寸把词云绘制为内存中的 PIL 图像，不再先渲染大图、写盘再缩小。
+渲染结果按（关键词权重, 尺寸, 样式）缓存，同样的数据重复显示时无需重新布局。
+高分辨率 PNG 只在用户保存时由 :func:`new_crawler.engine.generate_wordcloud` 导出。
+"""
+import threading
+from collections import OrderedDict
+
+from .metrics import count, stage
+
+# 中文字体路径（确保字体文件存在）
+FONT_PATH = 'simhei.ttf'
+
+# 界面中词云的显示尺寸
+DISPLAY_SIZE = (600, 400)
+
+# 词云样式
+WORDCLOUD_STYLE = {
+    'background_color': 'white',
+    'max_words': 100,
+    'colormap': 'viridis',
+    'contour_width': 1,
+    'contour_color': 'steelblue',
+}
+
+CACHE_SIZE = 16
+
+
+class RenderCache:
+    """线程安全的 LRU 缓存"""
+
+    def __init__(self, maxsize=CACHE_SIZE):
+        self.maxsize = maxsize
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        with self._lock:
+            if key in self._items:
+                self._items.move_to_end(key)
+                self.hits += 1
+                return self._items[key]
+            self.misses += 1
+            return None
+
+    def put(self, key, value):
+        with self._lock:
+            self._items[key] = value
+            self._items.move_to_end(key)
+            while len(self._items) > self.maxsize:
+                self._items.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+
+
+_cache = RenderCache()
+
+
+def _cache_key(weights, size, font_path, style):
+    # 权重保留6位小数，避免浮点误差导致同样的数据无法命中缓存
+    return (tuple(sorted((word, round(weight, 6)) for word, weight in weights.items())),
+            tuple(size), font_path, tuple(sorted(style.items())))
+
+
+def render_wordcloud(keywords, size=DISPLAY_SIZE, font_path=FONT_PATH, cache=_cache, **style):
+    """按指定尺寸渲染词云，返回 PIL 图像（没有关键词时返回 None）
+
+    keywords 可为 Keyword 列表或词语列表；返回的图像可能被缓存共享，调用方不应修改它。
+    """
+    from .keywords import keyword_weights
+    weights = keyword_weights(keywords)
+    if not weights:
+        return None
+
+    options = dict(WORDCLOUD_STYLE)
+    options.update(style)
+    key = _cache_key(weights, size, font_path, options)
+    if cache is not None:
+        image = cache.get(key)
+        if image is not None:
+            count('render_cache_hits')
+            return image
+
+    from wordcloud import WordCloud
+
+    width, height = size
+    with stage('render', width=width, height=height) as span:
+        image = WordCloud(font_path=font_path, width=width, height=height,
+                          **options).generate_from_frequencies(weights).to_image()
+        span.items = len(weights)
+
+    if cache is not None:
+        cache.put(key, image)
+    return image
@@ -0,0 +1,246 @@
+"""多站点并发爬取调度
+
+一次运行中爬取多个来源：浏览器站点与 HTTP 站点在同一个线程池中并发执行，
+受全局并发上限、浏览器并发上限以及按域名的令牌桶限速约束；失败的来源按指数退避重试。
+各来源的结果按优先级合并为一个去重的标题列表，并记录每条标题的来源。
+"""
+import heapq
+import itertools
+import random
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from urllib.parse import urlparse
+
+from .engine import CrawlCancelled, fetch_news
+from .http_engine import http_site_for_url
+from .metrics import METRICS, count
+
+
+class Source:
+    """一个爬取来源
+
+    name 默认为主机名，用作结果、统计与指标的键，同一次运行中的来源名称必须唯一
+    （同一站点的多个频道需分别指定 name）；priority 越大越先调度，合并结果时同一标题归属于优先级更高的来源；
+    options 会原样传给抓取函数（如 adaptive、incremental 等）；
+    interval 为持续爬取模式下两次爬取之间的秒数（None 时使用守护进程的默认间隔）。
+    """
+
+    def __init__(self, url, max_pages=3, name=None, priority=0, engine='auto', options=None,
+                 interval=None):
+        self.url = url
+        self.max_pages = max_pages
+        self.name = name or urlparse(url).hostname or url
+        self.priority = priority
+        self.engine = engine
+        self.options = options or {}
+        self.interval = interval
+
+    @property
+    def domain(self):
+        return urlparse(self.url).hostname or ''
+
+    @property
+    def uses_browser(self):
+        if self.engine == 'auto':
+            return http_site_for_url(self.url) is None
+        return self.engine == 'browser'
+
+    @classmethod
+    def from_dict(cls, data):
+        """由配置字典创建，键名：url、pages、name、priority、engine、options、interval"""
+        return cls(data['url'], max_pages=data.get('pages', 3), name=data.get('name'),
+                   priority=data.get('priority', 0), engine=data.get('engine', 'auto'),
+                   options=data.get('options'), interval=data.get('interval'))
+
+
+def check_unique_names(sources):
+    """来源名称重复时抛出 ValueError（结果与统计按名称区分来源）"""
+    seen = {}
+    for source in sources:
+        if source.name in seen:
+            raise ValueError(f"来源名称重复：{source.name}（{seen[source.name]} 与 {source.url}），"
+                             f"请为同一站点的多个来源分别指定 name")
+        seen[source.name] = source.url
+
+
+class TokenBucket:
+    """令牌桶限速：每秒补充 rate 个令牌，最多积累 capacity 个"""
+
+    def __init__(self, rate, capacity=1):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def acquire(self, cancel_event=None):
+        """取出一个令牌，不足时等待"""
+        while True:
+            with self._lock:
+                self._refill()
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait_time = (1 - self.tokens) / self.rate
+            if cancel_event is not None:
+                if cancel_event.wait(wait_time):
+                    raise CrawlCancelled("爬取已取消")
+            else:
+                time.sleep(wait_time)
+
+
+class CrawlScheduler:
+    """多来源并发爬取调度器
+
+    max_workers 为全局并发上限；browser_workers 限制同时使用浏览器的任务数
+    （通常等于浏览器池大小）；domain_rate/domain_burst 为每个域名的令牌桶参数；
+    retries 为失败后的重试次数，第 n 次重试前等待 backoff * 2**(n-1) 秒（带随机抖动）。
+    """
+
+    def __init__(self, fetch=fetch_news, max_workers=4, browser_workers=1, domain_rate=1.0,
+                 domain_burst=1, retries=2, backoff=2.0, fetch_options=None):
+        self.fetch = fetch
+        self.max_workers = max_workers
+        self.browser_workers = browser_workers
+        self.domain_rate = domain_rate
+        self.domain_burst = domain_burst
+        self.retries = retries
+        self.backoff = backoff
+        self.fetch_options = fetch_options or {}
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def _bucket(self, domain):
+        with self._lock:
+            if domain not in self._buckets:
+                self._buckets[domain] = TokenBucket(self.domain_rate, self.domain_burst)
+            return self._buckets[domain]
+
+    def _run_source(self, source, progress, cancel_event):
+        self._bucket(source.domain).acquire(cancel_event)
+
+        def source_progress(stage, message):
+            if progress is not None:
+                progress(stage, f"[{source.name}] {message}")
+
+        options = dict(self.fetch_options)
+        options.update(source.options)
+        start = time.perf_counter()
+        # 本线程内的各阶段指标都归属到该来源
+        with METRICS.bind_source(source.name):
+            titles = self.fetch(source.url, source.max_pages, progress=source_progress,
+                                cancel_event=cancel_event, engine=source.engine, **options)
+        return titles, time.perf_counter() - start
+
+    def run(self, sources, progress=None, cancel_event=None):
+        """并发爬取所有来源，返回合并后的结果字典
+
+        返回值包含 ``titles``（去重后的标题）、``records``（带来源的标题记录）
+        以及 ``sources``（每个来源的条数、耗时、尝试次数和错误信息）。
+        """
+        sources = [s if isinstance(s, Source) else Source.from_dict(s) for s in sources]
+        check_unique_names(sources)
+        counter = itertools.count()
+        # 堆元素：(可执行时间, -优先级, 序号, 来源, 已尝试次数)
+        pending = [(0.0, -s.priority, next(counter), s, 0) for s in sources]
+        heapq.heapify(pending)
+
+        results = {}
+        stats = {s.name: {'url': s.url, 'count': 0, 'elapsed': 0.0, 'attempts': 0, 'error': None}
+                 for s in sources}
+        running = {}
+        browsers_in_use = 0
+        started = time.perf_counter()
+
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='crawl') as executor:
+            while pending or running:
+                if cancel_event is not None and cancel_event.is_set():
+                    raise CrawlCancelled("爬取已取消")
+                now = time.monotonic()
+
+                # 提交所有已到执行时间且有空闲名额的任务（浏览器任务额外受浏览器数限制）
+                deferred = []
+                while pending and len(running) < self.max_workers:
+                    ready_at, neg_priority, seq, source, attempt = heapq.heappop(pending)
+                    if ready_at > now or (source.uses_browser and browsers_in_use >= self.browser_workers):
+                        deferred.append((ready_at, neg_priority, seq, source, attempt))
+                        continue
+                    if source.uses_browser:
+                        browsers_in_use += 1
+                    stats[source.name]['attempts'] = attempt + 1
+                    future = executor.submit(self._run_source, source, progress, cancel_event)
+                    running[future] = (source, attempt)
+                for item in deferred:
+                    heapq.heappush(pending, item)
+
+                if not running:
+                    # 只剩等待退避的任务
+                    delay = max(0.0, pending[0][0] - time.monotonic())
+                    if cancel_event is not None:
+                        cancel_event.wait(delay)
+                    else:
+                        time.sleep(delay)
+                    continue
+
+                # 等待任一任务完成，或下一个退避任务到期
+                timeout = None
+                waiting = [item[0] for item in pending if item[0] > now]
+                if waiting:
+                    timeout = max(0.05, min(waiting) - time.monotonic())
+                done, _ = wait(running, timeout=timeout, return_when=FIRST_COMPLETED)
+
+                for future in done:
+                    source, attempt = running.pop(future)
+                    if source.uses_browser:
+                        browsers_in_use -= 1
+                    try:
+                        titles, elapsed = future.result()
+                    except CrawlCancelled:
+                        raise
+                    except Exception as e:
+                        stats[source.name]['error'] = str(e)
+                        count('source_errors', source=source.name)
+                        if attempt < self.retries:
+                            delay = self.backoff * (2 ** attempt) * random.uniform(0.8, 1.2)
+                            print(f"[{source.name}] 爬取失败: {e}，{delay:.1f}秒后重试")
+                            heapq.heappush(pending, (time.monotonic() + delay, -source.priority,
+                                                     next(counter), source, attempt + 1))
+                        else:
+                            print(f"[{source.name}] 爬取失败，已放弃: {e}")
+                        continue
+                    results[source.name] = titles
+                    stats[source.name].update(count=len(titles), elapsed=elapsed, error=None)
+                    count('source_titles', len(titles), source=source.name)
+                    if progress is not None:
+                        progress('source', f"[{source.name}] 完成，{len(titles)}条标题")
+
+        merged = merge_results(sources, results)
+        merged['sources'] = stats
+        merged['elapsed'] = time.perf_counter() - started
+        return merged
+
+
+def merge_results(sources, results):
+    """按优先级合并各来源的标题，去重并记录来源"""
+    titles = []
+    records = []
+    seen = set()
+    for source in sorted(sources, key=lambda s: -s.priority):
+        for title in results.get(source.name, ()):
+            if title in seen:
+                continue
+            seen.add(title)
+            titles.append(title)
+            records.append({'title': title, 'source': source.name, 'url': source.url})
+    return {'titles': titles, 'records': records}
+
+
+def crawl_sources(sources, progress=None, cancel_event=None, **scheduler_options):
+    """便捷接口：用默认调度参数并发爬取多个来源"""
+    return CrawlScheduler(**scheduler_options).run(sources, progress=progress, cancel_event=cancel_event)
@@ -0,0 +1,329 @@
+"""爬取历史存储
+
+每次爬取（run）、每条标题的来源与首次/最近出现时间、标题的关键词都写入同一个 SQLite 库
+（WAL 模式），并为标题建立 FTS5 全文索引，用于按时间窗口统计关键词和全文检索，
+不需要重新爬取或重新分词。
+
+用法::
+
+    with HistoryStore('history.db', tokenize=engine.tokenize) as store:
+        store.record_run(records, label=url)
+        store.keyword_counts(since=parse_time('7d'))
+        store.search('人工智能')
+"""
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+
+from .dictionary import load_dictionary
+
+# 每批写入/查询的行数（SQLite 单条语句的参数个数有上限）
+BATCH_SIZE = 500
+
+_RELATIVE_RE = re.compile(r'^(\d+(?:\.\d+)?)\s*([smhdw])$')
+_UNITS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400, 'w': 7 * 86400}
+
+
+def parse_time(value, now=None):
+    """解析时间参数：'7d'、'12h' 等表示距今多久，也可以是 ISO 日期（2024-05-01 / 2024-05-01T08:00）"""
+    if value is None or isinstance(value, (int, float)):
+        return value
+    value = value.strip()
+    match = _RELATIVE_RE.match(value)
+    if match:
+        return (now if now is not None else time.time()) - float(match.group(1)) * _UNITS[match.group(2)]
+    return datetime.fromisoformat(value).timestamp()
+
+
+def search_tokens(text):
+    """全文索引使用的分词：搜索引擎模式，长词同时拆出其中的短词"""
+    load_dictionary()
+    import jieba
+    return [w for w in (w.strip() for w in jieba.cut_for_search(text)) if w]
+
+
+def _title_key(title):
+    return hashlib.blake2b(title.encode('utf-8'), digest_size=16).digest()
+
+
+def _chunks(items, size=BATCH_SIZE):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def _default_tokenize(titles):
+    from .keywords import tokenize_title
+    return [tokenize_title(title) for title in titles]
+
+
+class HistoryStore:
+    """爬取历史库
+
+    tokenize 为批量分词函数（标题列表 → 词语元组列表），通常传入 ``KeywordEngine.tokenize``
+    以复用分词缓存；只有第一次出现的标题需要分词。
+    """
+
+    def __init__(self, path='history.db', tokenize=None):
+        self.path = path
+        self.tokenize = tokenize or _default_tokenize
+        if path != ':memory:' and os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        # 图形界面在工作线程中写入，用锁串行化对连接的访问
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.execute('PRAGMA foreign_keys=ON')
+        self._lock = threading.Lock()
+        self._create_tables()
+
+    def _create_tables(self):
+        self.conn.executescript('''
+            CREATE TABLE IF NOT EXISTS runs (
+                id INTEGER PRIMARY KEY,
+                label TEXT,
+                started_at REAL NOT NULL,
+                finished_at REAL,
+                title_count INTEGER NOT NULL DEFAULT 0,
+                new_count INTEGER NOT NULL DEFAULT 0
+            );
+            CREATE INDEX IF NOT EXISTS idx_runs_started_at ON runs (started_at);
+
+            CREATE TABLE IF NOT EXISTS titles (
+                id INTEGER PRIMARY KEY,
+                key BLOB NOT NULL UNIQUE,
+                title TEXT NOT NULL,
+                source TEXT,
+                url TEXT,
+                first_seen REAL NOT NULL,
+                last_seen REAL NOT NULL,
+                seen_count INTEGER NOT NULL DEFAULT 1
+            );
+            CREATE INDEX IF NOT EXISTS idx_titles_first_seen ON titles (first_seen);
+            CREATE INDEX IF NOT EXISTS idx_titles_last_seen ON titles (last_seen);
+            CREATE INDEX IF NOT EXISTS idx_titles_source ON titles (source, last_seen);
+
+            CREATE TABLE IF NOT EXISTS sightings (
+                title_id INTEGER NOT NULL REFERENCES titles (id),
+                run_id INTEGER NOT NULL REFERENCES runs (id),
+                seen_at REAL NOT NULL,
+                PRIMARY KEY (title_id, run_id)
+            ) WITHOUT ROWID;
+            CREATE INDEX IF NOT EXISTS idx_sightings_seen_at ON sightings (seen_at, title_id);
+            CREATE INDEX IF NOT EXISTS idx_sightings_run ON sightings (run_id);
+
+            CREATE TABLE IF NOT EXISTS title_keywords (
+                title_id INTEGER NOT NULL REFERENCES titles (id),
+                word TEXT NOT NULL,
+                count INTEGER NOT NULL,
+                PRIMARY KEY (title_id, word)
+            ) WITHOUT ROWID;
+            CREATE INDEX IF NOT EXISTS idx_title_keywords_word ON title_keywords (word);
+
+            -- 无内容的全文索引：rowid 即 titles.id，只保存分词后的词项
+            CREATE VIRTUAL TABLE IF NOT EXISTS titles_fts USING fts5 (tokens, content='');
+        ''')
+        self.conn.commit()
+
+    def close(self):
+        with self._lock:
+            self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def __len__(self):
+        with self._lock:
+            return self.conn.execute('SELECT COUNT(*) FROM titles').fetchone()[0]
+
+    # ---------- 写入 ----------
+
+    def record_run(self, records, label=None, started_at=None):
+        """写入一次爬取的全部记录（[{'title', 'source', 'url'}]），返回 run id
+
+        已知标题只更新最近出现时间与次数；新标题分词后写入关键词表和全文索引。
+        整次写入在一个事务中完成。started_at 为本次爬取的时间（默认当前时间），可用于补录旧数据。
+        """
+        clock = time.time()
+        now = started_at or clock
+
+        # 同一批次内按标题去重，保留第一次出现的来源
+        batch = {}
+        for record in records:
+            title = record['title']
+            key = _title_key(title)
+            if key not in batch:
+                batch[key] = (title, record.get('source'), record.get('url'))
+        keys = list(batch)
+
+        with self._lock, self.conn:
+            run_id = self.conn.execute('INSERT INTO runs (label, started_at) VALUES (?, ?)',
+                                       (label, now)).lastrowid
+
+            known = set()
+            for chunk in _chunks(keys):
+                placeholders = ', '.join('?' * len(chunk))
+                known.update(row[0] for row in self.conn.execute(
+                    f'SELECT key FROM titles WHERE key IN ({placeholders})', chunk))
+
+            for chunk in _chunks(keys):
+                self.conn.executemany('''
+                    INSERT INTO titles (key, title, source, url, first_seen, last_seen)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                    ON CONFLICT (key) DO UPDATE SET first_seen = MIN(first_seen, excluded.first_seen),
+                                                    last_seen = MAX(last_seen, excluded.last_seen),
+                                                    seen_count = seen_count + 1
+                ''', [(key,) + batch[key] + (now, now) for key in chunk])
+
+            ids = {}
+            for chunk in _chunks(keys):
+                placeholders = ', '.join('?' * len(chunk))
+                ids.update(self.conn.execute(
+                    f'SELECT key, id FROM titles WHERE key IN ({placeholders})', chunk))
+
+            for chunk in _chunks(keys):
+                self.conn.executemany('INSERT OR IGNORE INTO sightings VALUES (?, ?, ?)',
+                                      [(ids[key], run_id, now) for key in chunk])
+
+            fresh = [key for key in keys if key not in known]
+            for chunk in _chunks(fresh):
+                titles = [batch[key][0] for key in chunk]
+                token_lists = self.tokenize(titles)
+                self.conn.executemany('INSERT OR IGNORE INTO title_keywords VALUES (?, ?, ?)', [
+                    (ids[key], word, count)
+                    for key, tokens in zip(chunk, token_lists)
+                    for word, count in Counter(tokens).items()
+                ])
+                self.conn.executemany('INSERT INTO titles_fts (rowid, tokens) VALUES (?, ?)', [
+                    (ids[key], ' '.join(search_tokens(title))) for key, title in zip(chunk, titles)
+                ])
+
+            self.conn.execute('UPDATE runs SET finished_at = ?, title_count = ?, new_count = ? WHERE id = ?',
+                              (now + time.time() - clock, len(keys), len(fresh), run_id))
+        return run_id
+
+    # ---------- 查询 ----------
+
+    @staticmethod
+    def _window(column, since, until, params):
+        clauses = []
+        if since is not None:
+            clauses.append(f'{column} >= ?')
+            params.append(since)
+        if until is not None:
+            clauses.append(f'{column} < ?')
+            params.append(until)
+        return clauses
+
+    def keyword_counts(self, since=None, until=None, top_n=20, source=None):
+        """统计时间窗口内出现过的标题的关键词，返回 [(词语, 出现次数, 标题数)]，按出现次数降序"""
+        params = []
+        clauses = self._window('s.seen_at', since, until, params)
+        if source is not None:
+            clauses.append('t.source = ?')
+            params.append(source)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ''
+        params.append(-1 if top_n is None else top_n)
+        with self._lock:
+            return self.conn.execute(f'''
+                WITH seen AS (
+                    SELECT DISTINCT s.title_id FROM sightings s
+                    JOIN titles t ON t.id = s.title_id
+                    {where}
+                )
+                SELECT k.word, SUM(k.count) AS occurrences, COUNT(*) AS titles
+                FROM seen w JOIN title_keywords k ON k.title_id = w.title_id
+                GROUP BY k.word
+                ORDER BY occurrences DESC, titles DESC, k.word
+                LIMIT ?
+            ''', params).fetchall()
+
+    def search(self, query, limit=50, since=None, until=None):
+        """全文检索标题，返回按相关度排序的 [{'title', 'source', 'url', 'first_seen', 'last_seen', 'seen_count'}]"""
+        terms = search_tokens(query)
+        if not terms:
+            return []
+        match = ' '.join('"{}"'.format(term.replace('"', '""')) for term in terms)
+        params = [match]
+        clauses = self._window('t.last_seen', since, None, params)
+        clauses += self._window('t.first_seen', None, until, params)
+        where = ''.join(f' AND {clause}' for clause in clauses)
+        params.append(limit)
+        with self._lock:
+            rows = self.conn.execute(f'''
+                SELECT t.title, t.source, t.url, t.first_seen, t.last_seen, t.seen_count
+                FROM titles_fts f JOIN titles t ON t.id = f.rowid
+                WHERE titles_fts MATCH ?{where}
+                ORDER BY f.rank
+                LIMIT ?
+            ''', params).fetchall()
+        columns = ('title', 'source', 'url', 'first_seen', 'last_seen', 'seen_count')
+        return [dict(zip(columns, row)) for row in rows]
+
+    def titles_between(self, since=None, until=None, source=None):
+        """返回时间窗口内出现过的标题（按首次出现时间排序）"""
+        params = []
+        clauses = self._window('seen_at', since, until, params)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ''
+        source_clause = ''
+        if source is not None:
+            source_clause = ' AND source = ?'
+            params.append(source)
+        with self._lock:
+            return [row[0] for row in self.conn.execute(f'''
+                SELECT title FROM titles
+                WHERE id IN (SELECT title_id FROM sightings {where}){source_clause}
+                ORDER BY first_seen, id
+            ''', params)]
+
+    def _records_filter(self, since, until, source, params):
+        """时间窗口与来源的过滤条件（作用于 titles 表）"""
+        clauses = []
+        window = self._window('seen_at', since, until, params)
+        if window:
+            clauses.append(f"id IN (SELECT title_id FROM sightings WHERE {' AND '.join(window)})")
+        if source is not None:
+            clauses.append('source = ?')
+            params.append(source)
+        return clauses
+
+    def count_records(self, since=None, until=None, source=None):
+        params = []
+        clauses = self._records_filter(since, until, source, params)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ''
+        with self._lock:
+            return self.conn.execute(f'SELECT COUNT(*) FROM titles {where}', params).fetchone()[0]
+
+    def iter_records(self, since=None, until=None, source=None, chunk_size=BATCH_SIZE):
+        """按主键分页读取标题记录，每次产出一批
+        (id, title, source, url, first_seen, last_seen, seen_count) 元组，内存占用与总行数无关"""
+        last_id = 0
+        while True:
+            params = [last_id]
+            clauses = ['id > ?'] + self._records_filter(since, until, source, params)
+            params.append(chunk_size)
+            with self._lock:
+                rows = self.conn.execute(f'''
+                    SELECT id, title, source, url, first_seen, last_seen, seen_count FROM titles
+                    WHERE {' AND '.join(clauses)}
+                    ORDER BY id LIMIT ?
+                ''', params).fetchall()
+            if not rows:
+                return
+            yield rows
+            last_id = rows[-1][0]
+
+    def runs(self, limit=20):
+        """最近的爬取记录：[(id, label, started_at, finished_at, title_count, new_count)]"""
+        with self._lock:
+            return self.conn.execute('''
+                SELECT id, label, started_at, finished_at, title_count, new_count
+                FROM runs ORDER BY started_at DESC, id DESC LIMIT ?
+            ''', (limit,)).fetchall()
@@ -0,0 +1,277 @@
+"""关键词热度趋势
+
+按多个滑动时间窗口（默认 1 小时、24 小时、7 天）统计关键词在新标题中的出现次数：
+每个窗口由若干时间桶组成，每个桶是一个 Count-Min Sketch，窗口总计数随桶的进入与过期
+增量维护，内存占用固定；每个窗口另外保留有限数量的高频候选词（heavy hitters）用于排名。
+上升倍数与突发分数由短窗口相对基线窗口（去掉短窗口部分）的出现比例计算。
+更新只与本批新标题有关，不需要重新扫描历史数据；新标题的词频直接由词语编号语料
+（见 :mod:`new_crawler.corpus`）按编号计数，每个词语的 sketch 列号随词表缓存。
+
+用法::
+
+    trends = TrendEngine()
+    trends.observe(titles, keyword_engine)          # 只统计第一次出现的标题
+    trends.trending('1h', baseline='24h', top_n=20)
+"""
+import hashlib
+import heapq
+import json
+import math
+import os
+import time
+from collections import Counter, namedtuple
+from functools import lru_cache
+
+import numpy as np
+
+# (名称, 窗口长度秒数, 桶数)
+DEFAULT_WINDOWS = (
+    ('1h', 3600, 12),
+    ('24h', 86400, 24),
+    ('7d', 7 * 86400, 7),
+)
+
+SKETCH_WIDTH = 2048
+SKETCH_DEPTH = 4
+# 每个窗口保留的高频候选词数量
+HEAVY_HITTERS = 2000
+# 出现比例的平滑项，避免基线为 0 时上升倍数无穷大
+SMOOTHING = 1e-3
+
+Trend = namedtuple('Trend', ['word', 'count', 'baseline', 'rise', 'burst'])
+Trend.__doc__ = """趋势：count 短窗口内出现次数，baseline 按基线比例折算的期望次数，
+rise 出现比例的上升倍数，burst 突发分数（超出期望的标准差倍数）"""
+
+
+@lru_cache(maxsize=200000)
+def _sketch_indices(word, depth=SKETCH_DEPTH, width=SKETCH_WIDTH):
+    digest = hashlib.blake2b(word.encode('utf-8'), digest_size=4 * depth).digest()
+    return np.frombuffer(digest, dtype=np.uint32) % width
+
+
+class SlidingWindow:
+    """由时间桶组成的滑动窗口计数器（每个桶一个 Count-Min Sketch）"""
+
+    def __init__(self, name, span, buckets, width=SKETCH_WIDTH, depth=SKETCH_DEPTH,
+                 capacity=HEAVY_HITTERS):
+        self.name = name
+        self.span = span
+        self.buckets = buckets
+        self.bucket_span = span / buckets
+        self.width = width
+        self.depth = depth
+        self.capacity = capacity
+
+        self.sketches = np.zeros((buckets, depth, width), dtype=np.int32)
+        self.total = np.zeros((depth, width), dtype=np.int64)
+        self.bucket_ids = np.full(buckets, -1, dtype=np.int64)
+        self.bucket_titles = np.zeros(buckets, dtype=np.int64)
+        self.candidates = {}
+        self._rows = np.arange(depth)
+
+    @property
+    def title_count(self):
+        return int(self.bucket_titles.sum())
+
+    def advance(self, timestamp):
+        """让早于窗口起点的桶过期，返回当前时间对应的桶编号"""
+        current = int(timestamp // self.bucket_span)
+        expired = (self.bucket_ids >= 0) & (self.bucket_ids <= current - self.buckets)
+        for slot in np.nonzero(expired)[0]:
+            self.total -= self.sketches[slot]
+            self.sketches[slot] = 0
+            self.bucket_titles[slot] = 0
+            self.bucket_ids[slot] = -1
+        return current
+
+    def add(self, counts, title_count, timestamp):
+        """累加一批词频（{词语: 次数}）"""
+        words = list(counts)
+        columns = (np.stack([_sketch_indices(w, self.depth, self.width) for w in words]) if words
+                   else np.zeros((0, self.depth), dtype=np.uint32))
+        values = np.fromiter((counts[w] for w in words), dtype=np.int64, count=len(words))
+        self.add_columns(words, columns, values, title_count, timestamp)
+
+    def add_columns(self, words, columns, values, title_count, timestamp):
+        """累加一批词频：words 词语列表，columns 对应的 sketch 列号 (n, depth)，values 次数"""
+        current = self.advance(timestamp)
+        slot = current % self.buckets
+        if self.bucket_ids[slot] != current:
+            self.bucket_ids[slot] = current
+        self.bucket_titles[slot] += title_count
+        if not len(words):
+            return
+
+        rows = np.broadcast_to(self._rows, columns.shape)
+        np.add.at(self.sketches[slot], (rows, columns), values[:, None].astype(np.int32))
+        np.add.at(self.total, (rows, columns), values[:, None])
+
+        # 只有本批出现的词才可能改变排名，候选集超出容量时淘汰估计值最小的词
+        estimates = self.total[rows, columns].min(axis=1)
+        self.candidates.update(zip(words, estimates.tolist()))
+        if len(self.candidates) > self.capacity * 2:
+            self._prune()
+
+    def _prune(self):
+        refreshed = {word: self.estimate(word) for word in self.candidates}
+        self.candidates = dict(heapq.nlargest(self.capacity, refreshed.items(), key=lambda item: item[1]))
+
+    def estimate(self, word):
+        """窗口内的出现次数估计（Count-Min：只会高估，不会低估）"""
+        return int(self.total[self._rows, _sketch_indices(word, self.depth, self.width)].min())
+
+    def top(self, top_n=20, timestamp=None):
+        """窗口内出现次数最多的词：[(词语, 次数)]"""
+        self.advance(time.time() if timestamp is None else timestamp)
+        estimates = ((word, self.estimate(word)) for word in self.candidates)
+        return [item for item in heapq.nlargest(top_n, estimates, key=lambda item: item[1]) if item[1] > 0]
+
+    def state(self):
+        return {
+            'sketches': self.sketches, 'bucket_ids': self.bucket_ids,
+            'bucket_titles': self.bucket_titles,
+        }
+
+    def load_state(self, arrays, candidates):
+        self.sketches = arrays['sketches'].astype(np.int32)
+        self.bucket_ids = arrays['bucket_ids'].astype(np.int64)
+        self.bucket_titles = arrays['bucket_titles'].astype(np.int64)
+        self.total = self.sketches.sum(axis=0, dtype=np.int64)
+        self.candidates = dict(candidates)
+
+
+class TrendEngine:
+    """多窗口关键词趋势引擎
+
+    observe 只统计第一次出现的标题（按标题原文判断，最长窗口之外的记录会被清理），
+    因此同一条新闻在多次爬取中重复出现不会抬高热度。
+    """
+
+    def __init__(self, windows=DEFAULT_WINDOWS, width=SKETCH_WIDTH, depth=SKETCH_DEPTH,
+                 capacity=HEAVY_HITTERS):
+        self.windows = {name: SlidingWindow(name, span, buckets, width, depth, capacity)
+                        for name, span, buckets in windows}
+        self.max_span = max(span for _, span, _ in windows)
+        self.width = width
+        self.depth = depth
+        self.seen = {}
+
+    def add(self, counts, title_count, timestamp=None):
+        """直接累加一批词频"""
+        timestamp = time.time() if timestamp is None else timestamp
+        for window in self.windows.values():
+            window.add(counts, title_count, timestamp)
+
+    def add_counts(self, vocabulary, counts, title_count, timestamp=None):
+        """累加一批按词表编号索引的词频数组（见 :class:`~new_crawler.corpus.Vocabulary`）"""
+        timestamp = time.time() if timestamp is None else timestamp
+        ids = np.flatnonzero(counts)
+        columns = vocabulary.derive(('sketch', self.depth, self.width),
+                                    lambda word: _sketch_indices(word, self.depth, self.width),
+                                    np.uint32, (self.depth,))[ids]
+        words = vocabulary.decode(ids)
+        values = counts[ids].astype(np.int64)
+        for window in self.windows.values():
+            window.add_columns(words, columns, values, title_count, timestamp)
+
+    def observe(self, titles, keyword_engine, timestamp=None):
+        """统计一批标题中以前没见过的部分，返回新标题数"""
+        timestamp = time.time() if timestamp is None else timestamp
+        fresh = []
+        for title in titles:
+            if title not in self.seen:
+                fresh.append(title)
+            self.seen[title] = timestamp
+        self._forget(timestamp)
+        if fresh:
+            tf, _ = keyword_engine.counts(keyword_engine.corpus(fresh))
+            self.add_counts(keyword_engine.vocabulary, tf, len(fresh), timestamp)
+        else:
+            self.add(Counter(), 0, timestamp)
+        return len(fresh)
+
+    def _forget(self, timestamp):
+        if len(self.seen) < 10000:
+            return
+        cutoff = timestamp - self.max_span
+        self.seen = {title: ts for title, ts in self.seen.items() if ts >= cutoff}
+
+    def counts(self, word):
+        """各窗口内的出现次数 {窗口名: 次数}"""
+        return {name: window.estimate(word) for name, window in self.windows.items()}
+
+    def trending(self, window='1h', baseline='24h', top_n=20, min_count=2, timestamp=None):
+        """按突发分数排列短窗口内正在升温的关键词，返回 Trend 列表
+
+        基线为长窗口去掉短窗口后的部分：期望次数 = 短窗口标题数 × 基线中该词的出现比例。
+        """
+        timestamp = time.time() if timestamp is None else timestamp
+        short, long = self.windows[window], self.windows[baseline]
+        short.advance(timestamp)
+        long.advance(timestamp)
+        short_titles = short.title_count
+        base_titles = max(long.title_count - short_titles, 0)
+        if not short_titles:
+            return []
+
+        trends = []
+        for word, count in short.top(len(short.candidates), timestamp):
+            if count < min_count:
+                continue
+            base_count = max(long.estimate(word) - count, 0)
+            base_rate = (base_count / base_titles) if base_titles else 0.0
+            expected = base_rate * short_titles
+            rise = (count / short_titles + SMOOTHING) / (base_rate + SMOOTHING)
+            burst = (count - expected) / math.sqrt(expected + 1)
+            trends.append(Trend(word, count, expected, rise, burst))
+        trends.sort(key=lambda t: (-t.burst, -t.count, t.word))
+        return trends[:top_n]
+
+    def summary(self, top_n=20, timestamp=None):
+        """趋势表：按 1h/24h 突发分数排序，附带各窗口计数，返回 [dict]"""
+        names = list(self.windows)
+        rows = []
+        for trend in self.trending(names[0], names[1] if len(names) > 1 else names[0],
+                                   top_n=top_n, timestamp=timestamp):
+            row = {'word': trend.word}
+            row.update(self.counts(trend.word))
+            row.update(baseline=trend.baseline, rise=trend.rise, burst=trend.burst)
+            rows.append(row)
+        return rows
+
+    # ---------- 持久化 ----------
+
+    def save(self, path):
+        """保存为 .npz 文件（桶计数、候选词与已见标题）"""
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        arrays = {}
+        for name, window in self.windows.items():
+            for key, value in window.state().items():
+                arrays[f"{name}.{key}"] = value
+        meta = {
+            'candidates': {name: window.candidates for name, window in self.windows.items()},
+            'seen': self.seen,
+        }
+        arrays['meta'] = np.frombuffer(json.dumps(meta, ensure_ascii=False).encode('utf-8'), dtype=np.uint8)
+        tmp_path = path + '.tmp.npz'
+        np.savez_compressed(tmp_path, **arrays)
+        os.replace(tmp_path, path)
+
+    def load(self, path):
+        """从 save 保存的文件恢复状态（窗口配置需一致）"""
+        with np.load(path) as data:
+            meta = json.loads(data['meta'].tobytes().decode('utf-8'))
+            for name, window in self.windows.items():
+                arrays = {key: data[f"{name}.{key}"] for key in ('sketches', 'bucket_ids', 'bucket_titles')}
+                window.load_state(arrays, meta['candidates'].get(name, {}))
+        self.seen = meta['seen']
+        return self
+
+    @classmethod
+    def open(cls, path, **options):
+        """文件存在时加载，否则创建新的引擎"""
+        engine = cls(**options)
+        if path and os.path.exists(path):
+            engine.load(path)
+        return engine
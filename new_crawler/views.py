@@ -0,0 +1,348 @@
+"""结果标签页视图
+
+每个标签页的控件（词云标签、matplotlib 画布、表格）只在第一次显示时创建一次，
+之后的爬取只更新数据与图元，不再销毁重建控件；数据更新后只在标签页可见时才重绘。
+图表直接使用 :class:`matplotlib.figure.Figure`，不经过 pyplot，避免图形对象在会话中累积。
+"""
+import re
+import tkinter as tk
+from tkinter import ttk
+
+# 时间窗口名称的单位 → 表头文字（如 1h → 1小时）
+_WINDOW_UNITS = {'m': '分钟', 'h': '小时', 'd': '天', 'w': '周'}
+_WINDOW_RE = re.compile(r'^(\d+)([mhdw])$')
+
+
+def window_label(name):
+    """时间窗口名称 → 表头文字，无法识别的名称原样返回"""
+    match = _WINDOW_RE.match(name)
+    return f"{match.group(1)}{_WINDOW_UNITS[match.group(2)]}" if match else name
+
+
+class ResultView:
+    """标签页视图基类：set_data 只记录数据，refresh 在可见时按需构建控件并重绘"""
+
+    def __init__(self, parent):
+        self.frame = ttk.Frame(parent)
+        self.frame.pack(fill=tk.BOTH, expand=True)
+        self.results = None
+        self.built = False
+        self.dirty = False
+
+    def set_data(self, results):
+        self.results = results
+        self.dirty = True
+
+    def refresh(self):
+        if not self.built:
+            self.build()
+            self.built = True
+        if self.dirty:
+            self.dirty = False
+            self.render()
+
+    def build(self):
+        raise NotImplementedError
+
+    def render(self):
+        raise NotImplementedError
+
+    @property
+    def keywords(self):
+        return (self.results or {}).get('keywords') or []
+
+
+class WordcloudView(ResultView):
+    """词云图：复用同一个标签控件，只替换图像"""
+
+    def build(self):
+        self.image_label = ttk.Label(self.frame, anchor=tk.CENTER)
+        self.image_label.pack(fill=tk.BOTH, expand=True)
+        self.photo = None
+
+    def render(self):
+        from PIL import ImageTk
+
+        img = (self.results or {}).get('wordcloud_image')
+        if img is None:
+            self.photo = None
+            self.image_label.configure(image='', text="没有关键词可生成词云")
+            return
+        try:
+            self.photo = ImageTk.PhotoImage(img)  # 保持引用
+            self.image_label.configure(image=self.photo, text='')
+        except Exception as e:
+            self.image_label.configure(image='', text=f"无法显示词云图: {str(e)}")
+
+
+class PieChartView(ResultView):
+    """热点词汇饼图：Figure 与画布只创建一次，每次只重绘坐标轴内容"""
+
+    max_slices = 20
+
+    def build(self):
+        # matplotlib 只在第一次显示饼图时导入
+        from .engine import configure_matplotlib
+        configure_matplotlib()
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+        from matplotlib.figure import Figure
+
+        self.figure = Figure(figsize=(6, 4))
+        self.ax = self.figure.add_subplot(111)
+        self.canvas = FigureCanvasTkAgg(self.figure, master=self.frame)
+        self.canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+
+    def render(self):
+        self.ax.clear()
+        keywords = self.keywords[:self.max_slices]
+        if not keywords:
+            self.ax.text(0.5, 0.5, "没有关键词数据", ha='center', va='center')
+            self.ax.axis('off')
+        else:
+            # 按真实出现次数绘制，长标签缩短显示
+            labels = [kw.word[:6] + '...' if len(kw.word) > 6 else kw.word for kw in keywords]
+            sizes = [kw.count for kw in keywords]
+            self.ax.pie(sizes, labels=labels, autopct='%1.1f%%', startangle=90)
+            self.ax.axis('equal')  # 确保饼图是圆形
+        self.canvas.draw_idle()
+
+
+class TableModel:
+    """表格的后台数据：排序与过滤只在行列表上进行，不涉及界面控件"""
+
+    def __init__(self, columns, rows=()):
+        self.columns = tuple(columns)
+        self.set_rows(rows)
+
+    def set_rows(self, rows):
+        self.rows = list(rows)
+        self.sort_column = None
+        self.sort_reverse = False
+        self.query = ''
+        self._apply()
+
+    def _apply(self):
+        rows = self.rows
+        indexes = range(len(rows))
+        if self.query:
+            query = self.query.lower()
+            indexes = [i for i in indexes
+                       if any(query in str(value).lower() for value in rows[i])]
+        if self.sort_column is not None:
+            col = self.columns.index(self.sort_column)
+            indexes = sorted(indexes, key=lambda i: rows[i][col], reverse=self.sort_reverse)
+        self.view = list(indexes)
+
+    def sort(self, column):
+        """按列排序，重复点击同一列时切换升降序"""
+        if self.sort_column == column:
+            self.sort_reverse = not self.sort_reverse
+        else:
+            self.sort_column = column
+            self.sort_reverse = False
+        self._apply()
+
+    def filter(self, query):
+        self.query = query.strip()
+        self._apply()
+
+    def __len__(self):
+        return len(self.view)
+
+    def row(self, index):
+        return self.rows[self.view[index]]
+
+
+class VirtualTable(ttk.Frame):
+    """虚拟滚动表格
+
+    Treeview 中只保留与可见行数相同的条目，滚动时改写这些条目的内容，
+    因此无论数据有多少行，创建控件和滚动的代价都只与窗口高度有关。
+    """
+
+    default_row_height = 20
+    header_height = 25
+
+    def __init__(self, parent, columns, widths=None, anchors=None):
+        super().__init__(parent)
+        self.model = TableModel(columns)
+        self.offset = 0
+        self.visible = 20
+        self._items = []
+
+        self.scrollbar = ttk.Scrollbar(self, orient=tk.VERTICAL, command=self._on_scrollbar)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+
+        self.tree = ttk.Treeview(self, columns=columns, show="headings", selectmode="browse")
+        for i, column in enumerate(columns):
+            width = widths[i] if widths else 100
+            anchor = anchors[i] if anchors else tk.W
+            self.tree.column(column, width=width, anchor=anchor, stretch=(width >= 200))
+            self.tree.heading(column, text=column, command=lambda c=column: self.sort(c))
+        self.tree.pack(fill=tk.BOTH, expand=True)
+
+        self.tree.bind("<Configure>", self._on_resize)
+        self.tree.bind("<MouseWheel>", self._on_wheel)
+        self.tree.bind("<Button-4>", lambda e: self.scroll(-3))
+        self.tree.bind("<Button-5>", lambda e: self.scroll(3))
+        self.tree.bind("<Prior>", lambda e: self.scroll(-self.visible))
+        self.tree.bind("<Next>", lambda e: self.scroll(self.visible))
+
+    @property
+    def row_height(self):
+        value = ttk.Style().lookup("Treeview", "rowheight")
+        try:
+            return int(value) or self.default_row_height
+        except (TypeError, ValueError):
+            return self.default_row_height
+
+    def set_rows(self, rows):
+        self.model.set_rows(rows)
+        self.offset = 0
+        self.redraw()
+
+    def sort(self, column):
+        self.model.sort(column)
+        self.offset = 0
+        self.redraw()
+
+    def filter(self, query):
+        self.model.filter(query)
+        self.offset = 0
+        self.redraw()
+
+    def scroll(self, rows):
+        self.offset = max(0, min(self.offset + rows, len(self.model) - self.visible))
+        self.redraw()
+
+    def redraw(self):
+        total = len(self.model)
+        self.offset = max(0, min(self.offset, total - self.visible))
+        count = max(0, min(self.visible, total - self.offset))
+
+        # 只增删差额的条目，其余条目原地改写
+        while len(self._items) < count:
+            self._items.append(self.tree.insert("", tk.END))
+        while len(self._items) > count:
+            self.tree.delete(self._items.pop())
+        for k, iid in enumerate(self._items):
+            self.tree.item(iid, values=self.model.row(self.offset + k))
+
+        if total:
+            self.scrollbar.set(self.offset / total, (self.offset + count) / total)
+        else:
+            self.scrollbar.set(0, 1)
+
+    def _on_resize(self, event):
+        visible = max(1, (event.height - self.header_height) // self.row_height)
+        if visible != self.visible:
+            self.visible = visible
+            self.redraw()
+
+    def _on_wheel(self, event):
+        self.scroll(-3 if event.delta > 0 else 3)
+        return "break"
+
+    def _on_scrollbar(self, action, *args):
+        if action == 'moveto':
+            self.offset = int(float(args[0]) * len(self.model))
+        elif action == 'scroll':
+            amount, unit = int(args[0]), args[1]
+            self.offset += amount * (self.visible if unit == 'pages' else 1)
+        self.redraw()
+
+
+class TableView(ResultView):
+    """带过滤框的虚拟表格标签页"""
+
+    columns = ()
+    widths = None
+    anchors = None
+
+    def build(self):
+        toolbar = ttk.Frame(self.frame)
+        toolbar.pack(fill=tk.X, padx=5, pady=5)
+        ttk.Label(toolbar, text="过滤:").pack(side=tk.LEFT)
+        self.filter_var = tk.StringVar()
+        entry = ttk.Entry(toolbar, textvariable=self.filter_var, width=30)
+        entry.pack(side=tk.LEFT, padx=5)
+        entry.bind("<KeyRelease>", self._schedule_filter)
+        self.count_var = tk.StringVar()
+        ttk.Label(toolbar, textvariable=self.count_var).pack(side=tk.RIGHT)
+        self._filter_job = None
+
+        self.table = VirtualTable(self.frame, self.columns, self.widths, self.anchors)
+        self.table.pack(fill=tk.BOTH, expand=True)
+
+    def render(self):
+        self.table.set_rows(self.rows())
+        self.filter_var.set('')
+        self._update_count()
+
+    def rows(self):
+        raise NotImplementedError
+
+    def _schedule_filter(self, event=None):
+        # 输入停顿后再过滤，避免每个按键都扫描全部数据
+        if self._filter_job is not None:
+            self.frame.after_cancel(self._filter_job)
+        self._filter_job = self.frame.after(200, self._apply_filter)
+
+    def _apply_filter(self):
+        self._filter_job = None
+        self.table.filter(self.filter_var.get())
+        self._update_count()
+
+    def _update_count(self):
+        self.count_var.set(f"{len(self.table.model)} / {len(self.table.model.rows)} 行")
+
+
+class KeywordTableView(TableView):
+    """关键词表：权重、出现次数、标题数与来源"""
+
+    columns = ("排名", "关键词", "权重", "出现次数", "标题数", "来源")
+    widths = (50, 150, 80, 80, 80, 250)
+    anchors = (tk.CENTER, tk.W, tk.CENTER, tk.CENTER, tk.CENTER, tk.W)
+
+    def rows(self):
+        results = self.results or {}
+        sources = results.get('keyword_sources') or {}
+        rows = []
+        # 表格展示全部关键词，其余结果只用前 top_n 个
+        for i, kw in enumerate(results.get('all_keywords') or self.keywords, 1):
+            counter = sources.get(kw.word)
+            source_text = ', '.join(f"{name}({n})" for name, n in counter.most_common()) if counter else ''
+            rows.append((i, kw.word, round(kw.weight, 4), kw.count, kw.df, source_text))
+        return rows
+
+
+class TrendTableView(TableView):
+    """热度趋势表：各时间窗口的出现次数、上升倍数与突发分数"""
+
+    def __init__(self, parent, window_names=()):
+        super().__init__(parent)
+        # 窗口列与趋势引擎的窗口配置一致（TrendEngine.windows 的名称）
+        self.window_names = tuple(window_names)
+        self.columns = (("关键词",) + tuple(window_label(name) for name in self.window_names)
+                        + ("期望次数", "上升倍数", "突发分数"))
+        self.widths = (150,) + (80,) * (len(self.columns) - 1)
+        self.anchors = (tk.W,) + (tk.CENTER,) * (len(self.columns) - 1)
+
+    def rows(self):
+        return [(row['word'],) + tuple(row.get(name, '') for name in self.window_names)
+                + (round(row['baseline'], 2), round(row['rise'], 2), round(row['burst'], 2))
+                for row in (self.results or {}).get('trends') or []]
+
+
+class TitleTableView(TableView):
+    """新闻标题表：序号、标题与来源"""
+
+    columns = ("序号", "新闻标题", "来源")
+    widths = (60, 600, 150)
+    anchors = (tk.CENTER, tk.W, tk.W)
+
+    def rows(self):
+        records = (self.results or {}).get('records')
+        if records is None:
+            records = [{'title': title, 'source': ''} for title in (self.results or {}).get('titles') or []]
+        return [(i, record['title'], record['source']) for i, record in enumerate(records, 1)]
@@ -0,0 +1,43 @@
+"""后台预热
+
+界面启动时先显示登录窗口，再在后台线程中导入较重的依赖（selenium、aiohttp、解析库、
+matplotlib、wordcloud）并加载分词词典快照；用户登录期间完成预热，第一次爬取时不再等待。
+预热失败（如缺少可选依赖）只打印提示，真正用到时仍会按原样报错。
+"""
+import importlib
+import threading
+
+from .dictionary import load_dictionary
+from .metrics import stage
+
+# 预热时导入的模块，按第一次爬取用到的先后排列
+HEAVY_MODULES = (
+    'selenium.webdriver',
+    'aiohttp',
+    'bs4',
+    'matplotlib.figure',
+    'matplotlib.backends.backend_agg',
+    'wordcloud',
+)
+
+
+def preload(modules=HEAVY_MODULES, dictionary=True):
+    """依次加载分词词典与导入较重的模块"""
+    if dictionary:
+        try:
+            load_dictionary()
+        except Exception as e:
+            print(f"预加载分词词典失败: {e}")
+    for name in modules:
+        try:
+            with stage('import', module=name):
+                importlib.import_module(name)
+        except ImportError as e:
+            print(f"预加载模块 {name} 失败: {e}")
+
+
+def warm_up(modules=HEAVY_MODULES, dictionary=True):
+    """在后台守护线程中执行 :func:`preload`，返回线程对象"""
+    thread = threading.Thread(target=preload, args=(modules, dictionary), name='warm-up', daemon=True)
+    thread.start()
+    return thread
@@ -0,0 +1,169 @@
+"""后台任务
+
+在工作线程中执行 爬取→分析→词云 流程或结果导出，通过队列把进度和结果交回界面线程。
+本模块不依赖 tkinter，界面侧使用 ``root.after()`` 定时调用 :meth:`BackgroundWorker.poll` 即可。
+"""
+import queue
+import threading
+import time
+from urllib.parse import urlparse
+
+from .engine import CrawlCancelled
+from .metrics import METRICS
+from .scheduler import Source
+
+
+class BackgroundWorker:
+    """后台线程任务的基类
+
+    队列中的消息为 ``(kind, payload)`` 元组，kind 取值：
+    ``progress``（payload 为 (stage, message)）、``done``（任务结果）、
+    ``cancelled``（None）、``error``（异常对象）。
+    """
+
+    thread_name = 'background-worker'
+
+    def __init__(self):
+        self.messages = queue.Queue()
+        self.cancel_event = threading.Event()
+        self._thread = threading.Thread(target=self._run, name=self.thread_name, daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def cancel(self):
+        """请求取消，浏览器会在下一次检查点被关闭"""
+        self.cancel_event.set()
+
+    def is_alive(self):
+        return self._thread.is_alive()
+
+    def poll(self):
+        """取出队列中当前所有消息（不阻塞）"""
+        items = []
+        while True:
+            try:
+                items.append(self.messages.get_nowait())
+            except queue.Empty:
+                return items
+
+    def _progress(self, stage, message):
+        self.messages.put(('progress', (stage, message)))
+
+    def _check_cancel(self):
+        if self.cancel_event.is_set():
+            raise CrawlCancelled("任务已取消")
+
+    def _run(self):
+        raise NotImplementedError
+
+
+class CrawlWorker(BackgroundWorker):
+    """在后台线程中运行一次完整的爬取流程
+
+    url 为列表时通过 ``crawler_functions['crawl_sources']`` 并发爬取所有来源并合并结果。
+    完成时 ``done`` 消息的 payload 为结果字典：``keywords`` 为前 top_n 个关键词（词云、饼图与导出使用），
+    ``all_keywords`` 为全部关键词（只用于关键词表格）。
+    """
+
+    thread_name = 'crawl-worker'
+
+    def __init__(self, crawler_functions, url, max_pages, wordcloud_size=(600, 400),
+                 fetch_options=None, top_n=20):
+        self.crawler_functions = crawler_functions
+        self.url = url
+        self.max_pages = max_pages
+        self.wordcloud_size = wordcloud_size
+        self.fetch_options = fetch_options or {}
+        self.top_n = top_n
+        super().__init__()
+
+    def _run(self):
+        funcs = self.crawler_functions
+        label = self.url if isinstance(self.url, str) else ' '.join(self.url)
+        run_id = METRICS.begin_run(label)
+        status = 'error'
+        try:
+            # 调用爬虫函数
+            started_at = time.time()
+            records = None
+            if isinstance(self.url, (list, tuple)):
+                sources = [Source(url, max_pages=self.max_pages, options=self.fetch_options)
+                           for url in self.url]
+                merged = funcs['crawl_sources'](sources, progress=self._progress,
+                                                cancel_event=self.cancel_event)
+                titles, records = merged['titles'], merged['records']
+            else:
+                titles = funcs['fetch_news'](self.url, self.max_pages,
+                                             progress=self._progress,
+                                             cancel_event=self.cancel_event,
+                                             **self.fetch_options)
+                source = urlparse(self.url).hostname or self.url
+                records = [{'title': title, 'source': source, 'url': self.url} for title in titles]
+                METRICS.count('source_titles', len(titles), source=source)
+            self._check_cancel()
+
+            # 分析关键词
+            self._progress('keywords', f"已解析{len(titles)}条标题，正在分析关键词...")
+            # 全部关键词只计算一次，前 top_n 个与 analyze_keywords(top_n=top_n) 的结果相同
+            all_keywords = funcs['analyze_keywords'](titles, top_n=None)
+            keywords = all_keywords[:self.top_n]
+            keyword_sources = funcs['keyword_sources'](all_keywords, records)
+            trends = funcs['update_trends'](titles) if 'update_trends' in funcs else None
+            if 'record_history' in funcs:
+                funcs['record_history'](records, label=label, started_at=started_at)
+            self._check_cancel()
+
+            # 生成词云图
+            self._progress('wordcloud', f"关键词分析完成（{len(keywords)}个），正在生成词云...")
+            wordcloud_image = funcs['render_wordcloud'](keywords, size=self.wordcloud_size)
+
+            # 先结束本次运行的计时，界面收到结果时状态栏即可显示完整摘要
+            METRICS.end_run(run_id, 'ok')
+            run_id = None
+            self.messages.put(('done', {
+                'titles': titles,
+                'records': records,
+                'keywords': keywords,
+                'all_keywords': all_keywords,
+                'keyword_sources': keyword_sources,
+                'trends': trends,
+                'wordcloud_image': wordcloud_image
+            }))
+        except CrawlCancelled:
+            status = 'cancelled'
+            self.messages.put(('cancelled', None))
+        except Exception as e:
+            self.messages.put(('error', e))
+        finally:
+            METRICS.end_run(run_id, status)
+            if 'write_metrics' in funcs:
+                funcs['write_metrics']()
+
+
+class ExportWorker(BackgroundWorker):
+    """在后台线程中依次执行导出任务
+
+    jobs 为 ``(说明, 函数)`` 列表，函数以 ``progress``、``cancel_event`` 关键字参数调用。
+    完成时 ``done`` 消息的 payload 为各任务的说明列表。
+    """
+
+    thread_name = 'export-worker'
+
+    def __init__(self, jobs):
+        self.jobs = list(jobs)
+        super().__init__()
+
+    def _run(self):
+        try:
+            done = []
+            for description, job in self.jobs:
+                self._check_cancel()
+                self._progress('export', f"正在导出: {description}")
+                job(progress=self._progress, cancel_event=self.cancel_event)
+                done.append(description)
+            self.messages.put(('done', done))
+        except CrawlCancelled:
+            self.messages.put(('cancelled', None))
+        except Exception as e:
+            self.messages.put(('error', e))
@@ -0,0 +1,44 @@
+"""文章正文抓取（使用本地替身服务器）"""
+from benchmarks.fixtures import make_article_html
+from benchmarks.server import StandInServer
+from new_crawler.articles import ArticleFetcher, analyze_articles, extract_main_text
+from new_crawler.keywords import KeywordEngine
+from new_crawler.page_cache import KIND_ARTICLE, PageCache
+
+
+def test_extract_main_text_skips_boilerplate():
+    text = extract_main_text(make_article_html(1))
+    assert text
+    assert '版权所有' not in text
+    assert '相关新闻' not in text
+
+
+def test_extract_main_text_empty():
+    assert extract_main_text('') == ''
+    assert extract_main_text('   ') == ''
+
+
+def test_fetch_articles_and_cache(tmp_path):
+    with StandInServer() as server:
+        urls = [f"{server.base_url}/c/doc-{i}.shtml" for i in range(5)]
+        batches = []
+        cache = PageCache(str(tmp_path), mode='record')
+        stats = ArticleFetcher(cache=cache, batch_size=2).run(urls, batches.append)
+    assert stats['fetched'] == 5
+    assert sorted(url for batch in batches for url, _ in batch) == sorted(urls)
+    assert all(cache.get(KIND_ARTICLE, url) is not None for url in urls)
+
+    # 回放：只读缓存，不联网
+    replay = PageCache(str(tmp_path), mode='replay')
+    stats = ArticleFetcher(cache=replay).run(urls + ['http://127.0.0.1:9/missing'], lambda batch: None)
+    assert stats['cached'] == 5
+    assert stats['missing'] == 1
+
+
+def test_analyze_articles():
+    with StandInServer() as server:
+        titles = [f"标题{i}" for i in range(3)]
+        links = {title: f"{server.base_url}/c/doc-{i}.shtml" for i, title in enumerate(titles)}
+        keywords, stats = analyze_articles(titles, links, KeywordEngine(), top_n=5)
+    assert stats['articles'] == 3
+    assert len(keywords) == 5
@@ -0,0 +1,46 @@
+"""多进程批量解析与关键词统计"""
+from benchmarks.fixtures import make_toutiao_html
+from new_crawler.batch import SharedPages, analyze_pages, file_page, load_page
+from new_crawler.dedup import ordered_unique
+from new_crawler.engine import analyze_keywords
+from new_crawler.parsers import parse_html
+
+HTMLS = [make_toutiao_html(40, seed=i) for i in range(4)]
+
+
+def write_pages(tmp_path):
+    refs = []
+    for i, html in enumerate(HTMLS):
+        path = tmp_path / f'page{i}.html'
+        path.write_text(html, encoding='utf-8')
+        refs.append(file_page(str(path)))
+    return refs
+
+
+def single_process():
+    titles = ordered_unique(title for html in HTMLS for title in parse_html(html, backend='html.parser'))
+    return titles, analyze_keywords(titles, top_n=20)
+
+
+def test_load_page_from_file_and_shared_memory(tmp_path):
+    ref = write_pages(tmp_path)[0]
+    assert load_page(ref) == HTMLS[0]
+    with SharedPages() as shared:
+        assert load_page(shared.add(HTMLS[1])) == HTMLS[1]
+
+
+def test_in_process_matches_single_process(tmp_path):
+    titles, keywords = single_process()
+    results = analyze_pages(write_pages(tmp_path), workers=1)
+    assert results['titles'] == titles
+    assert results['keywords'] == keywords
+    assert results['pages'] == len(HTMLS)
+
+
+def test_process_pool_with_shared_memory_matches(tmp_path):
+    titles, keywords = single_process()
+    with SharedPages() as shared:
+        refs = [shared.add(html) for html in HTMLS]
+        results = analyze_pages(refs, workers=2)
+    assert results['titles'] == titles
+    assert results['keywords'] == keywords
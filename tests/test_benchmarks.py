@@ -0,0 +1,27 @@
+"""基准脚本的冒烟测试：用最小规模跑一遍各阶段，只检查能正常运行并产出数据"""
+import json
+
+from benchmarks import bench_batch, bench_pipeline
+
+
+def test_bench_pipeline_stages(tmp_path):
+    output = tmp_path / 'bench.json'
+    code = bench_pipeline.main(['--sizes', 'small', '--repeat', '1', '--latency', '0', '--no-wordcloud',
+                                '--export-formats', 'csv', 'jsonl', '--output', str(output)])
+    assert code == 0
+    report = json.loads(output.read_text(encoding='utf-8'))
+    stages = {result['stage']: result for result in report['results']}
+    for name in ('fetch_http', 'parse_titles', 'dedup_exact', 'dedup_near', 'analyze_keywords',
+                 'analyze_keywords_warm', 'export_csv', 'export_jsonl', 'export_keywords', 'end_to_end'):
+        assert stages[name]['items'] > 0, name
+
+
+def test_bench_pipeline_compare_flags_regressions(tmp_path):
+    current = {'results': [{'stage': 'parse_titles', 'size': 'small', 'wall_median': 2.0}]}
+    baseline = {'results': [{'stage': 'parse_titles', 'size': 'small', 'wall_median': 1.0}]}
+    assert len(bench_pipeline.compare(current, baseline, 0.2)) == 1
+    assert bench_pipeline.compare(baseline, current, 0.2) == []
+
+
+def test_bench_batch_results_agree():
+    assert bench_batch.main(['--pages', '4', '--titles', '20', '--workers', '1', '2']) == 0
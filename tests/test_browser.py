@@ -0,0 +1,61 @@
+"""浏览器配置与页面等待（不启动真实浏览器）"""
+import time
+
+import pytest
+
+from benchmarks.fixtures import load_fixture
+from new_crawler.browser_pool import BLOCKED_EXTENSIONS, blocked_url_patterns
+from new_crawler.engine import _wait_for_feed
+from new_crawler.parsers import PROFILES
+
+soupsieve = pytest.importorskip('soupsieve')
+
+
+class FakeDriver:
+    """只在 present 中的选择器上找到元素"""
+
+    def __init__(self, present):
+        self.present = set(present)
+        self.queried = []
+
+    def find_element(self, by, selector):
+        from selenium.common.exceptions import NoSuchElementException
+        self.queried.append(selector)
+        if selector in self.present:
+            return object()
+        raise NoSuchElementException(selector)
+
+
+@pytest.mark.parametrize('site', ['toutiao', 'sina'])
+def test_feed_selectors_match_site_markup(site):
+    from bs4 import BeautifulSoup
+    soup = BeautifulSoup(load_fixture(site, 'small'), 'html.parser')
+    profile = PROFILES[site]
+    assert len(soupsieve.select(profile.feed_selector, soup)) == 200
+    assert len(soupsieve.select(profile.selectors[0], soup)) >= 200
+
+
+def test_wait_returns_feed_selector():
+    profile = PROFILES['toutiao']
+    assert _wait_for_feed(FakeDriver([profile.feed_selector]), profile) == profile.feed_selector
+
+
+def test_wait_falls_back_quickly_when_feed_selector_is_stale():
+    profile = PROFILES['toutiao']
+    started = time.monotonic()
+    ready = _wait_for_feed(FakeDriver(['body']), profile, timeout=5, step_timeout=0.2)
+    assert ready == 'body'
+    assert time.monotonic() - started < 2
+
+
+def test_wait_gives_up_after_timeout():
+    profile = PROFILES['sina']
+    started = time.monotonic()
+    assert _wait_for_feed(FakeDriver([]), profile, timeout=0.5, step_timeout=0.2) is None
+    assert time.monotonic() - started < 1.5
+
+
+def test_stylesheets_are_not_blocked_by_default():
+    assert 'css' not in BLOCKED_EXTENSIONS
+    assert '*.css' not in blocked_url_patterns()
+    assert '*.css' in blocked_url_patterns(BLOCKED_EXTENSIONS + ('css',))
@@ -0,0 +1,115 @@
+"""浏览器池（使用假浏览器，不启动 Edge）"""
+import threading
+
+import pytest
+
+from new_crawler.browser_pool import DriverPool
+
+
+class FakeDriver:
+    def __init__(self, heap=None):
+        self.heap = heap
+        self.healthy = True
+        self.closed = False
+
+    def execute_script(self, script):
+        if not self.healthy:
+            raise RuntimeError('浏览器已崩溃')
+        if 'usedJSHeapSize' in script:
+            return self.heap
+        if script == 'return 1;':
+            return 1
+        return None
+
+    def execute_cdp_cmd(self, cmd, params):
+        pass
+
+    def get(self, url):
+        pass
+
+    def quit(self):
+        self.closed = True
+
+
+def pool(factory=FakeDriver, **options):
+    return DriverPool(factory=factory, prestart=False, **options)
+
+
+def test_released_driver_is_reused():
+    p = pool()
+    driver = p.acquire()
+    p.release(driver)
+    assert p.acquire() is driver
+    p.close()
+    assert driver.closed
+
+
+def test_driver_is_recycled_after_max_pages():
+    p = pool(max_pages=2)
+    driver = p.acquire()
+    p.release(driver, pages=2)
+    assert driver.closed
+    assert p.acquire() is not driver
+    p.close()
+
+
+def test_driver_is_recycled_when_js_heap_is_large():
+    p = pool(factory=lambda: FakeDriver(heap=600 * 1024 * 1024), max_js_heap_mb=512)
+    driver = p.acquire()
+    p.release(driver)
+    assert driver.closed
+    p.close()
+
+
+def test_unhealthy_idle_driver_is_replaced():
+    p = pool()
+    driver = p.acquire()
+    p.release(driver)
+    driver.healthy = False
+    assert p.acquire() is not driver
+    assert driver.closed
+    p.close()
+
+
+def test_acquire_times_out_when_pool_is_busy():
+    p = pool()
+    p.acquire()
+    with pytest.raises(TimeoutError):
+        p.acquire(timeout=0.05)
+    p.close()
+
+
+def test_failed_creation_wakes_waiting_threads():
+    started = threading.Event()
+    proceed = threading.Event()
+    calls = []
+
+    def factory():
+        calls.append(1)
+        if len(calls) == 1:
+            started.set()
+            proceed.wait(5)
+            raise RuntimeError('浏览器启动失败')
+        return FakeDriver()
+
+    p = pool(factory=factory)
+    failures = []
+
+    def first():
+        try:
+            p.acquire()
+        except RuntimeError as e:
+            failures.append(e)
+
+    creator = threading.Thread(target=first)
+    creator.start()
+    started.wait(5)
+    result = []
+    waiter = threading.Thread(target=lambda: result.append(p.acquire()))
+    waiter.start()
+    proceed.set()
+    creator.join(5)
+    waiter.join(5)
+    assert failures and not waiter.is_alive()
+    assert isinstance(result[0], FakeDriver)
+    p.close()
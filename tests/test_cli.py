@@ -0,0 +1,57 @@
+"""命令行子命令的资源清理"""
+import pytest
+
+from new_crawler import cli
+
+
+class FakeResource:
+    def __init__(self):
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def resources(monkeypatch):
+    opened = {'pool': FakeResource(), 'keyword_engine': FakeResource()}
+    monkeypatch.setattr(cli, '_open_pool', lambda args, urls: opened['pool'])
+    monkeypatch.setattr(cli, '_keyword_engine', lambda args: opened['keyword_engine'])
+    return opened
+
+
+def fail(*args, **kwargs):
+    raise RuntimeError('分析失败')
+
+
+def parse(*argv, tmp_path):
+    return cli.build_parser().parse_args([*argv, '--out', str(tmp_path), '--no-wordcloud'])
+
+
+def test_crawl_closes_opened_resources_when_setup_fails(resources, monkeypatch, tmp_path):
+    monkeypatch.setattr(cli, '_open_history', fail)
+    with pytest.raises(RuntimeError):
+        cli.cmd_crawl(parse('crawl', tmp_path=tmp_path))
+    assert resources['pool'].closed and resources['keyword_engine'].closed
+
+
+def test_multi_closes_keyword_engine_when_analysis_fails(resources, monkeypatch, tmp_path):
+    class FakeScheduler:
+        def __init__(self, **options):
+            pass
+
+        def run(self, sources):
+            return {'titles': ['北京今日暴雨预警发布'], 'records': [], 'sources': {}, 'elapsed': 0.0}
+
+    monkeypatch.setattr('new_crawler.scheduler.CrawlScheduler', FakeScheduler)
+    monkeypatch.setattr('new_crawler.engine.analyze_keywords', fail)
+    with pytest.raises(RuntimeError):
+        cli.cmd_multi(parse('multi', tmp_path=tmp_path))
+    assert resources['keyword_engine'].closed
+
+
+def test_daemon_closes_opened_resources_when_setup_fails(resources, monkeypatch, tmp_path):
+    monkeypatch.setattr(cli, '_open_dedup', fail)
+    with pytest.raises(RuntimeError):
+        cli.cmd_daemon(parse('daemon', tmp_path=tmp_path))
+    assert resources['pool'].closed and resources['keyword_engine'].closed
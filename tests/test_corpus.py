@@ -0,0 +1,74 @@
+"""词语编号语料"""
+import numpy as np
+
+from new_crawler.corpus import Corpus, Vocabulary, grow
+
+TOKENS = [('北京', '暴雨', '暴雨'), ('上海', '暴雨'), ('北京', '高温')]
+
+
+def corpus():
+    result = Corpus()
+    result.add(TOKENS[:2], sources=['sina', 'toutiao'])
+    result.add(TOKENS[2:], sources=['sina'])
+    return result
+
+
+def test_vocabulary_ids_follow_first_occurrence():
+    vocabulary = Vocabulary(['北京', '暴雨'])
+    assert vocabulary.intern('暴雨') == 1
+    assert vocabulary.intern('上海') == 2
+    assert vocabulary.decode([2, 0]) == ['上海', '北京']
+    assert vocabulary.lookup(['北京', '未知']).tolist() == [0, -1]
+
+
+def test_vocabulary_derive_only_computes_new_words():
+    vocabulary = Vocabulary(['甲'])
+    calls = []
+
+    def length(word):
+        calls.append(word)
+        return len(word)
+
+    vocabulary.derive('length', length, np.int32)
+    vocabulary.intern('乙丙')
+    assert vocabulary.derive('length', length, np.int32).tolist() == [1, 2]
+    assert calls == ['甲', '乙丙']
+
+
+def test_grow():
+    assert grow(np.array([1, 2]), 4).tolist() == [1, 2, 0, 0]
+
+
+def test_frequencies():
+    c = corpus()
+    assert len(c) == 3
+    assert c.words(2) == ('北京', '高温')
+    tf = c.vocabulary.counter(c.term_frequencies())
+    df = c.vocabulary.counter(c.document_frequencies())
+    assert tf['暴雨'] == 3 and df['暴雨'] == 2
+    assert tf['北京'] == 2 and df['北京'] == 2
+
+
+def test_exclude_mask():
+    c = corpus()
+    exclude = np.zeros(len(c.vocabulary), dtype=bool)
+    exclude[c.vocabulary.ids['暴雨']] = True
+    assert c.term_frequencies(exclude)[c.vocabulary.ids['暴雨']] == 0
+
+
+def test_source_counts():
+    c = corpus()
+    ids = c.vocabulary.lookup(['北京', '暴雨'])
+    counts = c.source_counts(ids)
+    sina, toutiao = c.source_names.ids['sina'], c.source_names.ids['toutiao']
+    assert counts[0, sina] == 2 and counts[0, toutiao] == 0
+    assert counts[1, sina] == 1 and counts[1, toutiao] == 1
+
+
+def test_cooccurrence_matches_document_frequency_on_diagonal():
+    c = corpus()
+    ids = c.vocabulary.lookup(['北京', '暴雨', '高温'])
+    matrix = c.cooccurrence(ids, chunk_size=2)
+    assert np.diag(matrix).tolist() == [2, 2, 1]
+    assert matrix[0, 1] == matrix[1, 0] == 1
+    assert matrix[0, 2] == 1 and matrix[1, 2] == 0
@@ -0,0 +1,92 @@
+"""持续爬取守护进程"""
+from types import SimpleNamespace
+
+from new_crawler.daemon import CrawlDaemon, last_record_number
+from new_crawler.dedup import DedupStore
+from new_crawler.keywords import KeywordAggregate, KeywordEngine
+from new_crawler.scheduler import Source
+
+SOURCE = 'https://news.example/'
+
+
+def records(*titles):
+    return [{'title': title, 'source': 'news.example', 'url': SOURCE} for title in titles]
+
+
+def make_daemon(**options):
+    return CrawlDaemon([Source(SOURCE)], keyword_engine=KeywordEngine(), wordcloud=False, **options)
+
+
+def test_only_new_titles_are_processed():
+    daemon = make_daemon()
+    first = daemon.process(records('北京今日暴雨预警发布', '上海今日暴雨预警发布'))
+    second = daemon.process(records('北京今日暴雨预警发布', '广州今日高温预警发布'))
+    assert [r['title'] for r in first['records']] == ['北京今日暴雨预警发布', '上海今日暴雨预警发布']
+    assert [r['title'] for r in second['records']] == ['广州今日高温预警发布']
+    assert daemon.aggregate.title_count == 3
+
+
+def test_seen_titles_expire(monkeypatch):
+    monkeypatch.setattr('new_crawler.daemon.SEEN_PRUNE_SIZE', 0)
+    daemon = make_daemon(seen_ttl=100)
+    daemon._fresh(records('北京今日暴雨预警发布'), timestamp=1000)
+    daemon._fresh(records('上海今日暴雨预警发布'), timestamp=1050)
+    assert set(daemon.seen) == {'北京今日暴雨预警发布', '上海今日暴雨预警发布'}
+    daemon._fresh(records('上海今日暴雨预警发布'), timestamp=1120)
+    assert set(daemon.seen) == {'上海今日暴雨预警发布'}
+
+
+def test_dedup_store_replaces_in_memory_seen():
+    with DedupStore(':memory:') as store:
+        daemon = make_daemon(dedup_store=store)
+        fresh = daemon._fresh(records('北京今日暴雨预警发布', '北京今日暴雨预警发布', '上海今日暴雨预警发布'))
+        assert [r['title'] for r in fresh] == ['北京今日暴雨预警发布', '上海今日暴雨预警发布']
+        assert daemon._fresh(records('北京今日暴雨预警发布')) == []
+        assert daemon.seen == {}
+
+
+def test_aggregate_horizon_expires_old_batches():
+    engine = KeywordEngine()
+    aggregate = KeywordAggregate(engine, horizon=100)
+    aggregate.add_corpus(engine.corpus(['北京今日暴雨预警发布']), timestamp=1000)
+    aggregate.add_corpus(engine.corpus(['上海今日高温预警发布']), timestamp=1080)
+    assert aggregate.expire(1050) == 0
+    assert aggregate.expire(1150) == 1
+    assert aggregate.title_count == 1
+    words = {kw.word for kw in aggregate.top(None)}
+    assert '暴雨' not in words and '高温' in words
+    assert (aggregate.tf >= 0).all() and (aggregate.df >= 0).all()
+
+
+def test_record_numbering_continues(tmp_path):
+    out = str(tmp_path)
+    daemon = make_daemon(out_dir=out)
+    daemon.process(records('北京今日暴雨预警发布', '上海今日暴雨预警发布'))
+    assert last_record_number(str(tmp_path / 'records.csv')) == 2
+
+    restarted = make_daemon(out_dir=out)
+    assert restarted.record_count == 2
+    restarted.process(records('广州今日高温预警发布'))
+    assert last_record_number(str(tmp_path / 'records.csv')) == 3
+    lines = (tmp_path / 'records.csv').read_text(encoding='utf-8').splitlines()
+    assert len(lines) == 4 and lines[-1].startswith('3,')
+
+
+def test_outputs_follow_expired_keywords(tmp_path, monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr('new_crawler.keywords.time', SimpleNamespace(time=lambda: clock[0]))
+    generated = []
+    monkeypatch.setattr('new_crawler.daemon.generate_wordcloud', lambda keywords, path: generated.append(path))
+    daemon = make_daemon(out_dir=str(tmp_path), keyword_horizon=100)
+    daemon.wordcloud = True
+    daemon.process(records('北京今日暴雨预警发布'))
+    clock[0] = 1080.0
+    daemon.process(records('上海今日高温预警发布'))
+    assert '暴雨' in (tmp_path / 'keywords.csv').read_text(encoding='utf-8')
+
+    clock[0] = 1150.0
+    delta = daemon.process([])
+    assert delta['keywords_changed']
+    text = (tmp_path / 'keywords.csv').read_text(encoding='utf-8')
+    assert '暴雨' not in text and '高温' in text
+    assert len(generated) == 3
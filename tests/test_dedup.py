@@ -0,0 +1,88 @@
+"""标题去重"""
+import sqlite3
+
+from new_crawler.dedup import (DEFAULT_THRESHOLD, DedupStore, jaccard, lsh_buckets, minhash,
+                               ordered_unique)
+
+# 同一模板、不同主体或不同事件：都是不同的新闻
+SAME_TEMPLATE = [
+    '北京今日暴雨预警发布',
+    '上海今日暴雨预警发布',
+    '北京今日高温预警发布',
+    '广州今日暴雨预警发布',
+    '国务院发布新能源汽车政策',
+    '国务院发布人工智能政策',
+]
+
+
+def test_ordered_unique_keeps_first_occurrence():
+    assert ordered_unique(['b', 'a', 'b', 'c', 'a']) == ['b', 'a', 'c']
+
+
+def test_same_template_different_entity_is_not_duplicate():
+    with DedupStore(':memory:') as store:
+        assert store.filter(SAME_TEMPLATE) == SAME_TEMPLATE
+
+
+def test_same_template_pairs_below_threshold():
+    for i, a in enumerate(SAME_TEMPLATE):
+        for b in SAME_TEMPLATE[i + 1:]:
+            assert jaccard(a, b) < DEFAULT_THRESHOLD, (a, b)
+
+
+def test_exact_and_near_duplicates_removed():
+    titles = ['北京今日暴雨预警发布', '北京今日暴雨预警发布！', ' 北京今日暴雨预警发布 ',
+              '中国男足世界杯预选赛客场两比一战胜对手晋级下一轮',
+              '中国男足世界杯预选赛客场两比一战胜对手晋级下一轮比赛']
+    with DedupStore(':memory:') as store:
+        assert store.filter(titles) == [titles[0], titles[3]]
+
+
+def test_filter_remembers_across_calls(tmp_path):
+    path = str(tmp_path / 'dedup.db')
+    with DedupStore(path) as store:
+        assert store.filter(['北京今日暴雨预警发布']) == ['北京今日暴雨预警发布']
+    with DedupStore(path) as store:
+        assert store.filter(['北京今日暴雨预警发布', '上海今日暴雨预警发布']) == ['上海今日暴雨预警发布']
+        assert store.check('北京今日暴雨预警发布') == '北京今日暴雨预警发布'
+        assert store.check('深圳今日暴雨预警发布') is None
+
+
+def test_remember_false_does_not_write():
+    with DedupStore(':memory:') as store:
+        assert store.filter(['北京今日暴雨预警发布'], remember=False) == ['北京今日暴雨预警发布']
+        assert len(store) == 0
+
+
+def test_threshold_one_only_removes_exact_duplicates():
+    titles = ['中国男足世界杯预选赛客场两比一战胜对手晋级下一轮',
+              '中国男足世界杯预选赛客场两比一战胜对手晋级下一轮比赛']
+    with DedupStore(':memory:', threshold=1.0) as store:
+        assert store.filter(titles + titles[:1]) == titles
+
+
+def test_old_store_is_rebuilt(tmp_path):
+    path = str(tmp_path / 'dedup.db')
+    with DedupStore(path) as store:
+        store.filter(['中国男足世界杯预选赛客场两比一战胜对手晋级下一轮'])
+    # 模拟旧版本创建的库：没有参数记录、分桶为空
+    conn = sqlite3.connect(path)
+    with conn:
+        conn.execute('DELETE FROM meta')
+        conn.execute('DELETE FROM lsh_buckets')
+    conn.close()
+    with DedupStore(path) as store:
+        assert store.filter(['中国男足世界杯预选赛客场两比一战胜对手晋级下一轮比赛']) == []
+
+
+def test_signature_is_deterministic():
+    assert (minhash('北京今日暴雨预警发布') == minhash('北京今日暴雨预警发布')).all()
+    assert lsh_buckets(minhash('北京今日暴雨预警发布')) == lsh_buckets(minhash('北京今日暴雨预警发布'))
+
+
+def test_fixture_titles_are_kept():
+    from benchmarks.fixtures import load_fixture
+    from new_crawler.parsers import parse_html
+    titles = ordered_unique(parse_html(load_fixture('toutiao', 'small')))
+    with DedupStore(':memory:') as store:
+        assert store.filter(titles) == titles
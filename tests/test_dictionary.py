@@ -0,0 +1,64 @@
+"""分词词典快照的缓存目录"""
+import os
+import pickle
+
+import pytest
+
+from new_crawler import dictionary
+
+posix_only = pytest.mark.skipif(not hasattr(os, 'getuid'), reason='需要 POSIX 权限')
+
+
+def test_default_cache_dir_is_per_user():
+    assert not dictionary.DEFAULT_CACHE_DIR.startswith(os.path.join(os.sep, 'tmp'))
+    assert dictionary.DEFAULT_CACHE_DIR.endswith('new_crawler')
+
+
+@posix_only
+def test_write_creates_private_dir(tmp_path):
+    cache_dir = tmp_path / 'cache'
+    path = str(cache_dir / 'jieba-1111111111111111.pickle')
+    dictionary._write_snapshot(path, {'version': dictionary.SNAPSHOT_VERSION})
+    assert os.stat(cache_dir).st_mode & 0o777 == 0o700
+    assert os.stat(path).st_mode & 0o777 == 0o600
+    assert dictionary._read_snapshot(path) == {'version': dictionary.SNAPSHOT_VERSION}
+
+
+def test_write_keeps_recently_used_snapshots(tmp_path):
+    # 其他自定义词典组合的快照不会因为写入新快照而被删除，只清理最久未用的
+    others = []
+    for i in range(dictionary.SNAPSHOTS_KEPT):
+        other = tmp_path / f'jieba-{i:016d}.pickle'
+        other.write_bytes(b'old')
+        os.utime(other, (1000 + i, 1000 + i))
+        others.append(other)
+    path = str(tmp_path / 'jieba-ffffffffffffffff.pickle')
+    dictionary._write_snapshot(path, {'version': dictionary.SNAPSHOT_VERSION})
+    assert os.path.exists(path)
+    assert not others[0].exists()
+    assert all(other.exists() for other in others[1:])
+
+
+def test_reading_marks_snapshot_as_used(tmp_path):
+    path = tmp_path / 'jieba-0000000000000000.pickle'
+    path.write_bytes(b'old')
+    os.utime(path, (1000, 1000))
+    dictionary._touch(str(path))
+    assert os.stat(path).st_mtime > 1000
+
+
+@posix_only
+def test_world_writable_snapshot_is_not_read(tmp_path):
+    path = str(tmp_path / 'jieba-1111111111111111.pickle')
+    with open(path, 'wb') as f:
+        pickle.dump({'version': dictionary.SNAPSHOT_VERSION}, f)
+    os.chmod(path, 0o666)
+    with pytest.raises(PermissionError):
+        dictionary._read_snapshot(path)
+
+
+@posix_only
+def test_world_writable_dir_is_rejected(tmp_path):
+    os.chmod(tmp_path, 0o777)
+    with pytest.raises(PermissionError):
+        dictionary._private_dir(str(tmp_path))
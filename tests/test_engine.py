@@ -0,0 +1,53 @@
+"""无界面流程与命令行（使用本地替身服务器）"""
+import subprocess
+import sys
+
+import pytest
+
+from benchmarks.server import StandInServer
+from new_crawler.cli import main
+from new_crawler.engine import CrawlCancelled, run_pipeline
+
+SINA_URL = 'https://news.sina.com.cn/roll/#pageid=153&lid=2509&num=50&page=1'
+
+
+@pytest.fixture(scope='module')
+def server():
+    with StandInServer() as server:
+        yield server
+
+
+def test_engine_import_does_not_load_tkinter():
+    code = "import sys, new_crawler.engine; print('tkinter' in sys.modules)"
+    output = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True).stdout
+    assert output.strip() == 'False'
+
+
+def test_pipeline_writes_results(server, tmp_path):
+    stages = []
+    results = run_pipeline(SINA_URL, 1, out_dir=str(tmp_path), wordcloud=False, top_n=10, engine='http',
+                           http_options={'api_base': server.base_url},
+                           progress=lambda stage, message: stages.append(stage))
+    assert len(results['titles']) == 50
+    assert len(results['keywords']) == 10
+    assert results['wordcloud_path'] is None
+    assert (tmp_path / 'keywords.csv').exists()
+    assert stages[0] == 'start' and 'keywords' in stages
+
+
+def test_pipeline_stops_when_cancelled(server):
+    class Cancelled:
+        def is_set(self):
+            return True
+
+    with pytest.raises(CrawlCancelled):
+        run_pipeline(SINA_URL, 1, wordcloud=False, engine='http', cancel_event=Cancelled(),
+                     http_options={'api_base': server.base_url})
+
+
+def test_crawl_command(server, tmp_path, capsys):
+    code = main(['crawl', '--url', SINA_URL, '--pages', '2', '--engine', 'http',
+                 '--api-base', server.base_url, '--out', str(tmp_path), '--no-wordcloud'])
+    assert code == 0
+    assert (tmp_path / 'keywords.csv').exists()
+    assert '标题 100 条' in capsys.readouterr().out
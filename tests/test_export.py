@@ -0,0 +1,74 @@
+"""结果导出"""
+import csv
+import gzip
+import json
+import threading
+
+import pytest
+
+from new_crawler import export
+from new_crawler.engine import CrawlCancelled
+from new_crawler.export import (RECORD_COLUMNS, chunked, detect_format, export_keywords, export_records,
+                                export_rows)
+from new_crawler.keywords import Keyword
+
+KEYWORDS = [Keyword('暴雨', 1.5, 3, 2), Keyword('预警', 0.5, 1, 1)]
+RECORDS = [{'title': f'标题{i}', 'source': 'sina', 'url': f'https://example.com/{i}'} for i in range(12)]
+
+
+def test_detect_format():
+    assert detect_format('titles.jsonl.gz') == ('jsonl', 'gzip')
+    assert detect_format('keywords.parquet') == ('parquet', None)
+    assert detect_format('out.txt') == ('csv', None)
+
+
+def test_chunked():
+    assert list(chunked(range(5), 2)) == [[0, 1], [2, 3], [4]]
+
+
+def test_export_keywords_csv(tmp_path):
+    path = tmp_path / 'keywords.csv'
+    assert export_keywords(KEYWORDS, str(path)) == 2
+    with open(path, encoding='utf-8', newline='') as f:
+        rows = list(csv.reader(f))
+    assert rows[0] == ['排名', '关键词', '权重', '出现次数', '标题数']
+    assert rows[1] == ['1', '暴雨', '1.5', '3', '2']
+
+
+def test_export_records_jsonl_gzip_in_chunks(tmp_path):
+    path = tmp_path / 'titles.jsonl.gz'
+    assert export_records(RECORDS, str(path), chunk_size=5) == len(RECORDS)
+    with gzip.open(path, 'rt', encoding='utf-8') as f:
+        rows = [json.loads(line) for line in f]
+    assert [row['title'] for row in rows] == [record['title'] for record in RECORDS]
+    assert rows[0]['index'] == 1
+
+
+def test_cancel_removes_partial_file(tmp_path):
+    path = tmp_path / 'titles.csv'
+    cancel = threading.Event()
+    cancel.set()
+    with pytest.raises(CrawlCancelled):
+        export_records(RECORDS, str(path), cancel_event=cancel)
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_close_failure_still_removes_partial_file(tmp_path, monkeypatch):
+    def chunks():
+        yield [(1, '标题', 'sina', '')]
+        raise RuntimeError('读取失败')
+
+    def broken_close(self):
+        self.file.close()
+        raise OSError('磁盘已满')
+
+    monkeypatch.setattr(export._TextWriter, 'close', broken_close)
+    with pytest.raises(OSError):
+        export_rows(str(tmp_path / 'titles.csv.gz'), RECORD_COLUMNS, chunks())
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_unknown_compression_leaves_nothing(tmp_path):
+    with pytest.raises(export.ExportError):
+        export_rows(str(tmp_path / 'titles.csv'), RECORD_COLUMNS, [], compression='zip')
+    assert list(tmp_path.iterdir()) == []
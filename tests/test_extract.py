@@ -0,0 +1,70 @@
+"""浏览器内增量提取（使用假浏览器执行提取脚本的约定）"""
+from new_crawler import engine
+from new_crawler.extract import _HARVEST_JS, TITLE_SELECTORS, IncrementalExtractor
+
+TITLES = ['北京今日暴雨预警发布第%d条消息' % i for i in range(30)]
+
+
+class FeedDriver:
+    """每次滚动加载 10 条；提取脚本只返回尚未提取过的条目（每批重复上一批的最后一条）"""
+
+    def __init__(self):
+        self.loaded = 10
+        self.harvested = 0
+        self.calls = []
+        self.page_source_read = False
+
+    def get(self, url):
+        pass
+
+    @property
+    def page_source(self):
+        self.page_source_read = True
+        return ''
+
+    def execute_script(self, script, *args):
+        if script == _HARVEST_JS:
+            self.calls.append(args)
+            start = max(0, self.harvested - 1)
+            batch = TITLES[start:self.loaded]
+            self.harvested = self.loaded
+            return [[' %s ' % title, 'https://news.example/%d' % TITLES.index(title)] for title in batch]
+        if script.startswith('window.scrollTo'):
+            self.loaded = min(len(TITLES), self.loaded + 10)
+            return None
+        return [self.loaded * 100, self.loaded]
+
+
+class FakePool:
+    def __init__(self, driver):
+        self.driver = driver
+        self.released = None
+
+    def acquire(self):
+        return self.driver
+
+    def release(self, driver, pages=1):
+        self.released = pages
+
+
+def test_extractor_passes_selectors_and_counts_records():
+    driver = FeedDriver()
+    extractor = IncrementalExtractor(driver, prune=True)
+    records = extractor.harvest()
+    assert len(records) == 10 and extractor.harvested == 10
+    assert driver.calls == [(list(TITLE_SELECTORS), True)]
+
+
+def test_incremental_fetch_collects_titles_while_scrolling(monkeypatch):
+    monkeypatch.setattr(engine, '_wait_for_feed', lambda driver, profile, timeout: profile.feed_selector)
+    driver = FeedDriver()
+    pool = FakePool(driver)
+    batches = []
+    links = {}
+    titles = engine.fetch_toutiao_news('https://www.toutiao.com/', 2, pool=pool, adaptive=True,
+                                       incremental=True, on_titles=batches.append, links=links)
+    assert titles == TITLES
+    assert [len(batch) for batch in batches] == [10, 10, 10]
+    assert links[TITLES[12]] == 'https://news.example/12'
+    assert not driver.page_source_read
+    assert pool.released == 3
@@ -0,0 +1,65 @@
+"""HTTP 抓取引擎（使用本地替身服务器）"""
+import asyncio
+
+import pytest
+
+from benchmarks.server import StandInServer
+from new_crawler.http_engine import MAX_PAGES, HttpFetcher, SinaRollSite, fetch_http_news
+from new_crawler.page_cache import KIND_HTTP, PageCache
+
+SINA_URL = 'https://news.sina.com.cn/roll/#pageid=153&lid=2509&num=50&page=1'
+ARTICLE_PATH = '/c/doc-1.shtml'
+
+
+@pytest.fixture(scope='module')
+def server():
+    with StandInServer() as server:
+        yield server
+
+
+def test_page_urls_without_page_count_is_bounded():
+    urls = SinaRollSite().page_urls(SINA_URL, None)
+    assert len(urls) == MAX_PAGES
+    assert urls[0].endswith('page=1')
+
+
+def test_fetch_pages(server):
+    titles = fetch_http_news(SINA_URL, 2, api_base=server.base_url)
+    assert len(titles) == 100
+
+
+def test_target_without_page_count_stops_when_enough(server):
+    titles = fetch_http_news(SINA_URL, None, api_base=server.base_url, target_count=120, per_host_limit=1)
+    assert 120 <= len(titles) < 200
+
+
+def test_replay_with_target_stops_at_end_of_recording(server, tmp_path):
+    cache = PageCache(str(tmp_path), mode='record')
+    recorded = fetch_http_news(SINA_URL, 2, api_base=server.base_url, cache=cache)
+    replay = PageCache(str(tmp_path), mode='replay')
+    titles = fetch_http_news(SINA_URL, None, api_base=server.base_url, cache=replay, target_count=1000)
+    assert titles == recorded
+
+
+def _fetch(server, cache, headers=None):
+    async def run():
+        async with HttpFetcher(cache=cache) as fetcher:
+            return await fetcher.fetch(server.base_url + ARTICLE_PATH, headers=headers)
+
+    return asyncio.run(run())
+
+
+def test_not_modified_reuses_cached_body(server, tmp_path):
+    cache = PageCache(str(tmp_path), mode='record')
+    status, _, text = _fetch(server, cache)
+    again = _fetch(server, cache)
+    assert (again[0], again[2]) == (status, text)
+
+
+def test_not_modified_without_cache_entry_refetches_full_body(server, tmp_path):
+    etag = _fetch(server, None)[1]['ETag']
+    cache = PageCache(str(tmp_path), mode='record')
+    status, _, text = _fetch(server, cache, headers={'If-None-Match': etag})
+    assert status == 200 and text
+    entry = cache.get(KIND_HTTP, server.base_url + ARTICLE_PATH)
+    assert entry.status == 200 and entry.text == text
@@ -0,0 +1,41 @@
+"""关键词引擎与分词缓存"""
+from new_crawler.keywords import DEFAULT_ALLOW_POS, KeywordEngine, TokenCache
+
+
+def test_token_cache_memory_is_lru_bounded():
+    cache = TokenCache(max_memory=2)
+    cache.put_many({'a': ('甲',), 'b': ('乙',)})
+    assert cache.get_many(['a']) == {'a': ('甲',)}
+    cache.put_many({'c': ('丙',)})
+    assert len(cache.memory) == 2
+    # b 最久未用，被淘汰
+    assert cache.get_many(['a', 'b', 'c']) == {'a': ('甲',), 'c': ('丙',)}
+
+
+def test_evicted_entries_reload_from_sqlite(tmp_path):
+    cache = TokenCache(str(tmp_path / 'tokens.db'), max_memory=1)
+    cache.put_many({'a': ('甲',), 'b': ('乙',)})
+    assert len(cache.memory) == 1
+    assert cache.get_many(['a', 'b']) == {'a': ('甲',), 'b': ('乙',)}
+    cache.close()
+
+
+def test_cache_key_includes_allow_pos(tmp_path):
+    path = str(tmp_path / 'tokens.db')
+    default = TokenCache(path)
+    default.put_many({'标题': ('北京', '暴雨')})
+    default.close()
+
+    nouns = TokenCache(path, allow_pos=('n',))
+    assert nouns.get_many(['标题']) == {}
+    nouns.close()
+    assert TokenCache(path, allow_pos=DEFAULT_ALLOW_POS).get_many(['标题']) == {'标题': ('北京', '暴雨')}
+
+
+def test_engines_with_different_pos_do_not_share_results(tmp_path):
+    path = str(tmp_path / 'tokens.db')
+    title = '北京发布暴雨预警'
+    all_pos = KeywordEngine(cache_path=path).tokenize([title])[0]
+    verbs = KeywordEngine(cache_path=path, allow_pos=('v',)).tokenize([title])[0]
+    assert verbs != all_pos
+    assert set(verbs) <= set(all_pos)
@@ -0,0 +1,46 @@
+"""运行指标"""
+import json
+
+from new_crawler import metrics
+from new_crawler.metrics import Metrics
+
+
+def test_memory_is_reported():
+    assert metrics.rss_kb() > 0
+    assert metrics.peak_rss_kb() >= metrics.rss_kb() // 2
+
+
+def test_memory_fallback_without_proc_and_resource(monkeypatch):
+    monkeypatch.setattr(metrics, 'resource', None)
+    monkeypatch.setattr(metrics, '_psutil_memory', lambda: (1024, 4096))
+
+    def no_proc(*args, **kwargs):
+        raise OSError('no /proc')
+    monkeypatch.setattr(metrics, 'open', no_proc, raising=False)
+    assert metrics.rss_kb() == 1024
+    assert metrics.peak_rss_kb() == 4096
+
+
+def test_memory_unavailable(monkeypatch):
+    monkeypatch.setattr(metrics, 'resource', None)
+    monkeypatch.setattr(metrics, '_psutil_memory', lambda: None)
+    monkeypatch.setattr(metrics.os, 'name', 'posix')
+    assert metrics.peak_rss_kb() is None
+
+
+def test_stage_log_and_prometheus(tmp_path):
+    registry = Metrics()
+    log = tmp_path / 'metrics.jsonl'
+    registry.open_log(str(log))
+    with registry.run(label='test'):
+        with registry.stage('parse', source='toutiao') as span:
+            span.items = 3
+    registry.close()
+    events = [json.loads(line) for line in log.read_text(encoding='utf-8').splitlines()]
+    stage = next(e for e in events if e['event'] == 'stage')
+    assert stage['stage'] == 'parse' and stage['items'] == 3
+    assert 'process_peak_rss_kb' in stage
+    text = registry.render_prometheus()
+    assert 'crawler_stage_items_total{stage="parse",source="toutiao"} 3' in text
+    assert 'since process start' in text
+    assert '进程峰值内存' in registry.run_summary()
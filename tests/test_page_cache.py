@@ -0,0 +1,61 @@
+"""页面缓存"""
+import os
+from types import SimpleNamespace
+
+import pytest
+
+from new_crawler.page_cache import KIND_HTTP, KIND_PAGE, KIND_RECORDS, CacheMiss, PageCache
+
+URL = 'https://example.com/news'
+
+
+def test_put_and_get(tmp_path):
+    with PageCache(str(tmp_path)) as cache:
+        cache.put(KIND_HTTP, URL, '正文', content_type='text/html', etag='"v1"')
+        entry = cache.get(KIND_HTTP, URL)
+        assert entry.text == '正文'
+        assert entry.validators() == {'If-None-Match': '"v1"'}
+        assert os.path.exists(entry.path)
+        assert cache.get(KIND_PAGE, URL) is None
+
+
+def test_same_body_is_stored_once(tmp_path):
+    with PageCache(str(tmp_path)) as cache:
+        first = cache.put(KIND_HTTP, URL, 'same')
+        second = cache.put(KIND_HTTP, URL + '?page=2', 'same')
+        assert first == second
+        assert len(cache) == 2
+
+
+def test_replay_reopens_recorded_entries(tmp_path):
+    with PageCache(str(tmp_path)) as cache:
+        cache.put(KIND_HTTP, URL, 'recorded')
+    with PageCache(str(tmp_path), mode='replay') as cache:
+        assert cache.replay
+        assert cache.require(KIND_HTTP, URL).text == 'recorded'
+        with pytest.raises(CacheMiss):
+            cache.require(KIND_HTTP, URL + '/missing')
+
+
+def test_invalid_mode(tmp_path):
+    with pytest.raises(ValueError):
+        PageCache(str(tmp_path), mode='offline')
+
+
+def test_browser_snapshot_prefers_newest(tmp_path, monkeypatch):
+    with PageCache(str(tmp_path)) as cache:
+        assert cache.get_browser_snapshot(URL) is None
+        clock = iter([100.0, 200.0])
+        monkeypatch.setattr('new_crawler.page_cache.time', SimpleNamespace(time=lambda: next(clock)))
+        cache.put_page(URL, '<html></html>')
+        cache.put_records(URL, ['标题一', '标题二'])
+        assert cache.get_browser_snapshot(URL) == (KIND_RECORDS, ['标题一', '标题二'])
+
+
+def test_prune_removes_unreferenced_blobs(tmp_path):
+    with PageCache(str(tmp_path)) as cache:
+        cache.put(KIND_HTTP, URL, 'old')
+        cache.put(KIND_HTTP, URL, 'new')
+        assert cache.prune() == 1
+        assert cache.prune() == 0
+        assert cache.get(KIND_HTTP, URL).text == 'new'
@@ -0,0 +1,78 @@
+"""标题解析后端与原有 parse_titles 的一致性"""
+import random
+
+import pytest
+
+from benchmarks.bench_parse import EDGE_CASES, check_edge_cases, reference_titles
+from benchmarks.fixtures import load_fixture
+from new_crawler.parsers import _plain_links, available_backends, best_backend, parse_html, profile_for_url
+
+BACKENDS = available_backends()
+
+
+@pytest.mark.parametrize('name', sorted(EDGE_CASES))
+def test_edge_cases_match_reference(name):
+    url, html, expected = EDGE_CASES[name]
+    assert reference_titles(html) == expected
+    for backend in BACKENDS:
+        assert parse_html(html, backend=backend, url=url) == expected, backend
+
+
+def test_check_edge_cases_reports_nothing():
+    assert check_edge_cases(BACKENDS) == []
+
+
+@pytest.mark.parametrize('site', ['toutiao', 'sina'])
+def test_fixture_backends_agree(site):
+    html = load_fixture(site, 'small')
+    expected = reference_titles(html)
+    assert len(expected) == 200
+    # 样本页面的链接结构简单，快速后端不回退到 html.parser
+    assert _plain_links(html)
+    for backend in BACKENDS:
+        assert parse_html(html, backend=backend, profile=site) == expected, backend
+
+
+def test_malformed_links_fall_back():
+    assert not _plain_links(EDGE_CASES['nested_link'][1])
+    assert not _plain_links(EDGE_CASES['unclosed_link'][1])
+    assert not _plain_links(EDGE_CASES['unknown_entity'][1])
+    assert not _plain_links('<textarea><a target="_blank">文本框中的链接</a></textarea>')
+
+
+# 随机拼接的不规范HTML片段
+FRAGMENTS = [
+    '<a target="_blank" href="/x">', '<a target=_blank>', '<A TARGET="_blank">', '<a target="_BLANK">', '</a>',
+    '<p>', '</p>', '<div>', '</div>', '<span>', '</span>', '<b>', '</b>', '<br>', '<li>', '<ul>', '</ul>',
+    '<table><tr><td>', '</td></tr></table>', '<script>var a="<a target=_blank>x</a>";</script>',
+    '<!-- <a target=_blank>注释中的链接标题</a> -->', '<textarea>', '</textarea>', '<noscript>', '<svg>',
+    '<div class="feed-card-article-r"><p class="title">', '<span aria-label="标签">',
+    '新闻标题文字甲', '新闻标题文字乙', '&amp;', '&nbsp;', '&nbsp', '&copy', '&#128;', '&unknown;', '\n  \t', '　',
+]
+
+
+def test_random_markup_matches_reference():
+    rng = random.Random(20240601)
+    for _ in range(500):
+        html = ''.join(rng.choice(FRAGMENTS) for _ in range(rng.randint(2, 14)))
+        expected = reference_titles(html)
+        for backend in BACKENDS:
+            assert parse_html(html, backend=backend) == expected, (backend, html)
+
+
+def test_best_backend_is_available():
+    assert best_backend() in BACKENDS
+
+
+def test_links_are_resolved():
+    links = {}
+    url, html, _ = EDGE_CASES['sina_page']
+    parse_html(html, url=url, links=links)
+    assert links == {'新浪首页新闻中心': 'https://news.sina.com.cn/',
+                     '北京今日暴雨预警发布': 'https://news.sina.com.cn/c/doc-1.shtml'}
+
+
+def test_profile_for_url():
+    assert profile_for_url('https://www.toutiao.com/?wid=1').name == 'toutiao'
+    assert profile_for_url('https://news.sina.com.cn/roll/').name == 'sina'
+    assert profile_for_url('https://example.com/').name == 'default'
@@ -0,0 +1,63 @@
+"""词云渲染与渲染缓存（使用假的 wordcloud 模块，不依赖字体）"""
+import sys
+from types import SimpleNamespace
+
+import pytest
+
+from new_crawler.keywords import Keyword
+from new_crawler.render import RenderCache, render_wordcloud
+
+KEYWORDS = [Keyword('暴雨', 0.5, 3, 2), Keyword('预警', 0.25, 2, 2)]
+
+
+@pytest.fixture
+def layouts(monkeypatch):
+    """记录每次真正布局时的参数"""
+    calls = []
+
+    class WordCloud:
+        def __init__(self, **options):
+            self.options = options
+
+        def generate_from_frequencies(self, weights):
+            calls.append((self.options, dict(weights)))
+            return self
+
+        def to_image(self):
+            return object()
+
+    monkeypatch.setitem(sys.modules, 'wordcloud', SimpleNamespace(WordCloud=WordCloud))
+    return calls
+
+
+def test_cache_evicts_least_recently_used():
+    cache = RenderCache(maxsize=2)
+    cache.put('a', 1)
+    cache.put('b', 2)
+    assert cache.get('a') == 1
+    cache.put('c', 3)
+    assert cache.get('b') is None
+    assert (cache.get('a'), cache.get('c')) == (1, 3)
+    assert (cache.hits, cache.misses) == (3, 1)
+
+
+def test_render_uses_display_size_and_weights(layouts):
+    image = render_wordcloud(KEYWORDS, size=(300, 200), cache=None)
+    assert image is not None
+    options, weights = layouts[0]
+    assert (options['width'], options['height']) == (300, 200)
+    assert weights == {'暴雨': 0.5, '预警': 0.25}
+
+
+def test_same_keywords_are_rendered_once(layouts):
+    cache = RenderCache()
+    first = render_wordcloud(KEYWORDS, cache=cache)
+    assert render_wordcloud(list(reversed(KEYWORDS)), cache=cache) is first
+    render_wordcloud(KEYWORDS, size=(300, 200), cache=cache)
+    render_wordcloud(KEYWORDS, cache=cache, background_color='black')
+    assert len(layouts) == 3
+
+
+def test_no_keywords_renders_nothing(layouts):
+    assert render_wordcloud([], cache=None) is None
+    assert layouts == []
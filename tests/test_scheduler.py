@@ -0,0 +1,65 @@
+"""多来源调度"""
+import pytest
+
+from new_crawler.daemon import CrawlDaemon
+from new_crawler.scheduler import CrawlScheduler, Source, merge_results
+
+
+def fake_fetch(responses, calls=None):
+    """按URL返回预设标题；值为异常时抛出"""
+    def fetch(url, max_pages, progress=None, cancel_event=None, engine='auto', **options):
+        if calls is not None:
+            calls.append(url)
+        result = responses[url]
+        if isinstance(result, Exception):
+            raise result
+        return list(result)
+    return fetch
+
+
+def scheduler(fetch, **options):
+    options.setdefault('domain_rate', 1000.0)
+    options.setdefault('backoff', 0.01)
+    return CrawlScheduler(fetch=fetch, **options)
+
+
+def test_merge_by_priority():
+    sources = [Source('https://a.example/', priority=0), Source('https://b.example/', priority=1)]
+    merged = merge_results(sources, {'a.example': ['甲', '乙'], 'b.example': ['乙', '丙']})
+    assert merged['titles'] == ['乙', '丙', '甲']
+    assert [r['source'] for r in merged['records']] == ['b.example', 'b.example', 'a.example']
+
+
+def test_run_collects_all_sources():
+    responses = {'https://a.example/': ['甲', '乙'], 'https://b.example/': ['丙']}
+    results = scheduler(fake_fetch(responses)).run([Source(url) for url in responses])
+    assert sorted(results['titles']) == ['丙', '乙', '甲']
+    assert results['sources']['a.example']['count'] == 2
+    assert results['sources']['b.example']['count'] == 1
+
+
+def test_failed_source_is_retried():
+    calls = []
+    responses = {'https://a.example/': RuntimeError('boom')}
+    results = scheduler(fake_fetch(responses, calls), retries=2).run([Source('https://a.example/')])
+    assert len(calls) == 3
+    assert results['sources']['a.example']['attempts'] == 3
+    assert results['sources']['a.example']['error'] == 'boom'
+    assert results['titles'] == []
+
+
+def test_same_host_sources_need_distinct_names():
+    sources = [Source('https://news.example/a'), Source('https://news.example/b')]
+    with pytest.raises(ValueError):
+        scheduler(fake_fetch({})).run(sources)
+    with pytest.raises(ValueError):
+        CrawlDaemon(sources, scheduler=scheduler(fake_fetch({})))
+
+
+def test_same_host_sources_with_names_are_kept_apart():
+    responses = {'https://news.example/a': ['甲'], 'https://news.example/b': ['乙']}
+    sources = [Source('https://news.example/a', name='a'), Source('https://news.example/b', name='b')]
+    results = scheduler(fake_fetch(responses)).run(sources)
+    assert results['sources']['a']['count'] == 1
+    assert results['sources']['b']['count'] == 1
+    assert sorted(results['titles']) == ['乙', '甲']
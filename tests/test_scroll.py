@@ -0,0 +1,55 @@
+"""自适应滚动（使用假浏览器模拟信息流）"""
+import threading
+
+import pytest
+
+from new_crawler.engine import CrawlCancelled, scroll_to_load_content
+
+
+class FeedDriver:
+    """每次滚动到底部后加载 batch 条，共 total 条"""
+
+    def __init__(self, total, batch=10):
+        self.total = total
+        self.batch = batch
+        self.count = batch
+        self.scrolls = 0
+
+    def execute_script(self, script, *args):
+        if script.startswith('window.scrollTo'):
+            self.scrolls += 1
+            self.count = min(self.total, self.count + self.batch)
+            return None
+        return [self.count * 100, self.count]
+
+
+def scroll(driver, scroll_count=None, **options):
+    options.setdefault('wait_timeout', 0.05)
+    options.setdefault('poll_interval', 0.001)
+    return scroll_to_load_content(driver, scroll_count, adaptive=True, **options)
+
+
+def test_stops_when_target_count_is_reached():
+    driver = FeedDriver(total=1000)
+    assert scroll(driver, target_count=35) == 3
+    assert driver.count == 40
+
+
+def test_stops_after_idle_scrolls_at_end_of_feed():
+    driver = FeedDriver(total=30)
+    assert scroll(driver, idle_limit=2) == 4
+    assert driver.count == 30
+
+
+def test_scroll_count_is_upper_bound():
+    driver = FeedDriver(total=1000)
+    seen = []
+    assert scroll(driver, 5, on_scroll=seen.append) == 5
+    assert seen == [1, 2, 3, 4, 5]
+
+
+def test_cancel_stops_scrolling():
+    event = threading.Event()
+    event.set()
+    with pytest.raises(CrawlCancelled):
+        scroll(FeedDriver(total=1000), cancel_event=event)
@@ -0,0 +1,21 @@
+"""启动路径：导入核心模块时不导入较重的依赖"""
+import subprocess
+import sys
+
+
+def imported_modules(statement):
+    code = f"import sys; {statement}; print(' '.join(sorted(sys.modules)))"
+    output = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True).stdout
+    return set(output.split())
+
+
+def test_engine_import_does_not_load_numpy():
+    modules = imported_modules('import new_crawler.engine')
+    assert 'numpy' not in modules
+    assert 'new_crawler.dedup' not in modules
+    assert 'new_crawler.keywords' not in modules
+
+
+def test_package_exports_keyword_engine_lazily():
+    modules = imported_modules('import new_crawler; new_crawler.KeywordEngine')
+    assert 'new_crawler.keywords' in modules
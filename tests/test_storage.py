@@ -0,0 +1,64 @@
+"""爬取历史库"""
+from datetime import datetime
+
+import pytest
+
+from new_crawler.storage import HistoryStore, parse_time
+
+
+def records(*titles, source='news.example'):
+    return [{'title': title, 'source': source, 'url': 'https://news.example/'} for title in titles]
+
+
+def split_words(titles):
+    return [tuple(title.split()) for title in titles]
+
+
+@pytest.fixture
+def store():
+    with HistoryStore(':memory:', tokenize=split_words) as store:
+        yield store
+
+
+def test_parse_time():
+    assert parse_time('2h', now=10000) == 10000 - 7200
+    assert parse_time('1.5d', now=200000) == 200000 - 1.5 * 86400
+    assert parse_time('2024-05-01') == datetime(2024, 5, 1).timestamp()
+    assert parse_time(None) is None and parse_time(123) == 123
+
+
+def test_known_titles_update_sightings(store):
+    store.record_run(records('北京 暴雨 预警', '上海 高温 预警'), label='first', started_at=1000)
+    store.record_run(records('北京 暴雨 预警', '广州 台风 预警', '广州 台风 预警'), label='second',
+                     started_at=2000)
+    assert len(store) == 3
+    runs = store.runs()
+    assert [(label, title_count, new_count) for _, label, _, _, title_count, new_count in runs] == [
+        ('second', 2, 1), ('first', 2, 2)]
+    row = next(r for chunk in store.iter_records() for r in chunk if r[1] == '北京 暴雨 预警')
+    assert row[4:] == (1000, 2000, 2)
+
+
+def test_keyword_counts_by_window_and_source(store):
+    store.record_run(records('北京 暴雨 预警', '上海 高温 预警'), started_at=1000)
+    store.record_run(records('广州 台风 预警', source='other.example'), started_at=2000)
+    assert store.keyword_counts()[0] == ('预警', 3, 3)
+    assert dict((w, n) for w, n, _ in store.keyword_counts(since=1500)) == {'广州': 1, '台风': 1, '预警': 1}
+    assert store.keyword_counts(top_n=1, source='news.example') == [('预警', 2, 2)]
+
+
+def test_titles_between_and_records_filter(store):
+    store.record_run(records('北京 暴雨 预警'), started_at=1000)
+    store.record_run(records('上海 高温 预警', source='other.example'), started_at=2000)
+    assert store.titles_between(until=1500) == ['北京 暴雨 预警']
+    assert store.titles_between(source='other.example') == ['上海 高温 预警']
+    assert store.count_records(since=1500) == 1
+    assert [len(chunk) for chunk in store.iter_records(chunk_size=1)] == [1, 1]
+
+
+def test_search(store):
+    store.record_run(records('人工智能大模型发布', '北京今日暴雨预警发布'), started_at=1000)
+    results = store.search('人工智能')
+    assert [r['title'] for r in results] == ['人工智能大模型发布']
+    assert store.search('人工智能', since=1500) == []
+    assert store.search('   ') == []
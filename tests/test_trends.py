@@ -0,0 +1,46 @@
+"""关键词热度趋势"""
+from new_crawler.keywords import KeywordEngine
+from new_crawler.trends import TrendEngine
+
+NOW = 1_700_000_000
+
+
+def test_repeated_titles_are_counted_once():
+    engine = KeywordEngine()
+    trends = TrendEngine()
+    titles = ['北京发布暴雨预警', '上海发布高温预警']
+    assert trends.observe(titles, engine, timestamp=NOW) == 2
+    assert trends.observe(titles, engine, timestamp=NOW + 60) == 0
+    assert trends.counts('暴雨') == {'1h': 1, '24h': 1, '7d': 1}
+
+
+def test_counts_leave_short_window():
+    trends = TrendEngine()
+    trends.add({'暴雨': 3}, 3, timestamp=NOW)
+    trends.add({}, 0, timestamp=NOW + 2 * 3600)
+    counts = trends.counts('暴雨')
+    assert counts['1h'] == 0
+    assert counts['24h'] == 3
+
+
+def test_burst_word_ranks_first():
+    trends = TrendEngine()
+    trends.add({'天气': 10, '暴雨': 1}, 100, timestamp=NOW - 12 * 3600)
+    trends.add({'天气': 1, '暴雨': 8}, 10, timestamp=NOW)
+    rows = trends.summary(top_n=5, timestamp=NOW)
+    assert rows[0]['word'] == '暴雨'
+    assert set(rows[0]) == {'word', '1h', '24h', '7d', 'baseline', 'rise', 'burst'}
+    assert rows[0]['rise'] > 1
+
+
+def test_save_and_open(tmp_path):
+    path = str(tmp_path / 'trends.npz')
+    trends = TrendEngine()
+    trends.add({'暴雨': 4}, 4, timestamp=NOW)
+    trends.seen['北京发布暴雨预警'] = NOW
+    trends.save(path)
+
+    restored = TrendEngine.open(path)
+    assert restored.counts('暴雨') == trends.counts('暴雨')
+    assert restored.seen == trends.seen
+    assert TrendEngine.open(str(tmp_path / 'missing.npz')).seen == {}
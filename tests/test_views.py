@@ -0,0 +1,84 @@
+"""结果标签页视图（不创建窗口，只检查表格列与行数据）"""
+import pytest
+
+from new_crawler import views
+from new_crawler.keywords import Keyword
+from new_crawler.trends import TrendEngine
+from new_crawler.views import PieChartView, ResultView, TrendTableView, window_label
+
+
+class FakeFrame:
+    def __init__(self, parent):
+        pass
+
+    def pack(self, **options):
+        pass
+
+
+def test_window_label():
+    assert window_label('1h') == '1小时'
+    assert window_label('7d') == '7天'
+    assert window_label('30m') == '30分钟'
+    assert window_label('本周') == '本周'
+
+
+def test_trend_columns_follow_engine_windows(monkeypatch):
+    monkeypatch.setattr(views.ttk, 'Frame', FakeFrame)
+    engine = TrendEngine(windows=(('30m', 1800, 6), ('1d', 86400, 24)))
+    view = TrendTableView(None, list(engine.windows))
+    assert view.columns == ("关键词", "30分钟", "1天", "期望次数", "上升倍数", "突发分数")
+    assert len(view.widths) == len(view.anchors) == len(view.columns)
+
+    view.set_data({'trends': [{'word': '暴雨', '30m': 3, '1d': 5, 'baseline': 1.234, 'rise': 2.0, 'burst': 3.456}]})
+    assert view.rows() == [('暴雨', 3, 5, 1.23, 2.0, 3.46)]
+
+
+class CountingView(ResultView):
+    def build(self):
+        self.builds = getattr(self, 'builds', 0) + 1
+
+    def render(self):
+        self.renders = getattr(self, 'renders', 0) + 1
+
+
+def test_view_is_built_once_and_redrawn_only_after_new_data(monkeypatch):
+    monkeypatch.setattr(views.ttk, 'Frame', FakeFrame)
+    view = CountingView(None)
+    view.set_data({'keywords': []})
+    view.refresh()
+    view.refresh()
+    view.set_data({'keywords': []})
+    view.refresh()
+    assert (view.builds, view.renders) == (1, 2)
+
+
+class FakeCanvas:
+    def __init__(self):
+        self.draws = 0
+
+    def draw_idle(self):
+        self.draws += 1
+
+
+def test_pie_chart_reuses_figure(monkeypatch):
+    pytest.importorskip('matplotlib')
+    from matplotlib.figure import Figure
+
+    monkeypatch.setattr(views.ttk, 'Frame', FakeFrame)
+    view = PieChartView(None)
+    view.figure = Figure()
+    view.ax = view.figure.add_subplot(111)
+    view.canvas = FakeCanvas()
+    view.built = True
+
+    keywords = [Keyword('关键词%d' % i, 1.0 / (i + 1), 30 - i, 1) for i in range(25)]
+    view.set_data({'keywords': keywords})
+    view.refresh()
+    assert len(view.ax.patches) == PieChartView.max_slices
+    assert view.ax.texts[0].get_text() == '关键词0'
+
+    view.set_data({'keywords': []})
+    view.refresh()
+    assert view.figure.axes == [view.ax] and not view.ax.patches
+    assert view.ax.texts[0].get_text() == '没有关键词数据'
+    assert view.canvas.draws == 2
@@ -0,0 +1,102 @@
+"""界面后台任务（不依赖 tkinter）"""
+import functools
+
+import pytest
+
+from benchmarks.fixtures import load_fixture
+from new_crawler.engine import analyze_keywords
+from new_crawler.keywords import KeywordEngine
+from new_crawler.parsers import parse_html
+from new_crawler.worker import CrawlWorker, ExportWorker
+
+
+def run_worker(titles, **options):
+    engine = KeywordEngine()
+    funcs = {
+        'fetch_news': lambda url, max_pages, progress=None, cancel_event=None, **kw: list(titles),
+        'analyze_keywords': functools.partial(analyze_keywords, engine=engine),
+        'keyword_sources': engine.keyword_sources,
+        'render_wordcloud': lambda keywords, size=None: None,
+    }
+    worker = CrawlWorker(funcs, 'https://www.toutiao.com/', 1, **options)
+    worker._run()
+    messages = dict(worker.poll())
+    assert 'done' in messages, messages
+    return messages['done'], engine
+
+
+def test_keywords_keep_top_n_and_table_gets_all():
+    titles = parse_html(load_fixture('toutiao', 'small'))
+    results, engine = run_worker(titles)
+    assert results['keywords'] == engine.analyze(titles, top_n=20)
+    assert len(results['all_keywords']) > 20
+    assert results['all_keywords'][:20] == results['keywords']
+    assert set(results['keyword_sources']) == {kw.word for kw in results['all_keywords']}
+
+
+def test_custom_top_n():
+    titles = parse_html(load_fixture('toutiao', 'small'))
+    results, _ = run_worker(titles, top_n=5)
+    assert len(results['keywords']) == 5
+
+
+def finish(worker):
+    worker.start()
+    worker._thread.join(10)
+    assert not worker.is_alive()
+    return worker.poll()
+
+
+def test_worker_reports_progress_from_background_thread():
+    def fetch_news(url, max_pages, progress=None, cancel_event=None):
+        progress('fetch', '正在抓取')
+        return ['北京今日暴雨预警发布', '上海今日暴雨预警发布']
+
+    funcs = {
+        'fetch_news': fetch_news,
+        'analyze_keywords': lambda titles, top_n=None: [],
+        'keyword_sources': lambda keywords, records: {},
+        'render_wordcloud': lambda keywords, size=None: 'image',
+    }
+    messages = finish(CrawlWorker(funcs, 'https://www.toutiao.com/', 1))
+    assert [payload[0] for kind, payload in messages if kind == 'progress'] == ['fetch', 'keywords', 'wordcloud']
+    assert messages[-1][0] == 'done'
+    assert messages[-1][1]['wordcloud_image'] == 'image'
+
+
+def test_cancelled_worker_skips_analysis():
+    analyzed = []
+
+    def fetch_news(url, max_pages, progress=None, cancel_event=None):
+        worker.cancel()
+        return ['北京今日暴雨预警发布']
+
+    funcs = {'fetch_news': fetch_news, 'analyze_keywords': lambda titles, top_n=None: analyzed.append(titles)}
+    worker = CrawlWorker(funcs, 'https://www.toutiao.com/', 1)
+    assert finish(worker) == [('cancelled', None)]
+    assert analyzed == []
+
+
+def test_worker_errors_are_queued():
+    def fetch_news(url, max_pages, progress=None, cancel_event=None):
+        raise ValueError('页面加载失败')
+
+    messages = finish(CrawlWorker({'fetch_news': fetch_news}, 'https://www.toutiao.com/', 1))
+    kind, error = messages[-1]
+    assert kind == 'error' and isinstance(error, ValueError)
+
+
+@pytest.mark.parametrize('cancel', [False, True])
+def test_export_worker(cancel):
+    done = []
+
+    def job(progress=None, cancel_event=None):
+        done.append(1)
+        if cancel:
+            cancel_event.set()
+
+    messages = finish(ExportWorker([('关键词', job), ('标题', job)]))
+    if cancel:
+        assert done == [1] and messages[-1] == ('cancelled', None)
+    else:
+        assert done == [1, 1] and messages[-1] == ('done', ['关键词', '标题'])